@@ -13,6 +13,30 @@
 #     Основные атрибуты:
 #         root_directory: Путь к корневой директории проекта, которая будет проанализирована.
 #         ignore_list: Список элементов (файлов и директорий), которые необходимо игнорировать при анализе.
+#         Помимо точных имён поддерживаются glob-шаблоны (`*.pyc`, `**/migrations`), а при use_gitignore=True -
+#         правила из файлов .gitignore (см. Analyzers/Walker.py).
+#         jobs: Количество процессов для разбора файлов; при jobs > 1 файлы сначала собираются,
+#         а затем разбираются пачками (chunk_size) в ProcessPoolExecutor.
+#         cache_dir: Директория постоянного кэша (см. Analyzers/Cache.py); если задана, неизменённые файлы
+#         берутся из кэша без открытия и разбора. Статистика попаданий доступна в cache.hits / cache.misses.
+#         Вместе с кэшем сохраняется снимок дерева Меркла (см. Analyzers/Merkle.py): директории с неизменённым
+#         дайджестом берутся из прошлого запуска целиком (счётчик reused_directories), дайджесты - в digests.
+#         Если директорию кэша нельзя создать или открыть, в stderr выводится предупреждение и анализ идёт без кэша.
+#         collect_imports: Если True, file_analyzer дополнительно возвращает 'imports' - импорты модуля,
+#         по которым строится граф зависимостей (см. Analyzers/Dependencies.py).
+#         perf_lint: Если True, file_analyzer дополнительно возвращает 'hotspots' - найденные в модуле
+#         типичные проблемы производительности (см. Analyzers/PerfLint.py), по тому же дереву AST.
+#         fast: Если True, классы, функции и переменные извлекаются быстрым построчным сканером
+#         (см. Analyzers/FastParser.py) вместо ast.parse; в неоднозначных случаях, при collect_imports
+#         и perf_lint файл по-прежнему разбирается через ast.
+#         compact: Если True, архитектура хранится в компактном виде (объекты со __slots__ и интернированными
+#         именами, см. Analyzers/Nodes.py); print_architecture, сохранение в JSON/XML и снимок дерева обходят
+#         узлы напрямую, без копии дерева на словарях; project_tree() возвращает дерево проекта в виде словарей.
+#         shard: Часть (i, N) при разбиении анализа на несколько запусков (см. Analyzers/Shards.py): разбираются
+#         только файлы этой части, элементы директорий обходятся в порядке имён. Кэш и снимок части хранятся в
+#         отдельных файлах (analyze-<i>of<N>.sqlite, tree-<i>of<N>.json), поэтому части можно запускать одновременно.
+#         sink: Приёмник потоковых записей (см. Analyzers/Streaming.py), которому директории и модули
+#         передаются сразу после разбора, в порядке обхода.
 #         architecture: Словарь, который хранит информацию о структуре проекта, включая классы,
 #         функции и переменные из файлов.
 #
@@ -57,23 +81,78 @@
 #     помощью методов parse_python_file_details и file_analyzer.
 #     Архитектура проекта может быть выведена на экран, сохранена в JSON или XML формате для дальнейшего использования.
 #
+# ProjectCreator
+#
+#     Создает структуру проекта по архитектуре (загруженной из JSON или XML) в два шага: plan(root_path) сравнивает
+#     архитектуру с диском (существующие модули разбираются тем же быстрым сканером, что и в анализаторе) и
+#     возвращает только недостающее - директории, файлы, классы, методы, функции и переменные; apply_plan(plan)
+#     записывает изменения пакетно и атомарно. create_project_structure(root_path, dry_run) выводит план и,
+#     если не dry_run, применяет его.
+#
 # Таким образом, Analyzer.py предоставляет мощный инструмент для анализа структуры Python-проектов,
 # помогая разработчикам лучше понимать свою кодовую базу и её организацию.
 #
 
 
 import ast
+import contextlib
 import json
 import os
+import shutil
+import sqlite3
+import sys
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
 from typing import Dict, List, Union
-import xml.etree.ElementTree as ET
+
+from Analyzers.Cache import CACHE_DIR_NAME, FileCache, content_digest
+from Analyzers.Dependencies import extract_imports
+from Analyzers.FastParser import read_python_details, scan_python_details
+from Analyzers.Merkle import TreeSnapshot
+from Analyzers.Nodes import Directory, Module, node_to_json
+from Analyzers.PerfLint import find_hotspots
+from Analyzers.Shards import shard_of
+from Analyzers.Walker import DirectoryScan, IgnoreRules, iter_python_files, scan_tree
+from Analyzers.XMLStream import load_architecture_xml, write_architecture_xml
+
+
+def _analyze_chunk(file_paths: List[str], options: dict) -> List[tuple]:
+    """Анализирует пачку файлов в процессе-воркере (функция уровня модуля, чтобы её можно было сериализовать)."""
+    analyzer = ProjectAnalyzer(root_directory=os.curdir, **options)
+    return [analyzer.read_and_analyze(file_path) for file_path in file_paths]
 
 
 class ProjectAnalyzer:
-    def __init__(self, root_directory: str = None, ignore_list: List[str] = None):
+    def __init__(self, root_directory: str = None, ignore_list: List[str] = None, jobs: int = 1,
+                 chunk_size: int = 64, cache_dir: str = None, use_gitignore: bool = False, sink=None,
+                 collect_imports: bool = False, compact: bool = False, fast: bool = False,
+                 perf_lint: bool = False, shard: tuple = None):
         self.root_directory = root_directory or self.find_project_root()
-        self.ignore_list = ignore_list or []
+        # Служебная директория Podmasterye (кэш и т.п.) никогда не попадает в архитектуру
+        self.ignore_list = list(ignore_list or []) + [CACHE_DIR_NAME]
+        self.ignore_rules = IgnoreRules(self.ignore_list, use_gitignore)
+        self.jobs = jobs
+        self.collect_imports = collect_imports
+        self.perf_lint = perf_lint
+        self.shard = shard
+        self.compact = compact
+        self.fast = fast
+        self.chunk_size = chunk_size
         self.architecture = {}
+        self.cache_dir = cache_dir
+        self.cache = None
+        # Дайджесты директорий текущего запуска и число директорий, взятых из снимка без обхода
+        self.digests = {}
+        self.reused_directories = 0
+        # Приёмник потоковых записей (например, Analyzers.Streaming.NDJSONWriter): получает директории
+        # и модули по мере их разбора
+        self.sink = sink
+        self.project_name = os.path.basename(self.root_directory)
+        # Файлы, ожидающие разбора в пуле процессов: (словарь директории, имя файла, путь)
+        self._pending = None
+        # Отложенные записи для sink в режиме пула: ('dir', путь, None), ('tree', путь, поддерево), ('file', индекс, None)
+        self._events = None
 
     def find_project_root(self, start_path: str = '.') -> Union[str, None]:
         root_indicators = ['.venv', 'requirements.txt', 'pyproject.toml', '.git']
@@ -90,32 +169,283 @@ class ProjectAnalyzer:
 
     def get_architecture(self) -> None:
         project_name = os.path.basename(self.root_directory)
-        self.architecture[project_name] = self.traverse_directory(self.root_directory)
-
-    def traverse_directory(self, dir_path: str) -> Dict[str, Union[Dict, Dict[str, dict]]]:
+        self.project_name = project_name
+        if self.cache_dir:
+            try:
+                self.cache = FileCache(self.cache_dir, self.parse_options(),
+                                       file_name=f"analyze{self.cache_suffix()}.sqlite")
+            except (OSError, sqlite3.Error) as e:
+                # Директорию кэша нельзя создать (например, проект только для чтения) - анализ идёт как с --no-cache
+                print(f"Warning: cache disabled, {self.cache_dir} is not available: {e}", file=sys.stderr)
+                self.cache = None
+        self._seen_paths = []
+        try:
+            if self.jobs > 1:
+                # Сначала собираем структуру и список файлов, затем разбираем файлы параллельно
+                self._pending = []
+                self._events = [] if self.sink else None
+                try:
+                    self.architecture[project_name] = self._collect_tree()
+                    self._analyze_pending()
+                finally:
+                    self._pending = None
+                    self._events = None
+            else:
+                self.architecture[project_name] = self._collect_tree()
+            if self.compact:
+                self.architecture[project_name] = Directory.from_dict(self.architecture[project_name])
+            if self.cache:
+                self.cache.prune(self._seen_paths)
+                self.tree_snapshot().save(self.architecture[project_name], self.digests, self.snapshot_options())
+        finally:
+            if self.cache:
+                self.cache.close()
+
+    def _collect_tree(self) -> dict:
+        if not self.cache:
+            return self.traverse_directory(self.root_directory)
+        # С кэшем сначала строим дерево Меркла и переиспользуем неизменённые поддеревья прошлого запуска
+        previous_tree, previous_digests = self.tree_snapshot().load(self.snapshot_options(), self.compact)
+        scan = scan_tree(self.root_directory, self.ignore_rules, with_digests=True)
+        return self._build_from_scan(scan, '.', previous_tree, previous_digests)
+
+    def cache_suffix(self) -> str:
+        """Суффикс файлов кэша и снимка: у каждой части (shard) свои файлы, чтобы части, запущенные одновременно,
+        не блокировали базу друг друга и не перезаписывали чужой снимок."""
+        return f"-{self.shard[0]}of{self.shard[1]}" if self.shard else ''
+
+    def tree_snapshot(self) -> TreeSnapshot:
+        return TreeSnapshot(self.cache_dir, f"tree{self.cache_suffix()}.json")
+
+    def parse_options(self) -> dict:
+        """Настройки разбора отдельного файла: передаются воркерам пула и определяют содержимое кэша."""
+        return {'collect_imports': self.collect_imports, 'fast': self.fast, 'perf_lint': self.perf_lint}
+
+    def snapshot_options(self) -> dict:
+        """Настройки анализа, при изменении которых снимок прошлого запуска нельзя переиспользовать."""
+        options = {'ignore_list': sorted(self.ignore_list), 'use_gitignore': self.ignore_rules.use_gitignore}
+        options.update(self.parse_options())
+        if self.shard:
+            # Снимок части содержит только её модули
+            options['shard'] = list(self.shard)
+        return options
+
+    def _build_from_scan(self, scan: DirectoryScan, rel_path: str, previous_tree: Union[dict, None],
+                         previous_digests: Dict[str, str]) -> dict:
+        # Дерево строится без рекурсии, но в том же порядке (в глубину), что и прежний рекурсивный обход
+        holder = {}
+        frame = self._open_directory(scan, rel_path, previous_tree, previous_digests, holder, None)
+        stack = [frame] if frame else []
+        while stack:
+            entries, file_tree, rel_path, previous_tree = stack[-1]
+            for item, item_path, child in entries:
+                if child is None:
+                    self._analyze_into(file_tree, item, item_path)
+                    continue
+                child_rel_path = item if rel_path == '.' else f"{rel_path}/{item}"
+                previous_child = previous_tree.get(item) if isinstance(previous_tree, dict) else None
+                frame = self._open_directory(child, child_rel_path, previous_child, previous_digests, file_tree, item)
+                if frame:
+                    stack.append(frame)
+                    break
+            else:
+                stack.pop()
+        return holder[None]
+
+    def _open_directory(self, scan: DirectoryScan, rel_path: str, previous_tree: Union[dict, None],
+                        previous_digests: Dict[str, str], parent: dict, item: Union[str, None]) -> Union[tuple, None]:
+        """Создаёт узел директории в parent; возвращает кадр обхода или None, если поддерево взято из снимка."""
+        if scan.digest:
+            self.digests[rel_path] = scan.digest
+        if previous_tree is not None and previous_digests.get(rel_path) == scan.digest:
+            # Поддерево не изменилось: берём его целиком, отмечая файлы как живые для кэша
+            self.reused_directories += 1
+            self._seen_paths.extend(self._cache_key(path) for path in iter_python_files(scan))
+            self._collect_digests(scan, rel_path)
+            parent[item] = previous_tree
+            if self.sink:
+                self._emit('tree', rel_path, previous_tree)
+            return None
         file_tree = {}
-        for item in os.listdir(dir_path):
-            item_path = os.path.join(dir_path, item)
-
-            if item in self.ignore_list:
-                continue
-
-            if os.path.isdir(item_path):
-                file_tree[item] = self.traverse_directory(item_path)
+        parent[item] = file_tree
+        if self.sink:
+            self._emit('dir', rel_path)
+        # В режиме частей порядок элементов не должен зависеть от os.scandir: он одинаков во всех частях
+        entries = sorted(scan.entries, key=lambda entry: entry[0]) if self.shard else scan.entries
+        return iter(entries), file_tree, rel_path, previous_tree
+
+    def _collect_digests(self, scan: DirectoryScan, rel_path: str) -> None:
+        stack = [(scan, rel_path)]
+        while stack:
+            current, current_path = stack.pop()
+            self.digests[current_path] = current.digest
+            for item, _, child in current.entries:
+                if child is not None:
+                    stack.append((child, item if current_path == '.' else f"{current_path}/{item}"))
+
+    def _record_path(self, rel_path: str) -> str:
+        rel_path = rel_path.replace(os.sep, '/')
+        return self.project_name if rel_path == '.' else f"{self.project_name}/{rel_path}"
+
+    def _emit(self, kind: str, key: Union[str, int], tree: dict = None) -> None:
+        """Передаёт запись в sink; в режиме пула откладывает её, чтобы сохранить порядок обхода."""
+        if self._events is not None:
+            self._events.append((kind, key, tree))
+        elif kind == 'dir':
+            self.sink.write_directory(self._record_path(key))
+        elif kind == 'tree':
+            self.sink.write_tree(self._record_path(key), tree)
+        else:
+            self.sink.write_module(self._record_path(key), tree)
+
+    def _flush_events(self, position: int, done: set) -> int:
+        """Отправляет отложенные записи, пока не встретится ещё не разобранный файл."""
+        events = self._events
+        while position < len(events):
+            kind, key, tree = events[position]
+            if kind == 'file':
+                if key not in done:
+                    break
+                file_tree, item, item_path = self._pending[key]
+                details = file_tree[item]
+                if isinstance(details, Module):
+                    details = details.to_dict()
+                self.sink.write_module(self._record_path(self._cache_key(item_path)), details)
+            elif kind == 'dir':
+                self.sink.write_directory(self._record_path(key))
             else:
-                if item.endswith('.py'):
-                    file_tree[item] = self.file_analyzer(item_path)
-                # Не обрабатываем не-Python файлы, такие как .txt, .md и т.д.
+                self.sink.write_tree(self._record_path(key), tree)
+            position += 1
+        return position
+
+    def _analyze_pending(self) -> None:
+        """Разбирает собранные файлы в пуле процессов и раскладывает результаты по их местам в дереве."""
+        pending = []
+        done = set()
+        for index, (file_tree, item, item_path) in enumerate(self._pending):
+            details = self._cache_lookup(item_path)[0] if self.cache else None
+            if details is None:
+                pending.append(index)
+            else:
+                self._store(file_tree, item, details)
+                done.add(index)
+        position = self._flush_events(0, done) if self.sink else 0
+        paths = [self._pending[index][2] for index in pending]
+        chunks = [paths[i:i + self.chunk_size] for i in range(0, len(paths), self.chunk_size)]
+        with ProcessPoolExecutor(max_workers=self.jobs) as executor:
+            # map сохраняет порядок пачек, поэтому результат совпадает с последовательным обходом
+            results = (result for chunk in executor.map(_analyze_chunk, chunks, repeat(self.parse_options())) for result in chunk)
+            for index, (details, digest) in zip(pending, results):
+                file_tree, item, item_path = self._pending[index]
+                self._store(file_tree, item, details)
+                self._cache_store(item_path, digest, details)
+                if self.sink:
+                    done.add(index)
+                    position = self._flush_events(position, done)
+
+    def _cache_key(self, file_path: str) -> str:
+        return os.path.relpath(file_path, self.root_directory)
+
+    def _cache_lookup(self, file_path: str) -> tuple:
+        """Ищет результат в кэше по mtime и размеру, не открывая файл. Возвращает (details, stat)."""
+        rel_path = self._cache_key(file_path)
+        self._seen_paths.append(rel_path)
+        try:
+            stat = os.stat(file_path)
+        except OSError:
+            return None, None
+        return self.cache.lookup(rel_path, stat), stat
 
-        return file_tree
+    def _cache_store(self, file_path: str, digest: Union[str, None], details: dict) -> None:
+        if not self.cache or digest is None:
+            return
+        try:
+            stat = os.stat(file_path)
+        except OSError:
+            return
+        self.cache.store(self._cache_key(file_path), stat, digest, details)
 
-    def file_analyzer(self, file_path: str) -> dict:
-        classes, functions, variables = self.parse_python_file_details(file_path)
-        return {
+    def cached_file_analyzer(self, file_path: str) -> dict:
+        """Анализирует файл с использованием кэша: неизменённые файлы не открываются и не разбираются."""
+        details, stat = self._cache_lookup(file_path)
+        if details is not None:
+            return details
+        try:
+            with open(file_path, "rb") as f:
+                source = f.read()
+        except OSError:
+            return self.file_analyzer(file_path)
+        digest = content_digest(source)
+        if stat is not None:
+            # Файл мог быть "тронут" без изменения содержимого - проверяем хэш, прежде чем разбирать
+            details = self.cache.lookup_content(self._cache_key(file_path), stat, digest)
+            if details is not None:
+                return details
+        details = self.file_analyzer(file_path, source)
+        self._cache_store(file_path, digest, details)
+        return details
+
+    def read_and_analyze(self, file_path: str) -> tuple:
+        """Читает файл один раз и возвращает (результат file_analyzer, хэш содержимого или None)."""
+        try:
+            with open(file_path, "rb") as f:
+                source = f.read()
+        except OSError:
+            return self.file_analyzer(file_path), None
+        return self.file_analyzer(file_path, source), content_digest(source)
+
+    def traverse_directory(self, dir_path: str) -> Dict[str, Union[Dict, Dict[str, dict]]]:
+        # Обход итеративный (os.scandir), игнорируемые директории отсекаются до спуска в них.
+        # Не-Python файлы, такие как .txt, .md и т.д., в дерево не попадают.
+        return self._build_from_scan(scan_tree(dir_path, self.ignore_rules), '.', None, {})
+
+    def _analyze_into(self, file_tree: dict, item: str, item_path: str) -> None:
+        if self.shard and shard_of(self._cache_key(item_path).replace(os.sep, '/'), self.shard[1]) != self.shard[0]:
+            # Файл другой части; запись в кэше не удаляется
+            self._seen_paths.append(self._cache_key(item_path))
+            return
+        if self._pending is not None:
+            # Резервируем место под файл, чтобы порядок ключей совпадал с последовательным режимом
+            file_tree[item] = None
+            if self._events is not None:
+                self._events.append(('file', len(self._pending), None))
+            self._pending.append((file_tree, item, item_path))
+            return
+        if self.cache:
+            details = self.cached_file_analyzer(item_path)
+        else:
+            details = self.file_analyzer(item_path)
+        self._store(file_tree, item, details)
+        if self.sink:
+            self._emit('module', self._cache_key(item_path), details)
+
+    def _store(self, file_tree: dict, item: str, details: dict) -> None:
+        # В компактном режиме словарь модуля сразу заменяется объектом Module (см. Analyzers/Nodes.py)
+        file_tree[item] = Module.from_dict(details) if self.compact else details
+
+    def architecture_dict(self) -> Dict[str, dict]:
+        """Архитектура в формате вложенных словарей (адаптер для компактного представления)."""
+        return {name: tree.to_dict() if isinstance(tree, Directory) else tree
+                for name, tree in self.architecture.items()}
+
+    def project_tree(self) -> dict:
+        """Дерево анализируемого проекта в формате вложенных словарей."""
+        tree = self.architecture[self.project_name]
+        return tree.to_dict() if isinstance(tree, Directory) else tree
+
+    def file_analyzer(self, file_path: str, source: bytes = None) -> dict:
+        extras = {} if self.collect_imports or self.perf_lint else None
+        classes, functions, variables = self.parse_python_file_details(file_path, source, extras)
+        details = {
             'classes': classes,
             'functions': functions,
             'variables': variables
         }
+        if self.collect_imports:
+            details['imports'] = extras.get('imports', [])
+        if self.perf_lint:
+            details['hotspots'] = extras.get('hotspots', [])
+        return details
 
     def parse_python_file(self, file_path: str) -> tuple:
         try:
@@ -132,10 +462,17 @@ class ProjectAnalyzer:
             print(f"Error parsing file {file_path}: {e}")
             return [], [], []  # Возвращаем пустые списки в случае ошибки
 
-    def parse_python_file_details(self, file_path: str) -> tuple:
+    def parse_python_file_details(self, file_path: str, source: bytes = None, extras: dict = None) -> tuple:
+        if self.fast and extras is None:
+            details = read_python_details(file_path, source)
+            if details is not None:
+                return details
         try:
-            with open(file_path, "r", encoding="utf-8") as f:
-                node = ast.parse(f.read(), filename=file_path)
+            if source is None:
+                with open(file_path, "r", encoding="utf-8") as f:
+                    node = ast.parse(f.read(), filename=file_path)
+            else:
+                node = ast.parse(source.decode("utf-8"), filename=file_path)
 
             classes = []
             functions = []
@@ -172,6 +509,13 @@ class ProjectAnalyzer:
                         if isinstance(target, ast.Name):
                             variables.append(target.id)
 
+            if extras is not None:
+                # Дополнительные сведения извлекаются из того же дерева AST, без повторного разбора
+                if self.collect_imports:
+                    extras['imports'] = extract_imports(node)
+                if self.perf_lint:
+                    extras['hotspots'] = find_hotspots(node)
+
             return classes, functions, variables
 
         except Exception as e:
@@ -181,10 +525,15 @@ class ProjectAnalyzer:
     def print_architecture(self, architecture: Dict = None, indent: int = 0) -> None:
         if architecture is None:
             architecture = self.architecture
+        if isinstance(architecture, Directory):
+            architecture = architecture.children
 
         indent_str = "│  " * indent
         for folder, content in architecture.items():
-            if isinstance(content, dict):
+            if isinstance(content, Module):
+                # Словарь только этого модуля, а не копия всего компактного дерева
+                content = content.to_dict()
+            if isinstance(content, (dict, Directory)):
                 print(f"{indent_str}├── {folder}/")
                 self.print_architecture(content, indent + 1)
             else:  # Это файл с данными
@@ -205,31 +554,19 @@ class ProjectAnalyzer:
     def save_architecture_to_json(self, filename: str) -> None:
         try:
             with open(filename, 'w', encoding='utf-8') as json_file:
-                json.dump(self.architecture, json_file, ensure_ascii=False, indent=4)
+                json.dump(self.architecture, json_file, ensure_ascii=False, indent=4, default=node_to_json)
             print(f"Architecture saved to {filename} in JSON format.")
         except Exception as e:
             print(f"Error saving architecture to JSON: {e}")
 
     def save_architecture_to_xml(self, filename: str) -> None:
         try:
-            def build_xml_tree(data, parent):
-                for key, value in data.items():
-                    element = ET.SubElement(parent, key)
-                    if isinstance(value, dict):
-                        build_xml_tree(value, element)
-                    else:
-                        element.text = str(value)
-
-            root = ET.Element('Architecture')
-            build_xml_tree(self.architecture, root)
-
-            tree = ET.ElementTree(root)
-            tree.write(filename, encoding='utf-8', xml_declaration=True)
+            write_architecture_xml(self.architecture, filename)
             print(f"Architecture saved to {filename} in XML format.")
         except Exception as e:
             print(f"Error saving architecture to XML: {e}")
-            
-            
+
+
 class ProjectCreator:
     def __init__(self, architecture: Dict[str, Union[Dict, List[str]]] = None):
         self.architecture = architecture or {}
@@ -239,10 +576,7 @@ class ProjectCreator:
         """Загружает архитектуру проекта из JSON файла."""
         try:
             with open(file_path, 'r', encoding='utf-8') as f:
-                self.architecture = json.load(f)
-                if len(self.architecture.items()) < 2:
-                    temp = list(self.architecture.keys())
-                    self.architecture = self.architecture[temp[0]]
+                self.architecture = self._unwrap(json.load(f))
             print(f"Project architecture loaded from {file_path}")
         except Exception as e:
             print(f"Error loading JSON file: {e}")
@@ -250,71 +584,234 @@ class ProjectCreator:
     def load_from_xml(self, file_path: str):
         """Загружает архитектуру проекта из XML файла."""
         try:
-            tree = ET.parse(file_path)
-            root = tree.getroot()
-            self.architecture = self._xml_to_dict(root)
+            # Под корневым элементом (Architecture) лежит та же обёртка проекта, что и в JSON
+            root = load_architecture_xml(file_path)
+            self.architecture = self._unwrap(next(iter(root.values()), None))
             print(f"Project architecture loaded from {file_path}")
         except Exception as e:
             print(f"Error loading XML file: {e}")
 
+    @staticmethod
+    def _unwrap(architecture) -> dict:
+        """Убирает обёртку {имя проекта: дерево} файлов save_architecture_to_json и save_architecture_to_xml."""
+        if isinstance(architecture, dict) and len(architecture) == 1:
+            architecture = next(iter(architecture.values()))
+        return architecture or {}
+
     def _xml_to_dict(self, element):
-        """Рекурсивно преобразует XML элемент в словарь."""
-        result = {element.tag: {} if element.attrib else None}
-        children = list(element)
-        if children:
-            dd = {}
-            for child in children:
-                child_dict = self._xml_to_dict(child)
-                dd[child.tag] = child_dict[child.tag]
-            result = {element.tag: dd}
-        elif element.text:
-            text = element.text.strip()
-            result[element.tag] = text
+        """Преобразует XML элемент в словарь (без рекурсии, см. Analyzers/XMLStream.py)."""
+        result = {}
+        stack = [(element, result)]
+        while stack:
+            current, target = stack.pop()
+            children = list(current)
+            if children:
+                target[current.tag] = {}
+                for child in reversed(children):
+                    stack.append((child, target[current.tag]))
+            elif current.text:
+                target[current.tag] = current.text.strip()
+            else:
+                target[current.tag] = {} if current.attrib else None
         return result
 
-    def create_project_structure(self, root_path: str = ""):
-        if '\\' not in root_path:
-            self.current_path = self.find_project_root()
-            root_path = self.current_path
-        """Создает структуру проекта на основе архитектуры."""
-        for folder_name, contents in self.architecture.items():
-            self._create_directory(root_path, folder_name, contents)
-
-    def _create_directory(self, path, folder_name, contents):
-        folder_path = os.path.join(path, folder_name)
-        if '.' not in folder_name:
-            os.makedirs(folder_path, exist_ok=True)
-            for name, detail in contents.items():
-                if '.' not in name:
-                    self._create_directory(folder_path, name, detail)
-                elif '.' in name:
-                    self._create_python_file(folder_path, name, detail)
-        elif '.' in folder_name:
-            self._create_python_file(path, folder_name, contents)
-
-    def _create_python_file(self, path, file_name, details):
-        file_path = os.path.join(path, f"{file_name}")
-
-        # Проверяем, существует ли файл
-        if os.path.exists(file_path):
-            print(f"Файл '{file_path}' уже существует. Игнорируем создание.")
-            return
+    def create_project_structure(self, root_path: str = "", dry_run: bool = False) -> List[tuple]:
+        """Создает структуру проекта на основе архитектуры: строит план и, если не dry_run, применяет его."""
+        if not root_path:
+            root_path = self.find_project_root()
+        plan = self.plan(root_path)
+        self.print_plan(plan)
+        if not dry_run:
+            self.apply_plan(plan)
+        return plan
+
+    def plan(self, root_path: str) -> List[tuple]:
+        """
+        Сравнивает архитектуру с содержимым диска и возвращает список операций (operation, path, content, changes):
+        mkdir - создать директорию, create - создать файл, update - дописать в файл недостающие классы, методы,
+        функции и переменные, skip - файл нужно изменить, но это невозможно (changes содержит причину).
+        """
+        plan = []
+        root_exists = os.path.isdir(root_path)
+        if not root_exists:
+            plan.append(('mkdir', root_path, None, []))
+        queue = [(root_path, self.architecture, root_exists)]
+        for path, contents, exists in queue:
+            for name in contents:
+                item_path = os.path.join(path, name)
+                if '.' in name:
+                    operation = self._plan_python_file(item_path, contents[name], exists)
+                    if operation:
+                        plan.append(operation)
+                    continue
+                child_exists = exists and os.path.isdir(item_path)
+                if not child_exists:
+                    plan.append(('mkdir', item_path, None, []))
+                queue.append((item_path, contents[name] or {}, child_exists))
+        # Директории создаются первыми, затем файлы в порядке обхода
+        return sorted(plan, key=lambda operation: operation[0] != 'mkdir')
+
+    def _plan_python_file(self, file_path: str, details: dict, parent_exists: bool) -> Union[tuple, None]:
+        details = self._module_details(details)
+        if not (parent_exists and os.path.exists(file_path)):
+            return 'create', file_path, self._module_stub(details), self._describe(details)
+        try:
+            with open(file_path, 'r', encoding='utf-8', newline='') as f:
+                text = f.read()
+            existing = scan_python_details(text)
+            if existing is None:
+                ast.parse(text, filename=file_path)
+                existing = ProjectAnalyzer(root_directory=os.path.dirname(file_path)).parse_python_file_details(
+                    file_path, text.encode('utf-8'))
+        except (OSError, UnicodeDecodeError, SyntaxError, ValueError) as e:
+            return 'skip', file_path, None, [f"не удалось разобрать файл: {e}"]
+        missing = self._missing(details, existing)
+        if not any(missing.values()):
+            return None
+        try:
+            # Изменяемый файл разбирается полностью: сканер не проверяет синтаксис, а для вставки методов нужны
+            # номера строк классов
+            content = self._extend_module(text, ast.parse(text, filename=file_path), missing)
+        except SyntaxError as e:
+            return 'skip', file_path, None, [f"не удалось разобрать файл: {e}"]
+        except ValueError as e:
+            return 'skip', file_path, None, [str(e)]
+        return 'update', file_path, content, self._describe(missing)
+
+    @staticmethod
+    def _module_details(details) -> dict:
+        """Сведения о модуле; в XML списки классов, функций и переменных хранятся строкой str(list)."""
+        if not isinstance(details, dict):
+            return {}
+        result = {}
+        for key, value in details.items():
+            if isinstance(value, str):
+                try:
+                    value = ast.literal_eval(value)
+                except (ValueError, SyntaxError):
+                    value = []
+            result[key] = value
+        return result
 
-        # Если файл не существует, создаем его
-        with open(file_path, 'w', encoding='utf-8') as f:
-            if 'classes' in details:
-                for class_info in details['classes']:
-                    f.write(f"class {class_info['name']}:\n")
-                    for method in class_info['methods']:
-                        f.write(f"    def {method}(self):\n")
-                        f.write("        pass\n\n")
-            if 'functions' in details:
-                for func in details['functions']:
-                    f.write(f"def {func}():\n")
-                    f.write("    pass\n\n")
-            if 'variables' in details:
-                for var in details['variables']:
-                    f.write(f"{var} = None\n")
+    @staticmethod
+    def _missing(details: dict, existing: tuple) -> dict:
+        classes, functions, variables = existing
+        existing_methods = {class_info['name']: set(class_info['methods']) for class_info in classes}
+        missing = {'classes': [], 'methods': {}, 'functions': [], 'variables': []}
+        for class_info in details.get('classes', []):
+            if class_info['name'] not in existing_methods:
+                missing['classes'].append(class_info)
+                continue
+            methods = [method for method in class_info.get('methods', [])
+                       if method not in existing_methods[class_info['name']]]
+            if methods:
+                missing['methods'][class_info['name']] = methods
+        missing['functions'] = [name for name in details.get('functions', []) if name not in functions]
+        missing['variables'] = [name for name in details.get('variables', []) if name not in variables]
+        return missing
+
+    @staticmethod
+    def _describe(details: dict) -> List[str]:
+        changes = [f"class {class_info['name']}" for class_info in details.get('classes', [])]
+        changes += [f"method {class_name}.{method}" for class_name, methods in details.get('methods', {}).items()
+                    for method in methods]
+        changes += [f"function {name}" for name in details.get('functions', [])]
+        changes += [f"variable {name}" for name in details.get('variables', [])]
+        return changes
+
+    @staticmethod
+    def _module_stub(details: dict) -> str:
+        lines = []
+        for class_info in details.get('classes', []):
+            lines.append(f"class {class_info['name']}:\n")
+            for method in class_info.get('methods', []):
+                lines.append(f"    def {method}(self):\n")
+                lines.append("        pass\n\n")
+            if not class_info.get('methods'):
+                lines.append("    pass\n\n")
+        for func in details.get('functions', []):
+            lines.append(f"def {func}():\n")
+            lines.append("    pass\n\n")
+        for var in details.get('variables', []):
+            lines.append(f"{var} = None\n")
+        return ''.join(lines)
+
+    def _extend_module(self, text: str, tree: ast.Module, missing: dict) -> str:
+        """Вставляет недостающие методы в конец существующих классов и дописывает остальное в конец файла."""
+        newline = '\r\n' if '\r\n' in text else '\n'
+        lines = text.splitlines(keepends=True)
+        if missing['methods']:
+            class_nodes = {}
+            for node in tree.body:
+                if isinstance(node, ast.ClassDef):
+                    class_nodes.setdefault(node.name, node)
+            insertions = []
+            for class_name, methods in missing['methods'].items():
+                node = class_nodes[class_name]
+                first = node.body[0]
+                if first.lineno == node.lineno:
+                    raise ValueError(f"класс {class_name} объявлен в одну строку")
+                indent = lines[first.lineno - 1][:first.col_offset]
+                stub = ''.join(f"{newline}{indent}def {method}(self):{newline}{indent}    pass{newline}"
+                               for method in methods)
+                insertions.append((node.end_lineno, stub))
+            # Вставляем снизу вверх, чтобы номера строк остальных классов не сдвигались
+            for line_number, stub in sorted(insertions, reverse=True):
+                if not lines[line_number - 1].endswith(('\n', '\r')):
+                    lines[line_number - 1] += newline
+                lines.insert(line_number, stub)
+        tail = self._module_stub(missing)
+        if tail:
+            if lines and not lines[-1].endswith(('\n', '\r')):
+                lines[-1] += newline
+            lines.append(newline + tail.replace('\n', newline))
+        return ''.join(lines)
+
+    @staticmethod
+    def print_plan(plan: List[tuple]) -> None:
+        symbols = {'mkdir': '+', 'create': '+', 'update': '~', 'skip': '!'}
+        for operation, path, _, changes in plan:
+            suffix = os.sep if operation == 'mkdir' else ''
+            details = f"  [{', '.join(changes)}]" if changes else ''
+            print(f"{symbols[operation]} {path}{suffix}{details}")
+        counts = {operation: sum(1 for item in plan if item[0] == operation) for operation in symbols}
+        print(f"План: директорий {counts['mkdir']}, новых файлов {counts['create']}, "
+              f"изменяемых файлов {counts['update']}, пропущено {counts['skip']}")
+
+    @staticmethod
+    def apply_plan(plan: List[tuple]) -> None:
+        """
+        Применяет план пакетно: создает директории, записывает все файлы во временные файлы рядом с целевыми
+        и только затем переименовывает их (os.replace). Ошибка записи не оставляет на диске частичных файлов.
+        """
+        for operation, path, _, _ in plan:
+            if operation == 'mkdir':
+                os.makedirs(path, exist_ok=True)
+        umask = os.umask(0)
+        os.umask(umask)
+        written = []
+        try:
+            for operation, path, content, _ in plan:
+                if operation not in ('create', 'update'):
+                    continue
+                directory, name = os.path.split(path)
+                fd, temp_path = tempfile.mkstemp(prefix=f".{name}.", suffix='.tmp', dir=directory or None)
+                written.append((temp_path, path))
+                with os.fdopen(fd, 'w', encoding='utf-8', newline='') as f:
+                    f.write(content)
+                if operation == 'update':
+                    shutil.copymode(path, temp_path)
+                else:
+                    os.chmod(temp_path, 0o666 & ~umask)
+        except OSError as e:
+            for temp_path, _ in written:
+                with contextlib.suppress(OSError):
+                    os.remove(temp_path)
+            print(f"Error writing project files: {e}")
+            return
+        for temp_path, path in written:
+            os.replace(temp_path, path)
+        print(f"Записано файлов: {len(written)}")
 
     def find_project_root(self, start_path: str = '.') -> Union[str, None]:
         root_indicators = ['.venv', 'requirements.txt', 'pyproject.toml', '.git']
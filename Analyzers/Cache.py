@@ -0,0 +1,104 @@
+# Файл Analyzers/Cache.py содержит постоянный кэш результатов разбора Python-файлов для ProjectAnalyzer.
+# Кэш хранится в SQLite-файле (по умолчанию <проект>/.podmasterye/cache/analyze.sqlite) и позволяет
+# при повторном запуске анализа не открывать и не разбирать файлы, которые не изменились.
+#
+# Классы:
+#
+#     FileCache:
+#         Ключ записи - относительный путь файла; вместе с ним хранятся mtime (в наносекундах), размер,
+#         sha1 содержимого и словарь classes/functions/variables, полученный от ProjectAnalyzer.file_analyzer.
+#         Кэш привязан к настройкам разбора (options): при их изменении записи сбрасываются.
+#         Методы:
+#             lookup(rel_path, stat): Возвращает сохранённый результат, если mtime и размер совпадают
+#             (файл при этом не читается).
+#             lookup_content(rel_path, stat, digest): Возвращает результат, если совпал хэш содержимого
+#             (например, файл был "тронут", но не изменён), и обновляет mtime в записи.
+#             store(rel_path, stat, digest, details): Сохраняет результат разбора.
+#             prune(seen_paths): Удаляет записи о файлах, которых больше нет в проекте.
+#             close(): Фиксирует изменения и закрывает базу.
+#         Атрибуты hits и misses содержат статистику попаданий за текущий запуск.
+#
+#     like_escape(text): Экранирует \, % и _ для условия LIKE ... ESCAPE '\' (отбор путей по префиксу в индексах
+#     SymbolIndex и CloneIndex).
+
+import hashlib
+import json
+import os
+import sqlite3
+from typing import Iterable, Union
+
+CACHE_DIR_NAME = '.podmasterye'
+
+
+def default_cache_dir(root_directory: str) -> str:
+    """Возвращает директорию кэша по умолчанию для указанного проекта."""
+    return os.path.join(root_directory, CACHE_DIR_NAME, 'cache')
+
+
+def like_escape(text: str) -> str:
+    return text.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+
+
+def content_digest(data: bytes) -> str:
+    """Хэш содержимого файла, используемый для проверки изменений."""
+    return hashlib.sha1(data).hexdigest()
+
+
+class FileCache:
+    def __init__(self, cache_dir: str, options: dict = None, file_name: str = 'analyze.sqlite'):
+        os.makedirs(cache_dir, exist_ok=True)
+        self.db_path = os.path.join(cache_dir, file_name)
+        self.connection = sqlite3.connect(self.db_path)
+        self.connection.execute('''CREATE TABLE IF NOT EXISTS FILES (
+                                     PATH TEXT PRIMARY KEY,
+                                     MTIME_NS INTEGER,
+                                     SIZE INTEGER,
+                                     HASH TEXT,
+                                     DETAILS TEXT)''')
+        self.connection.execute('CREATE TABLE IF NOT EXISTS META (NAME TEXT PRIMARY KEY, VALUE TEXT)')
+        # Результаты, полученные с другими настройками разбора, не годятся - очищаем кэш
+        options_json = json.dumps(options or {}, sort_keys=True)
+        row = self.connection.execute("SELECT VALUE FROM META WHERE NAME = 'options'").fetchone()
+        if row is None or row[0] != options_json:
+            self.connection.execute('DELETE FROM FILES')
+            self.connection.execute("INSERT OR REPLACE INTO META (NAME, VALUE) VALUES ('options', ?)",
+                                    (options_json,))
+        self.hits = 0
+        self.misses = 0
+
+    def lookup(self, rel_path: str, stat: os.stat_result) -> Union[dict, None]:
+        row = self.connection.execute('SELECT MTIME_NS, SIZE, DETAILS FROM FILES WHERE PATH = ?',
+                                      (rel_path,)).fetchone()
+        if row and row[0] == stat.st_mtime_ns and row[1] == stat.st_size:
+            self.hits += 1
+            return json.loads(row[2])
+        return None
+
+    def lookup_content(self, rel_path: str, stat: os.stat_result, digest: str) -> Union[dict, None]:
+        row = self.connection.execute('SELECT HASH, DETAILS FROM FILES WHERE PATH = ?', (rel_path,)).fetchone()
+        if row and row[0] == digest:
+            # Содержимое не изменилось - запоминаем новые mtime и размер, чтобы в следующий раз не читать файл
+            self.connection.execute('UPDATE FILES SET MTIME_NS = ?, SIZE = ? WHERE PATH = ?',
+                                    (stat.st_mtime_ns, stat.st_size, rel_path))
+            self.hits += 1
+            return json.loads(row[1])
+        return None
+
+    def store(self, rel_path: str, stat: os.stat_result, digest: str, details: dict) -> None:
+        self.misses += 1
+        self.connection.execute('''
+            INSERT INTO FILES (PATH, MTIME_NS, SIZE, HASH, DETAILS)
+            VALUES (?, ?, ?, ?, ?)
+            ON CONFLICT(PATH) DO UPDATE SET MTIME_NS=excluded.MTIME_NS, SIZE=excluded.SIZE,
+                                            HASH=excluded.HASH, DETAILS=excluded.DETAILS
+        ''', (rel_path, stat.st_mtime_ns, stat.st_size, digest, json.dumps(details, ensure_ascii=False)))
+
+    def prune(self, seen_paths: Iterable[str]) -> None:
+        seen_paths = set(seen_paths)
+        stale = [(path,) for (path,) in self.connection.execute('SELECT PATH FROM FILES')
+                 if path not in seen_paths]
+        self.connection.executemany('DELETE FROM FILES WHERE PATH = ?', stale)
+
+    def close(self) -> None:
+        self.connection.commit()
+        self.connection.close()
@@ -0,0 +1,307 @@
+# Файл Analyzers/Clones.py содержит поиск дублирующегося и почти дублирующегося кода (клонов функций) в проекте
+# с постоянным индексом в базе SQLite (режим analyze --clones).
+#
+# Каждая функция и метод нормализуется: дерево AST тела (без строки документации) обходится в прямом порядке,
+# типы узлов становятся токенами, а все идентификаторы (имена, аргументы, атрибуты) заменяются номерами в
+# порядке первого появления, значения констант - их типом. Поэтому функции, отличающиеся только именами и
+# литералами, дают одну и ту же последовательность. Последовательность режется на шинглы (по SHINGLE токенов),
+# и по множеству шинглов строится сигнатура MinHash из SIGNATURE_SIZE значений (one permutation hashing:
+# одно хэширование на шингл, пустые корзины заполняются соседними со сдвигом). Доля совпадающих значений
+# сигнатур оценивает коэффициент Жаккара множеств шинглов.
+#
+# Поиск кластеров - LSH: сигнатура делится на BANDS полос, функции с совпадающей полосой попадают в одну
+# корзину и сравниваются с несколькими (не больше _BUCKET_LEADERS) несхожими между собой функциями корзины.
+# Функция, ещё не попавшая в кластер, присоединяется к кластеру образца (система непересекающихся множеств),
+# если её оценка сходства с корнем этого кластера не ниже порога; кластеры между собой не сливаются. Поэтому
+# сходство каждой функции кластера с его корнем не ниже порога, а в отчёте similarity - наименьшее из них.
+# Число сравнений линейно по числу функций, попарного перебора нет.
+#
+# Структура базы:
+#     FILES (ID, PATH, MTIME_NS, SIZE, DIGEST) - файлы; при повторном запуске файл с теми же mtime и размером
+#     не читается, а с тем же хэшем содержимого - не разбирается.
+#     FUNCTIONS (ID, FILE_ID, NAME, LINE, END_LINE, TOKENS, SIGNATURE) - функции и их сигнатуры.
+#     META (KEY, VALUE) - версия алгоритма и Python; при их изменении индекс строится заново.
+#
+# Классы и функции:
+#
+#     function_fingerprints(node): Возвращает [(имя, строка, последняя строка, число токенов, сигнатура)]
+#     для всех функций и методов дерева AST модуля; имя - с именами объемлющих классов и функций через точку.
+#
+#     CloneIndex:
+#         Методы:
+#             update(project_name, root_directory, ignore_rules): Добавляет файлы проекта, разбирая только
+#             изменённые. Возвращает (обновлено, удалено).
+#             clusters(threshold, min_tokens): Кластеры клонов среди функций не короче min_tokens токенов.
+#             close(): Закрывает базу.
+
+import ast
+import hashlib
+import operator
+import sqlite3
+import sys
+import zlib
+from array import array
+from typing import List, Tuple
+
+from Analyzers.Cache import like_escape
+from Analyzers.Walker import IgnoreRules, scan_tree
+
+SHINGLE = 5
+SIGNATURE_SIZE = 64
+BANDS = 16
+_ROWS = SIGNATURE_SIZE // BANDS
+_BAND_BYTES = _ROWS * 8
+_BIN_BITS = 6  # log2(SIGNATURE_SIZE)
+_VALUE_MASK = (1 << (64 - _BIN_BITS)) - 1
+_MASK64 = (1 << 64) - 1
+# Сколько несхожих между собой функций корзины служат образцами для сравнения (ограничивает число сравнений)
+_BUCKET_LEADERS = 4
+_VERSION = f"1:{SHINGLE}:{SIGNATURE_SIZE}:{sys.version_info[0]}.{sys.version_info[1]}"
+
+# Атрибуты узлов, содержащие идентификаторы
+_IDENTIFIERS = {ast.Name: 'id', ast.arg: 'arg', ast.Attribute: 'attr', ast.keyword: 'arg', ast.alias: 'name',
+                ast.FunctionDef: 'name', ast.AsyncFunctionDef: 'name', ast.ClassDef: 'name'}
+# Поля, в которых могут находиться инструкции (функции объявляются только инструкциями)
+_STATEMENT_FIELDS = ('body', 'orelse', 'finalbody', 'handlers', 'cases')
+_token_ids = {}
+_child_fields_cache = {}
+
+
+def _token(kind: str) -> int:
+    # Стабильный между запусками номер токена (hash строк зависит от PYTHONHASHSEED)
+    if kind not in _token_ids:
+        _token_ids[kind] = zlib.crc32(kind.encode('ascii')) | (1 << 32)
+    return _token_ids[kind]
+
+
+def _child_fields(node_type: type) -> tuple:
+    if node_type not in _child_fields_cache:
+        # ctx (Load/Store/Del) не несёт информации для сравнения
+        _child_fields_cache[node_type] = tuple(field for field in node_type._fields if field != 'ctx')
+    return _child_fields_cache[node_type]
+
+
+def _normalized_tokens(function: ast.AST) -> List[int]:
+    body = function.body
+    if (body and isinstance(body[0], ast.Expr) and isinstance(body[0].value, ast.Constant)
+            and isinstance(body[0].value.value, str)):
+        body = body[1:]
+    names = {}
+    tokens = []
+    stack = [*reversed(body), function.args]
+    while stack:
+        node = stack.pop()
+        node_type = type(node)
+        tokens.append(_token(node_type.__name__))
+        field = _IDENTIFIERS.get(node_type)
+        if field:
+            name = getattr(node, field)
+            if name is not None:
+                # Номер идентификатора в порядке первого появления (меньше 2**32, не совпадает с токенами типов)
+                tokens.append(names.setdefault(name, len(names)))
+        elif node_type is ast.Constant:
+            tokens.append(_token('const:' + type(node.value).__name__))
+        children = []
+        for field in _child_fields(node_type):
+            value = getattr(node, field, None)
+            if type(value) is list:
+                children.extend(item for item in value if isinstance(item, ast.AST))
+            elif isinstance(value, ast.AST):
+                children.append(value)
+        stack.extend(reversed(children))
+    return tokens
+
+
+def _signature(tokens: List[int]) -> bytes:
+    bins = [None] * SIGNATURE_SIZE
+    for i in range(max(len(tokens) - SHINGLE + 1, 1)):
+        # hash кортежа целых чисел не зависит от PYTHONHASHSEED; умножение перемешивает биты
+        value = (hash(tuple(tokens[i:i + SHINGLE])) * 0x9E3779B97F4A7C15) & _MASK64
+        index = value >> (64 - _BIN_BITS)
+        value &= _VALUE_MASK
+        if bins[index] is None or value < bins[index]:
+            bins[index] = value
+    # Пустые корзины заполняются ближайшей следующей непустой со сдвигом (densification)
+    filled = [index for index, value in enumerate(bins) if value is not None]
+    signature = array('Q', bins if len(filled) == SIGNATURE_SIZE else [0] * SIGNATURE_SIZE)
+    if len(filled) < SIGNATURE_SIZE:
+        for index in range(SIGNATURE_SIZE):
+            offset = 0
+            while bins[(index + offset) % SIGNATURE_SIZE] is None:
+                offset += 1
+            signature[index] = bins[(index + offset) % SIGNATURE_SIZE] + (offset << (64 - _BIN_BITS))
+    return signature.tobytes()
+
+
+def _similarity(first: bytes, second: bytes) -> float:
+    return sum(map(operator.eq, array('Q', first), array('Q', second))) / SIGNATURE_SIZE
+
+
+def function_fingerprints(node: ast.AST) -> List[tuple]:
+    fingerprints = []
+    stack = [(node, '')]
+    while stack:
+        current, prefix = stack.pop()
+        # Спускаемся только по спискам инструкций, выражения не просматриваем
+        for field in _STATEMENT_FIELDS:
+            for child in getattr(current, field, None) or ():
+                if isinstance(child, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+                    name = prefix + child.name
+                    if not isinstance(child, ast.ClassDef):
+                        tokens = _normalized_tokens(child)
+                        fingerprints.append((name, child.lineno, child.end_lineno, len(tokens), _signature(tokens)))
+                    stack.append((child, name + '.'))
+                else:
+                    stack.append((child, prefix))
+    fingerprints.sort(key=lambda fingerprint: fingerprint[1])
+    return fingerprints
+
+
+class CloneIndex:
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self.connection = sqlite3.connect(db_path)
+        self.connection.execute('PRAGMA foreign_keys = ON')
+        self.connection.executescript('''
+            CREATE TABLE IF NOT EXISTS META (
+                KEY TEXT PRIMARY KEY,
+                VALUE TEXT NOT NULL);
+            CREATE TABLE IF NOT EXISTS FILES (
+                ID INTEGER PRIMARY KEY,
+                PATH TEXT UNIQUE NOT NULL,
+                MTIME_NS INTEGER NOT NULL,
+                SIZE INTEGER NOT NULL,
+                DIGEST TEXT NOT NULL);
+            CREATE TABLE IF NOT EXISTS FUNCTIONS (
+                ID INTEGER PRIMARY KEY,
+                FILE_ID INTEGER NOT NULL REFERENCES FILES(ID) ON DELETE CASCADE,
+                NAME TEXT NOT NULL,
+                LINE INTEGER NOT NULL,
+                END_LINE INTEGER NOT NULL,
+                TOKENS INTEGER NOT NULL,
+                SIGNATURE BLOB NOT NULL);
+            CREATE INDEX IF NOT EXISTS FUNCTIONS_FILE ON FUNCTIONS(FILE_ID);
+        ''')
+        row = self.connection.execute("SELECT VALUE FROM META WHERE KEY = 'version'").fetchone()
+        if not row or row[0] != _VERSION:
+            # Сигнатуры другой версии алгоритма или Python несравнимы с новыми
+            with self.connection:
+                self.connection.execute('DELETE FROM FILES')
+                self.connection.execute("INSERT OR REPLACE INTO META (KEY, VALUE) VALUES ('version', ?)", (_VERSION,))
+
+    def update(self, project_name: str, root_directory: str, ignore_rules: IgnoreRules = None) -> Tuple[int, int]:
+        known = {path: (file_id, mtime_ns, size, digest) for file_id, path, mtime_ns, size, digest
+                 in self.connection.execute(
+                     'SELECT ID, PATH, MTIME_NS, SIZE, DIGEST FROM FILES WHERE PATH LIKE ? ESCAPE ?',
+                     (like_escape(project_name) + '/%', '\\'))}
+        updated = 0
+        seen = set()
+        scan = scan_tree(root_directory, ignore_rules or IgnoreRules(), with_digests=True)
+        with self.connection:
+            stack = [(scan, project_name)]
+            while stack:
+                current, rel_dir = stack.pop()
+                for name, item_path, child in current.entries:
+                    path = f"{rel_dir}/{name}"
+                    if child is not None:
+                        stack.append((child, path))
+                        continue
+                    seen.add(path)
+                    mtime_ns, size = current.file_stats[name]
+                    if self._update_file(path, item_path, mtime_ns, size, known.get(path)):
+                        updated += 1
+            removed = [(path,) for path in known if path not in seen]
+            self.connection.executemany('DELETE FROM FILES WHERE PATH = ?', removed)
+        return updated, len(removed)
+
+    def _update_file(self, path: str, file_path: str, mtime_ns: int, size: int, known: tuple) -> bool:
+        if known and known[1:3] == (mtime_ns, size):
+            return False
+        try:
+            with open(file_path, 'rb') as f:
+                source = f.read()
+        except OSError:
+            return False
+        digest = hashlib.sha1(source).hexdigest()
+        if known and known[3] == digest:
+            # Файл "тронут" без изменения содержимого
+            self.connection.execute('UPDATE FILES SET MTIME_NS = ?, SIZE = ? WHERE ID = ?', (mtime_ns, size, known[0]))
+            return False
+        try:
+            fingerprints = function_fingerprints(ast.parse(source, filename=file_path))
+        except (SyntaxError, ValueError, RecursionError):
+            fingerprints = []
+        cursor = self.connection.cursor()
+        cursor.execute('DELETE FROM FILES WHERE PATH = ?', (path,))
+        cursor.execute('INSERT INTO FILES (PATH, MTIME_NS, SIZE, DIGEST) VALUES (?, ?, ?, ?)',
+                       (path, mtime_ns, size, digest))
+        file_id = cursor.lastrowid
+        cursor.executemany('INSERT INTO FUNCTIONS (FILE_ID, NAME, LINE, END_LINE, TOKENS, SIGNATURE) '
+                           'VALUES (?, ?, ?, ?, ?, ?)',
+                           [(file_id,) + fingerprint for fingerprint in fingerprints])
+        return True
+
+    def clusters(self, threshold: float = 0.8, min_tokens: int = 40) -> List[dict]:
+        signatures = dict(self.connection.execute(
+            'SELECT ID, SIGNATURE FROM FUNCTIONS WHERE TOKENS >= ?', (min_tokens,)))
+        parents = {}
+
+        def find(function_id):
+            root = function_id
+            while parents.get(root, root) != root:
+                root = parents[root]
+            while function_id != root:
+                parents[function_id], function_id = root, parents.get(function_id, function_id)
+            return root
+
+        for band in range(BANDS):
+            start = band * _BAND_BYTES
+            buckets = {}
+            for function_id, signature in signatures.items():
+                leaders = buckets.setdefault(signature[start:start + _BAND_BYTES], [])
+                for leader in leaders:
+                    root = find(leader)
+                    if root == find(function_id):
+                        break
+                    if function_id in parents:
+                        # Функция уже в другом кластере; кластеры не сливаются, иначе цепочка пар дала бы
+                        # в кластере функции с меньшим, чем порог, сходством
+                        continue
+                    # Функция добавляется, только если она не ниже порога сходна с корнем кластера
+                    if signatures[root] == signature or _similarity(signatures[root], signature) >= threshold:
+                        parents.setdefault(root, root)
+                        parents[function_id] = root
+                        break
+                else:
+                    if len(leaders) < _BUCKET_LEADERS:
+                        leaders.append(function_id)
+        groups = {}
+        for function_id in parents:
+            groups.setdefault(find(function_id), []).append(function_id)
+        return self._describe(groups, signatures)
+
+    def _describe(self, groups: dict, signatures: dict) -> List[dict]:
+        rows = {}
+        members = [function_id for group in groups.values() for function_id in group]
+        for i in range(0, len(members), 500):
+            chunk = members[i:i + 500]
+            rows.update((row[0], row[1:]) for row in self.connection.execute(
+                'SELECT f.ID, FILES.PATH, f.NAME, f.LINE, f.END_LINE, f.TOKENS FROM FUNCTIONS f '
+                f'JOIN FILES ON FILES.ID = f.FILE_ID WHERE f.ID IN ({",".join("?" * len(chunk))})', chunk))
+        clusters = []
+        for root, group in groups.items():
+            group = sorted(group, key=lambda function_id: rows[function_id][:2])
+            functions = [dict(zip(('path', 'name', 'line', 'end_line', 'tokens'), rows[function_id]))
+                         for function_id in group]
+            clusters.append({
+                'size': len(group),
+                'tokens': max(function['tokens'] for function in functions),
+                'similarity': min(_similarity(signatures[root], signatures[function_id]) for function_id in group),
+                'functions': functions,
+            })
+        # Сначала крупные кластеры длинных функций
+        clusters.sort(key=lambda cluster: (-cluster['size'] * cluster['tokens'], cluster['functions'][0]['path']))
+        return clusters
+
+    def close(self) -> None:
+        self.connection.close()
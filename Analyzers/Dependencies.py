@@ -0,0 +1,183 @@
+# Файл Analyzers/Dependencies.py содержит граф зависимостей между модулями проекта, построенный по импортам,
+# которые ProjectAnalyzer извлекает при разборе файлов (параметр collect_imports).
+#
+# Граф хранится в виде сжатых разреженных строк (CSR): модули пронумерованы, для каждого модуля в массиве
+# offsets лежит начало его списка соседей в плоском массиве targets. Массивы array('l') занимают несколько
+# байт на ребро и позволяют выполнять запросы за доли секунды даже на графах из десятков тысяч модулей.
+#
+# Классы и функции:
+#
+#     extract_imports(node): Возвращает список импортов модуля AST в виде строк: `pkg.mod` для `import pkg.mod`,
+#     `..pkg.name` для `from ..pkg import name` (точки в начале - уровень относительного импорта).
+#
+#     DependencyGraph:
+#         from_architecture(tree): Строит граф по дереву архитектуры проекта с ключами 'imports'.
+#         dependencies(module), dependents(module): Прямые зависимости и обратные зависимости модуля.
+#         transitive(module, reverse): Транзитивное замыкание зависимостей (или обратных зависимостей).
+#         affected(module): Модули, которые нужно проанализировать заново при изменении module.
+#         cycles(): Циклы импортов (сильно связные компоненты из нескольких модулей или с петлёй).
+
+import ast
+from array import array
+from typing import Dict, List
+
+from Analyzers.Nodes import iter_modules
+
+
+def extract_imports(node: ast.AST) -> List[str]:
+    imports = []
+    for item in ast.walk(node):
+        if isinstance(item, ast.Import):
+            imports.extend(alias.name for alias in item.names)
+        elif isinstance(item, ast.ImportFrom):
+            prefix = '.' * item.level + (item.module or '')
+            for alias in item.names:
+                if alias.name == '*':
+                    imports.append(prefix)
+                elif prefix.endswith('.') or not prefix:
+                    imports.append(prefix + alias.name)
+                else:
+                    imports.append(f"{prefix}.{alias.name}")
+    return imports
+
+
+def _module_name(rel_path: str) -> str:
+    parts = rel_path[:-3].split('/')
+    if parts[-1] == '__init__':
+        parts.pop()
+    return '.'.join(parts)
+
+
+class DependencyGraph:
+    def __init__(self, modules: List[str], edges: Dict[int, set]):
+        self.modules = modules
+        self.index = {name: i for i, name in enumerate(modules)}
+        self.offsets, self.targets = self._build_csr(len(modules), edges)
+        reverse = {}
+        for source, targets in edges.items():
+            for target in targets:
+                reverse.setdefault(target, set()).add(source)
+        self.reverse_offsets, self.reverse_targets = self._build_csr(len(modules), reverse)
+
+    @staticmethod
+    def _build_csr(size: int, edges: Dict[int, set]) -> tuple:
+        offsets = array('l', [0]) * (size + 1)
+        targets = array('l')
+        for i in range(size):
+            neighbours = edges.get(i)
+            if neighbours:
+                targets.extend(sorted(neighbours))
+            offsets[i + 1] = len(targets)
+        return offsets, targets
+
+    @classmethod
+    def from_architecture(cls, tree: dict) -> 'DependencyGraph':
+        """Строит граф по дереву одного проекта (значение architecture[имя проекта])."""
+        module_imports = {_module_name(rel_path): (rel_path, details.get('imports', []))
+                          for rel_path, details in iter_modules(tree)}
+        modules = sorted(module_imports)
+        index = {name: i for i, name in enumerate(modules)}
+        edges = {}
+        for name, (rel_path, imports) in module_imports.items():
+            is_package = rel_path.endswith('__init__.py')
+            for imported in imports:
+                target = cls._resolve(imported, name, is_package, index)
+                if target is not None:
+                    edges.setdefault(index[name], set()).add(target)
+        return cls(modules, edges)
+
+    @staticmethod
+    def _resolve(imported: str, module: str, is_package: bool, index: Dict[str, int]):
+        """Сопоставляет импорт модулю проекта по самому длинному существующему префиксу."""
+        level = len(imported) - len(imported.lstrip('.'))
+        if level:
+            base = module.split('.') if module else []
+            if not is_package:
+                base = base[:-1]
+            if level - 1 > len(base):
+                return None
+            base = base[:len(base) - (level - 1)]
+            rest = imported[level:]
+            imported = '.'.join(base + ([rest] if rest else []))
+        parts = imported.split('.')
+        while parts:
+            target = index.get('.'.join(parts))
+            if target is not None:
+                return target
+            parts.pop()
+        return None
+
+    def _neighbours(self, i: int, reverse: bool = False):
+        offsets, targets = (self.reverse_offsets, self.reverse_targets) if reverse else (self.offsets, self.targets)
+        return targets[offsets[i]:offsets[i + 1]]
+
+    def dependencies(self, module: str) -> List[str]:
+        return [self.modules[i] for i in self._neighbours(self.index[module])]
+
+    def dependents(self, module: str) -> List[str]:
+        return [self.modules[i] for i in self._neighbours(self.index[module], reverse=True)]
+
+    def transitive(self, module: str, reverse: bool = False) -> List[str]:
+        offsets, targets = (self.reverse_offsets, self.reverse_targets) if reverse else (self.offsets, self.targets)
+        start = self.index[module]
+        visited = bytearray(len(self.modules))
+        visited[start] = 1
+        queue = [start]
+        for i in queue:
+            for j in targets[offsets[i]:offsets[i + 1]]:
+                if not visited[j]:
+                    visited[j] = 1
+                    queue.append(j)
+        return sorted(self.modules[i] for i in queue[1:])
+
+    def affected(self, module: str) -> List[str]:
+        """Сам модуль и все модули, которые прямо или транзитивно его импортируют."""
+        return sorted([module] + self.transitive(module, reverse=True))
+
+    def cycles(self) -> List[List[str]]:
+        # Итеративный алгоритм Тарьяна
+        size = len(self.modules)
+        offsets, targets = self.offsets, self.targets
+        index_of = [-1] * size
+        low = [0] * size
+        on_stack = bytearray(size)
+        stack = []
+        components = []
+        counter = 0
+        for root in range(size):
+            if index_of[root] != -1:
+                continue
+            work = [(root, offsets[root])]
+            index_of[root] = low[root] = counter
+            counter += 1
+            stack.append(root)
+            on_stack[root] = 1
+            while work:
+                node, position = work[-1]
+                if position < offsets[node + 1]:
+                    work[-1] = (node, position + 1)
+                    child = targets[position]
+                    if index_of[child] == -1:
+                        index_of[child] = low[child] = counter
+                        counter += 1
+                        stack.append(child)
+                        on_stack[child] = 1
+                        work.append((child, offsets[child]))
+                    elif on_stack[child]:
+                        low[node] = min(low[node], index_of[child])
+                    continue
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    low[parent] = min(low[parent], low[node])
+                if low[node] == index_of[node]:
+                    component = []
+                    while True:
+                        member = stack.pop()
+                        on_stack[member] = 0
+                        component.append(member)
+                        if member == node:
+                            break
+                    if len(component) > 1 or node in self._neighbours(node):
+                        components.append(sorted(self.modules[i] for i in component))
+        return sorted(components)
@@ -0,0 +1,205 @@
+# Файл Analyzers/FastParser.py содержит быстрый построчный извлекатель классов, методов, полей, функций и
+# переменных Python-модуля - альтернативу полному разбору ast.parse для режима analyze --fast.
+#
+# Для архитектуры нужны только инструкции верхнего уровня и тела классов верхнего уровня, поэтому строить
+# полное дерево AST не обязательно. Сканер один раз проходит исходный текст регулярным выражением (строки,
+# комментарии, скобки и переводы строк), находит начала логических строк вне скобок и разбирает только
+# строки с нулевым отступом и с отступом тела класса. Тела функций и методов (основная часть, например,
+# в модулях, сгенерированных pyuic5) пропускаются без разбора.
+#
+# Результат совпадает с ProjectAnalyzer.parse_python_file_details (см. python -m Benchmarks.FastParser):
+# учитываются только `class`, `def` (не `async def`) и присваивания `=` с простыми именами в целях.
+# В неоднозначных случаях (незакрытые строки и скобки, неожиданные отступы, BOM, символы \0 и \f)
+# функции возвращают None, и файл разбирается через ast. Синтаксис при этом полностью не проверяется:
+# для файлов с синтаксическими ошибками ast возвращает пустой результат, а сканер - найденные имена.
+#
+# Функции:
+#
+#     scan_python_details(text): Возвращает (classes, functions, variables) в формате
+#     parse_python_file_details или None, если текст нужно разобрать через ast.
+#
+#     read_python_details(file_path, source): То же для файла (source - уже прочитанное содержимое в байтах);
+#     None также при ошибке чтения или декодирования.
+
+import keyword
+import re
+from typing import List, Union
+
+_STRING = r"""(?:
+    '{3}[^'\\]*(?:(?:\\.|'(?!''))[^'\\]*)*'{3}
+    |"{3}[^"\\]*(?:(?:\\.|"(?!""))[^"\\]*)*"{3}
+    |'[^'\\\n]*(?:\\.[^'\\\n]*)*'
+    |"[^"\\\n]*(?:\\.[^"\\\n]*)*")"""
+# Комментарий всегда до конца строки: иначе при неудачном совпадении перебирались бы все его разбиения
+_COMMENT = r'\#[^\n]*(?![^\n])'
+_CONTINUATION = r'\\\n'
+_PLAIN = r"""[^'"\#()\[\]{}\\]*"""
+
+
+def _brackets(depth: int) -> str:
+    """Выражение для скобок с вложенностью до depth (внутри скобок допустимы переводы строк и комментарии)."""
+    inner = '|'.join((_STRING, _COMMENT, _CONTINUATION))
+    pattern = rf'[(\[{{]{_PLAIN}(?:(?:{inner}){_PLAIN})*[)\]}}]'
+    for _ in range(depth - 1):
+        pattern = rf'[(\[{{]{_PLAIN}(?:(?:{inner}|{pattern}){_PLAIN})*[)\]}}]'
+    return pattern
+
+
+# Логическая строка без отступа и завершающего перевода строки. Если строка обрывается раньше (незакрытая
+# строка или скобки, вложенность скобок больше _MAX_DEPTH), совпадение заканчивается не на `\n`.
+_MAX_DEPTH = 8
+_LINE_PATTERN = (rf"""[^'"\#()\[\]{{}}\\\n]*(?:(?:{_STRING}|{_CONTINUATION}|{_brackets(_MAX_DEPTH)})"""
+                 rf"""[^'"\#()\[\]{{}}\\\n]*)*(?:{_COMMENT})?""")
+_LINE = re.compile(_LINE_PATTERN, re.VERBOSE | re.DOTALL)
+_BLANK_LINES = re.compile(r'(?:[ \t]*(?:\#[^\n]*)?\n)*')
+_STRIP = re.compile(rf'(?P<string>{_STRING})|{_COMMENT}|{_CONTINUATION}', re.VERBOSE | re.DOTALL)
+# Имя в скобках, не являющихся вызовом: `(a) = 1` для ast то же, что `a = 1`
+_PARENTHESIZED_NAME = re.compile(r'(?<![\w)\]}"])\(\s*([^\W\d]\w*)\s*\)')
+_BRACKETS = re.compile(r'\([^()\[\]{}]*\)|\[[^()\[\]{}]*\]|\{[^()\[\]{}]*\}')
+_ASSIGN = re.compile(r'(?<![=!<>:+\-*/%@&|^])=(?!=)')
+_INDENT = re.compile(r'[ \t]*')
+_FORM_FEED_LINE = re.compile(r'^[ \t]*\f[ \t\f]*$', re.MULTILINE)
+_DEFINITION = re.compile(r'(class|def)\s+([^\W\d]\w*)')
+_FIRST_WORD = re.compile(r'[^\W\d]\w*|\S')
+
+# Составные инструкции: присваивания в их заголовке или теле на той же строке не относятся к модулю/классу
+_COMPOUND = frozenset(('if', 'elif', 'else', 'for', 'while', 'try', 'except', 'finally', 'with', 'async', '@'))
+
+_nested_blocks = {}
+
+
+def _nested_block(indent: str):
+    """Выражение, пропускающее за один вызов блок строк с отступом больше indent (и пустые строки в нём)."""
+    if indent not in _nested_blocks:
+        _nested_blocks[indent] = re.compile(
+            rf'(?:{re.escape(indent)}[ \t]+(?=[^\s\#]){_LINE_PATTERN}\n|[ \t]*(?:\#[^\n]*)?\n)*', re.VERBOSE | re.DOTALL)
+    return _nested_blocks[indent]
+
+
+class _Ambiguous(Exception):
+    pass
+
+
+def _mask(statement: str) -> str:
+    """Заменяет строки пустыми литералами, убирает комментарии и содержимое скобок."""
+    masked = _STRIP.sub(lambda match: '""' if match.lastgroup == 'string' else ' ', statement)
+    while True:
+        reduced = _PARENTHESIZED_NAME.sub(r' \1 ', masked)
+        if reduced == masked:
+            reduced = _BRACKETS.sub(lambda match: match.group()[0] + match.group()[-1], masked)
+            if reduced == masked:
+                return masked
+        masked = reduced
+
+
+def _assigned_names(statement: str) -> List[str]:
+    """Имена из целей присваивания `a = b = ...` (как ast.Name в ast.Assign.targets)."""
+    *targets, _ = _ASSIGN.split(statement)
+    names = []
+    for target in targets:
+        target = target.strip()
+        if target.isidentifier():
+            if keyword.iskeyword(target):
+                raise _Ambiguous
+            names.append(target)
+    return names
+
+
+def _simple_statements(statement: str) -> List[str]:
+    names = []
+    if '=' in statement:
+        for simple_statement in _mask(statement).split(';'):
+            names.extend(_assigned_names(simple_statement))
+    return names
+
+
+def _scan(text: str) -> tuple:
+    if not text.endswith('\n'):
+        text += '\n'
+    classes = []
+    functions = []
+    variables = []
+    class_info = None
+    body_indent = None
+    previous = None
+    position = _BLANK_LINES.match(text).end()
+    size = len(text)
+    while position < size:
+        indent_end = _INDENT.match(text, position).end()
+        indent = text[position:indent_end]
+        if class_info is not None and body_indent is None:
+            if not indent:
+                # Заголовок класса без тела
+                raise _Ambiguous
+            body_indent = indent
+        if not indent:
+            class_info = None
+        elif class_info is None or indent != body_indent:
+            # Вложенный блок (тело функции, if и т.п.) пропускается целиком; неожиданный отступ оставляем ast
+            if previous is None or not _mask(previous).rstrip().endswith(':'):
+                raise _Ambiguous
+            level = body_indent if class_info is not None else ''
+            if not indent.startswith(level):
+                raise _Ambiguous
+            position = _nested_block(level).match(text, position).end()
+            previous = None
+            continue
+
+        line_end = _LINE.match(text, indent_end).end()
+        if text[line_end] != '\n':
+            raise _Ambiguous
+        statement = previous = text[indent_end:line_end]
+        position = _BLANK_LINES.match(text, line_end + 1).end()
+        target = class_info
+
+        first_word = _FIRST_WORD.match(statement).group()
+        if first_word in _COMPOUND:
+            continue
+        if first_word in ('class', 'def'):
+            definition = _DEFINITION.match(statement)
+            if definition is None:
+                raise _Ambiguous
+            if first_word == 'def':
+                (target['methods'] if target else functions).append(definition.group(2))
+            elif target is None:
+                class_info = {'name': definition.group(2), 'methods': [], 'fields': []}
+                classes.append(class_info)
+                body = _mask(statement).partition(':')[2].strip()
+                if body:
+                    # Тело класса на той же строке: `class Error(Exception): pass`
+                    class_info['fields'].extend(_simple_statements(body))
+                    class_info = None
+                else:
+                    body_indent = None
+            continue
+        (target['fields'] if target else variables).extend(_simple_statements(statement))
+
+    if class_info is not None and body_indent is None:
+        raise _Ambiguous
+    return classes, functions, variables
+
+
+def scan_python_details(text: str) -> Union[tuple, None]:
+    if '\f' in text:
+        # Строки только из перевода страницы (разделители в стиле старой стандартной библиотеки) - пустые
+        text = _FORM_FEED_LINE.sub('', text)
+    if '\0' in text or '\f' in text or text.startswith('\ufeff'):
+        return None
+    if '\r' in text:
+        text = text.replace('\r\n', '\n').replace('\r', '\n')
+    try:
+        return _scan(text)
+    except _Ambiguous:
+        return None
+
+
+def read_python_details(file_path: str, source: bytes = None) -> Union[tuple, None]:
+    try:
+        if source is None:
+            with open(file_path, "r", encoding="utf-8") as f:
+                text = f.read()
+        else:
+            text = source.decode("utf-8")
+    except (OSError, UnicodeDecodeError):
+        return None
+    return scan_python_details(text)
@@ -0,0 +1,125 @@
+# Файл Analyzers/Merkle.py содержит дерево Меркла для директорий проекта, которое позволяет ProjectAnalyzer
+# переиспользовать неизменённые поддеревья архитектуры целиком, а также быстро сравнивать две архитектуры.
+#
+# Дайджест директории строится из имён дочерних элементов, mtime и размеров Python-файлов и дайджестов
+# поддиректорий. Если дайджест директории совпадает с сохранённым в прошлом запуске, её поддерево берётся
+# из снимка без обращения к кэшу файлов и без разбора.
+#
+# Классы и функции:
+#
+#     Сами дайджесты вычисляются при обходе дерева (Analyzers/Walker.py, scan_tree с with_digests=True).
+#
+#     TreeSnapshot:
+#         Снимок прошлого запуска (<кэш>/tree.json): архитектура и дайджесты директорий.
+#         Методы:
+#             load(options, compact): Возвращает (архитектура, дайджесты), если снимок сделан с теми же настройками;
+#             с compact=True модули архитектуры - объекты Module (см. Analyzers/Nodes.py).
+#             save(architecture, digests, options): Сохраняет снимок.
+#
+#     diff_architectures(old, new, old_digests, new_digests): Сравнивает две архитектуры и возвращает
+#     добавленные, удалённые и изменённые модули. Поддеревья с совпадающими дайджестами отсекаются без обхода;
+#     без дайджестов (обычный JSON архитектуры) дерево обходится целиком, но один раз.
+#
+#     print_diff(changes): Печатает результат diff_architectures.
+
+import json
+import os
+from typing import Dict, List, Union
+
+from Analyzers.Nodes import is_module, iter_modules, module_hook, node_to_json
+
+SNAPSHOT_VERSION = 1
+
+
+class TreeSnapshot:
+    def __init__(self, cache_dir: str, file_name: str = 'tree.json'):
+        self.path = os.path.join(cache_dir, file_name)
+
+    def load(self, options: dict, compact: bool = False) -> tuple:
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                # В компактном режиме модули преобразуются в Module прямо при разборе
+                snapshot = json.load(f, object_hook=module_hook if compact else None)
+        except (OSError, ValueError):
+            return None, {}
+        if snapshot.get('version') != SNAPSHOT_VERSION or snapshot.get('options') != options:
+            return None, {}
+        return snapshot.get('architecture'), snapshot.get('digests', {})
+
+    def save(self, architecture: dict, digests: Dict[str, str], options: dict) -> None:
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        temp_path = self.path + '.tmp'
+        try:
+            data = json.dumps({'version': SNAPSHOT_VERSION, 'options': options,
+                               'digests': digests, 'architecture': architecture}, ensure_ascii=False,
+                              default=node_to_json)
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                f.write(data)
+            os.replace(temp_path, self.path)
+        except (OSError, RecursionError) as e:
+            # Без снимка следующий запуск просто обойдёт дерево заново
+            print(f"Error saving tree snapshot: {e}")
+
+
+def load_snapshot_file(file_path: str) -> tuple:
+    """Загружает архитектуру для сравнения: снимок tree.json (с дайджестами) или обычный JSON архитектуры."""
+    with open(file_path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    if isinstance(data, dict) and data.get('version') == SNAPSHOT_VERSION and 'architecture' in data:
+        return data['architecture'], data.get('digests', {})
+    if isinstance(data, dict) and len(data) == 1:
+        # Формат save_architecture_to_json: {имя проекта: дерево}
+        return next(iter(data.values())), {}
+    return data, {}
+
+
+def diff_architectures(old: dict, new: dict, old_digests: Dict[str, str] = None,
+                       new_digests: Dict[str, str] = None) -> Dict[str, List[str]]:
+    """
+    Сравнивает две архитектуры (деревья одной директории проекта).
+    Поддеревья с одинаковыми дайджестами не обходятся, поэтому время сравнения пропорционально объёму
+    изменений. Без дайджестов дерево обходится один раз целиком: каждый модуль сравнивается ровно один раз.
+    """
+    old_digests = old_digests or {}
+    new_digests = new_digests or {}
+    result = {'added': [], 'removed': [], 'changed': []}
+    stack = [('.', old or {}, new or {})]
+    while stack:
+        rel_path, old_tree, new_tree = stack.pop()
+        old_digest = old_digests.get(rel_path)
+        if old_digest is not None and old_digest == new_digests.get(rel_path):
+            continue
+        for name, new_value in new_tree.items():
+            child_path = name if rel_path == '.' else f"{rel_path}/{name}"
+            old_value = old_tree.get(name)
+            if is_module(name, new_value):
+                if old_value is None:
+                    result['added'].append(child_path)
+                elif old_value != new_value:
+                    result['changed'].append(child_path)
+            elif old_value is None:
+                result['added'].extend(_modules_of(new_value, child_path))
+            else:
+                stack.append((child_path, old_value, new_value))
+        for name, old_value in old_tree.items():
+            if name not in new_tree:
+                child_path = name if rel_path == '.' else f"{rel_path}/{name}"
+                if is_module(name, old_value):
+                    result['removed'].append(child_path)
+                else:
+                    result['removed'].extend(_modules_of(old_value, child_path))
+    for paths in result.values():
+        paths.sort()
+    return result
+
+
+def print_diff(changes: Dict[str, List[str]]) -> None:
+    for marker, key in (('+', 'added'), ('-', 'removed'), ('~', 'changed')):
+        for path in changes[key]:
+            print(f"{marker} {path}")
+    print(f"Добавлено: {len(changes['added'])}, удалено: {len(changes['removed'])}, "
+          f"изменено: {len(changes['changed'])}")
+
+
+def _modules_of(tree: Union[dict, None], rel_path: str) -> List[str]:
+    return [path for path, _ in iter_modules(tree or {}, rel_path)]
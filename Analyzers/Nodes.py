@@ -0,0 +1,160 @@
+# Файл Analyzers/Nodes.py содержит компактное представление дерева архитектуры проекта.
+#
+# Обычное дерево ProjectAnalyzer - вложенные словари, где у каждого модуля есть словарь
+# {'classes', 'functions', 'variables'}, а у каждого класса - словарь {'name', 'methods', 'fields'} со списками.
+# В компактном представлении вместо них используются объекты со __slots__ (без __dict__ на каждый экземпляр),
+# списки заменены кортежами, а имена интернированы (sys.intern), поэтому повторяющиеся имена вроде
+# `__init__`, `self` или `run` хранятся в памяти один раз.
+#
+# Классы:
+#
+#     ClassInfo: Класс модуля - имя, кортежи методов и полей.
+#     Module: Модуль - кортежи классов, функций, переменных и (если собирались) импортов и находок perf-lint
+#     (кортежи (правило, строка, глубина)).
+#     Directory: Директория - словарь дочерних элементов (Directory или Module) с интернированными именами.
+#
+# У каждого класса есть адаптеры from_dict(...) и to_dict() к прежнему формату на словарях.
+#
+#     node_to_json(node): Функция default для json.dump/json.dumps. Директория отдаётся своим словарём children,
+#     модуль - словарём to_dict() только на время его записи, поэтому save_architecture_to_json и снимок дерева
+#     (Analyzers/Merkle.py) не строят копию всего дерева на словарях. print_architecture и
+#     save_architecture_to_xml так же обходят узлы напрямую.
+#
+#     module_hook(value): Функция object_hook для json.load: словарь модуля сразу заменяется Module, так что
+#     снимок дерева в компактном режиме загружается без полной копии на словарях.
+#
+# Общие для всех анализаторов (PerfLint, SymbolIndex, Dependencies, Merkle, Streaming) правила обхода дерева:
+#
+#     is_module_details(value): Словарь сведений модуля (classes, functions, variables, ...), а не словарь
+#     дочерних элементов директории: значение 'classes' - список (в XML - строка str(list)).
+#     is_module(name, value): Элемент дерева - модуль: Python-файл, значение - Module или сведения модуля.
+#     iter_modules(tree, prefix): Обходит дерево (словари или узлы компактного дерева) без рекурсии и
+#     возвращает пары (путь от prefix, сведения модуля словарём); Module преобразуется по одному.
+
+import sys
+from typing import Dict, Union
+
+_intern = sys.intern
+
+
+class ClassInfo:
+    __slots__ = ('name', 'methods', 'fields')
+
+    def __init__(self, name: str, methods: tuple = (), fields: tuple = ()):
+        self.name = _intern(name)
+        self.methods = tuple(_intern(method) for method in methods)
+        self.fields = tuple(_intern(field) for field in fields)
+
+    @classmethod
+    def from_dict(cls, class_info: dict) -> 'ClassInfo':
+        return cls(class_info['name'], class_info.get('methods', ()), class_info.get('fields', ()))
+
+    def to_dict(self) -> dict:
+        return {'name': self.name, 'methods': list(self.methods), 'fields': list(self.fields)}
+
+
+class Module:
+    __slots__ = ('classes', 'functions', 'variables', 'imports', 'hotspots')
+
+    def __init__(self, classes: tuple = (), functions: tuple = (), variables: tuple = (), imports: tuple = None,
+                 hotspots: tuple = None):
+        self.classes = tuple(classes)
+        self.functions = tuple(_intern(name) for name in functions)
+        self.variables = tuple(_intern(name) for name in variables)
+        self.imports = None if imports is None else tuple(_intern(name) for name in imports)
+        self.hotspots = None if hotspots is None else tuple(
+            (_intern(hotspot['rule']), hotspot['line'], hotspot['depth']) for hotspot in hotspots)
+
+    @classmethod
+    def from_dict(cls, details: dict) -> 'Module':
+        imports = details.get('imports')
+        return cls(tuple(ClassInfo.from_dict(class_info) for class_info in details.get('classes', ())),
+                   details.get('functions', ()), details.get('variables', ()), imports, details.get('hotspots'))
+
+    def to_dict(self) -> dict:
+        details = {
+            'classes': [class_info.to_dict() for class_info in self.classes],
+            'functions': list(self.functions),
+            'variables': list(self.variables)
+        }
+        if self.imports is not None:
+            details['imports'] = list(self.imports)
+        if self.hotspots is not None:
+            details['hotspots'] = [{'rule': rule, 'line': line, 'depth': depth} for rule, line, depth in self.hotspots]
+        return details
+
+
+def is_module_details(value) -> bool:
+    return isinstance(value, dict) and isinstance(value.get('classes'), (list, str))
+
+
+def is_module(name: str, value) -> bool:
+    return name.endswith('.py') and (isinstance(value, Module) or is_module_details(value))
+
+
+class Directory:
+    __slots__ = ('children',)
+
+    def __init__(self, children: Dict[str, Union['Directory', Module]] = None):
+        self.children = children if children is not None else {}
+
+    @classmethod
+    def from_dict(cls, tree: dict) -> 'Directory':
+        """Преобразует дерево на словарях; уже преобразованные узлы (Module, Directory) берутся как есть."""
+        root = cls()
+        stack = [(root, tree)]
+        while stack:
+            directory, current = stack.pop()
+            for name, value in current.items():
+                if isinstance(value, (Directory, Module)):
+                    node = value
+                elif is_module(name, value):
+                    node = Module.from_dict(value)
+                else:
+                    node = cls()
+                    stack.append((node, value))
+                directory.children[_intern(name)] = node
+        return root
+
+    def to_dict(self) -> dict:
+        result = {}
+        stack = [(self, result)]
+        while stack:
+            directory, target = stack.pop()
+            for name, node in directory.children.items():
+                if isinstance(node, Module):
+                    target[name] = node.to_dict()
+                else:
+                    target[name] = {}
+                    stack.append((node, target[name]))
+        return result
+
+
+def node_to_json(node) -> dict:
+    if isinstance(node, Directory):
+        return node.children
+    if isinstance(node, Module):
+        return node.to_dict()
+    raise TypeError(f"Object of type {type(node).__name__} is not JSON serializable")
+
+
+def iter_modules(tree, prefix: str = ''):
+    stack = [(prefix, tree)]
+    while stack:
+        rel_dir, current = stack.pop()
+        if isinstance(current, Directory):
+            current = current.children
+        for name, value in current.items():
+            rel_path = f"{rel_dir}/{name}" if rel_dir else name
+            if is_module(name, value):
+                yield rel_path, value.to_dict() if isinstance(value, Module) else value
+            elif isinstance(value, (dict, Directory)):
+                stack.append((rel_path, value))
+
+
+def module_hook(value: dict):
+    # Имена элементов здесь неизвестны; в JSON 'classes' модуля - всегда список, а строкой 'classes' может
+    # быть только дайджест директории с таким именем
+    if isinstance(value.get('classes'), list):
+        return Module.from_dict(value)
+    return value
@@ -0,0 +1,262 @@
+# Файл Analyzers/PerfLint.py содержит статический поиск типичных проблем производительности в анализируемом коде
+# (режим analyze --perf-lint). Поиск выполняется по тому же дереву AST, которое ProjectAnalyzer строит при
+# разборе файла, поэтому повторного чтения и разбора не требуется.
+#
+# Правила (в скобках - идентификатор в отчёте):
+#
+#     nested-loop: вложенный цикл по той же коллекции, что и внешний (`for a in items: for b in items`).
+#     io-in-loop: файловый или SQL ввод-вывод в цикле (open, execute, executemany, connect, read_text и т.п.).
+#     insert-front: list.insert(0, ...) в цикле - каждый вызов сдвигает весь список.
+#     str-concat: конкатенация строк `+=` в цикле.
+#     re-compile: re.compile в цикле.
+#     in-list: проверка `in` по списку (литерал или имя, которому присваиваются только списки) в цикле.
+#
+# Циклами считаются for, while и генераторы списков, множеств и словарей. Тела функций, объявленных внутри
+# цикла, к циклу не относятся. Каждая находка - словарь {'rule', 'line', 'depth'}, где depth - глубина
+# вложенности циклов.
+#
+# Функции:
+#
+#     find_hotspots(node): Возвращает находки для дерева AST модуля, упорядоченные по строкам.
+#
+#     git_churn(root_directory): Число коммитов (по git log), затронувших каждый файл проекта:
+#     {относительный путь: число}. Пустой словарь, если git недоступен или проект не в репозитории.
+#
+#     build_report(tree, churn): Отчёт по дереву проекта (значение architecture[имя проекта] с ключами
+#     'hotspots'): модули с находками, их количество по правилам и вес. Вес модуля - сумма весов находок
+#     (RULE_WEIGHTS, умноженные на глубину цикла), умноженная на 1 + log2(1 + число коммитов), так что часто
+#     изменяемые модули поднимаются выше. Модули упорядочены по убыванию веса.
+
+import ast
+import math
+import subprocess
+from typing import Dict, List
+
+from Analyzers.Nodes import iter_modules
+
+RULE_WEIGHTS = {
+    'nested-loop': 3,
+    'io-in-loop': 3,
+    'insert-front': 2,
+    'in-list': 2,
+    'str-concat': 1,
+    're-compile': 1,
+}
+
+# Вызовы, выполняющие файловый или SQL ввод-вывод
+_IO_FUNCTIONS = frozenset(('open',))
+_IO_METHODS = frozenset(('execute', 'executemany', 'executescript', 'connect', 'read_text', 'write_text',
+                         'read_bytes', 'write_bytes'))
+_SCOPES = (ast.FunctionDef, ast.AsyncFunctionDef, ast.Lambda, ast.ClassDef)
+
+
+def _is_list_value(node: ast.AST) -> bool:
+    return (isinstance(node, (ast.List, ast.ListComp))
+            or isinstance(node, ast.Call) and isinstance(node.func, ast.Name) and node.func.id == 'list')
+
+
+def _list_names(scope: ast.AST) -> tuple:
+    """Имена, которым в области видимости (без вложенных функций и классов) присваиваются только списки,
+    и все имена, которым в ней что-либо присваивается."""
+    kinds = {}
+    stack = list(ast.iter_child_nodes(scope))
+    while stack:
+        node = stack.pop()
+        if isinstance(node, _SCOPES):
+            continue
+        if isinstance(node, ast.Assign):
+            for target in node.targets:
+                if isinstance(target, ast.Name):
+                    kinds.setdefault(target.id, set()).add(_is_list_value(node.value))
+        elif isinstance(node, (ast.AnnAssign, ast.AugAssign, ast.NamedExpr)) and isinstance(node.target, ast.Name):
+            is_list = (node.value is not None and _is_list_value(node.value)
+                       or isinstance(node, ast.AugAssign) and isinstance(node.op, ast.Add))
+            kinds.setdefault(node.target.id, set()).add(is_list)
+        elif isinstance(node, (ast.For, ast.AsyncFor, ast.With, ast.AsyncWith, ast.comprehension)):
+            # Переменные цикла и `as` - не списки
+            for target in ([node.target] if not isinstance(node, (ast.With, ast.AsyncWith))
+                           else [item.optional_vars for item in node.items if item.optional_vars]):
+                for name in ast.walk(target):
+                    if isinstance(name, ast.Name):
+                        kinds.setdefault(name.id, set()).add(False)
+        stack.extend(ast.iter_child_nodes(node))
+    return frozenset(name for name, values in kinds.items() if values == {True}), frozenset(kinds)
+
+
+def _is_string(node: ast.AST) -> bool:
+    if isinstance(node, ast.JoinedStr) or isinstance(node, ast.Constant) and isinstance(node.value, str):
+        return True
+    if isinstance(node, ast.BinOp) and isinstance(node.op, (ast.Add, ast.Mod)):
+        return _is_string(node.left) or _is_string(node.right)
+    return isinstance(node, ast.Call) and isinstance(node.func, ast.Name) and node.func.id == 'str'
+
+
+class _HotspotVisitor(ast.NodeVisitor):
+    _dispatch = {}
+
+    def __init__(self):
+        self.hotspots = []
+        # Стек итерируемых выражений объемлющих циклов (ast.dump, None для while) текущей функции
+        self.loops = []
+        # Объемлющие области видимости и вычисляемые по требованию результаты _list_names для них
+        self.scopes = []
+        self.scope_names = {}
+
+    def visit(self, node: ast.AST) -> None:
+        # Упрощённый обход ast.NodeVisitor: без поиска метода по имени на каждом узле и без узлов Load/Store
+        method = self._dispatch.get(node.__class__)
+        if method is None:
+            method = self._dispatch[node.__class__] = getattr(type(self), 'visit_' + node.__class__.__name__,
+                                                              type(self).generic_visit)
+        method(self, node)
+
+    def generic_visit(self, node: ast.AST) -> None:
+        for field in node._fields:
+            value = getattr(node, field, None)
+            if isinstance(value, list):
+                for item in value:
+                    if isinstance(item, ast.AST):
+                        self.visit(item)
+            elif isinstance(value, ast.AST) and not isinstance(value, ast.expr_context):
+                self.visit(value)
+
+    def _add(self, rule: str, node: ast.AST) -> None:
+        self.hotspots.append({'rule': rule, 'line': node.lineno, 'depth': len(self.loops)})
+
+    def _visit_scope(self, node: ast.AST) -> None:
+        loops = self.loops
+        self.loops = []
+        self.scopes.append(node)
+        self.generic_visit(node)
+        self.scopes.pop()
+        self.loops = loops
+
+    def _is_list_name(self, name: str) -> bool:
+        # Имя-список внешней области видно и внутри, если не переопределено
+        for scope in reversed(self.scopes):
+            if scope not in self.scope_names:
+                self.scope_names[scope] = _list_names(scope)
+            lists, assigned = self.scope_names[scope]
+            if name in assigned:
+                return name in lists
+        return False
+
+    visit_Module = visit_FunctionDef = visit_AsyncFunctionDef = visit_Lambda = visit_ClassDef = _visit_scope
+
+    def _visit_loop(self, node: ast.AST, key: str, body: list) -> None:
+        if key is not None and key in self.loops:
+            self._add('nested-loop', node)
+        self.loops.append(key)
+        for item in body:
+            self.visit(item)
+        self.loops.pop()
+
+    def visit_For(self, node: ast.For) -> None:
+        # Итерируемое выражение вычисляется один раз - до входа в цикл
+        self.visit(node.iter)
+        self.visit(node.target)
+        self._visit_loop(node, ast.dump(node.iter), node.body)
+        for item in node.orelse:
+            self.visit(item)
+
+    visit_AsyncFor = visit_For
+
+    def visit_While(self, node: ast.While) -> None:
+        # Условие проверяется на каждой итерации
+        self._visit_loop(node, None, [node.test] + node.body)
+        for item in node.orelse:
+            self.visit(item)
+
+    def _visit_comprehension(self, node: ast.AST) -> None:
+        # Первое итерируемое вычисляется вне генератора, остальные части - на каждой итерации
+        self.visit(node.generators[0].iter)
+        depth = len(self.loops)
+        for index, generator in enumerate(node.generators):
+            if index:
+                self.visit(generator.iter)
+            key = ast.dump(generator.iter)
+            if key in self.loops:
+                self._add('nested-loop', generator.iter)
+            self.loops.append(key)
+            for condition in generator.ifs:
+                self.visit(condition)
+        for element in (node.key, node.value) if isinstance(node, ast.DictComp) else (node.elt,):
+            self.visit(element)
+        del self.loops[depth:]
+
+    visit_ListComp = visit_SetComp = visit_DictComp = visit_GeneratorExp = _visit_comprehension
+
+    def visit_Call(self, node: ast.Call) -> None:
+        if self.loops:
+            func = node.func
+            if isinstance(func, ast.Name) and func.id in _IO_FUNCTIONS:
+                self._add('io-in-loop', node)
+            elif isinstance(func, ast.Attribute):
+                if func.attr in _IO_METHODS:
+                    self._add('io-in-loop', node)
+                elif (func.attr == 'insert' and node.args and isinstance(node.args[0], ast.Constant)
+                      and node.args[0].value == 0):
+                    self._add('insert-front', node)
+                elif func.attr == 'compile' and isinstance(func.value, ast.Name) and func.value.id == 're':
+                    self._add('re-compile', node)
+        self.generic_visit(node)
+
+    def visit_AugAssign(self, node: ast.AugAssign) -> None:
+        if self.loops and isinstance(node.op, ast.Add) and _is_string(node.value):
+            self._add('str-concat', node)
+        self.generic_visit(node)
+
+    def visit_Compare(self, node: ast.Compare) -> None:
+        if self.loops:
+            for op, comparator in zip(node.ops, node.comparators):
+                if isinstance(op, (ast.In, ast.NotIn)) and (
+                        _is_list_value(comparator)
+                        or isinstance(comparator, ast.Name) and self._is_list_name(comparator.id)):
+                    self._add('in-list', node)
+                    break
+        self.generic_visit(node)
+
+
+def find_hotspots(node: ast.AST) -> List[dict]:
+    visitor = _HotspotVisitor()
+    visitor.visit(node)
+    return sorted(visitor.hotspots, key=lambda hotspot: hotspot['line'])
+
+
+def git_churn(root_directory: str) -> Dict[str, int]:
+    try:
+        # --relative: пути относительно root_directory и только внутри неё. Без core.quotepath=off и -z git
+        # заключает пути с не-ASCII символами (например, кириллицей) в кавычки с восьмеричными escape-кодами
+        output = subprocess.run(['git', '-c', 'core.quotepath=off', 'log', '-z', '--format=', '--name-only',
+                                 '--relative', '--', '.'],
+                                cwd=root_directory, capture_output=True, text=True, encoding='utf-8',
+                                errors='surrogateescape', check=True).stdout
+    except (OSError, subprocess.CalledProcessError):
+        return {}
+    churn = {}
+    for name in output.split('\0'):
+        name = name.strip('\n')
+        if name:
+            churn[name] = churn.get(name, 0) + 1
+    return churn
+
+
+def build_report(tree: dict, churn: Dict[str, int] = None) -> dict:
+    churn = churn or {}
+    modules = []
+    totals = {}
+    for rel_path, details in iter_modules(tree):
+        hotspots = details.get('hotspots') or []
+        if not hotspots:
+            continue
+        counts = {}
+        score = 0
+        for hotspot in hotspots:
+            counts[hotspot['rule']] = counts.get(hotspot['rule'], 0) + 1
+            totals[hotspot['rule']] = totals.get(hotspot['rule'], 0) + 1
+            score += RULE_WEIGHTS.get(hotspot['rule'], 1) * max(hotspot['depth'], 1)
+        commits = churn.get(rel_path, 0)
+        modules.append({'path': rel_path, 'weight': round(score * (1 + math.log2(1 + commits)), 2),
+                        'score': score, 'churn': commits, 'counts': counts, 'hotspots': hotspots})
+    modules.sort(key=lambda module: (-module['weight'], module['path']))
+    return {'modules': modules, 'totals': totals}
@@ -0,0 +1,79 @@
+# Файл Analyzers/Shards.py содержит разбиение анализа проекта на части (analyze --shard i/N) и слияние
+# частичных результатов (analyze-merge) - для запуска анализа очень больших репозиториев на нескольких машинах
+# или в нескольких процессах.
+#
+# Файл относится к части shard_of(путь, N) - по стабильному хэшу (crc32) пути относительно корня проекта, поэтому
+# разбиение одинаково на всех машинах. Каждая часть обходит всё дерево, но разбирает только свои файлы и пишет
+# частичный результат в формате NDJSON (см. Analyzers/Streaming.py): заголовок {"type": "shard"}, записи всех
+# директорий и записи своих модулей. Элементы директорий при этом обходятся в порядке имён, поэтому порядок
+# записей - лексикографический порядок путей, разбитых по '/', и не зависит от порядка os.scandir.
+#
+# Слияние - один линейный потоковый проход: частичные результаты уже упорядочены, и heapq.merge объединяет их,
+# держа в памяти по одной записи из каждого файла; повторяющиеся записи директорий отбрасываются.
+#
+# Функции:
+#
+#     parse_shard(spec): Разбирает строку `i/N` в кортеж (i, N); ValueError при неверной строке.
+#
+#     shard_of(rel_path, count): Номер части для файла.
+#
+#     merge_partials(streams): Проверяет заголовки (все части одного разбиения, каждая ровно один раз) и
+#     возвращает итератор объединённых записей в порядке обхода; ValueError при несогласованных частях.
+
+import heapq
+import json
+import zlib
+from typing import Iterator, List, TextIO, Tuple
+
+
+def parse_shard(spec: str) -> Tuple[int, int]:
+    index, separator, count = spec.partition('/')
+    if not separator or not index.isdigit() or not count.isdigit() or not int(index) < int(count):
+        raise ValueError(f"Неверное значение части: {spec} (ожидается i/N, 0 <= i < N)")
+    return int(index), int(count)
+
+
+def shard_of(rel_path: str, count: int) -> int:
+    return zlib.crc32(rel_path.encode('utf-8')) % count
+
+
+def _read_records(stream: TextIO) -> Iterator[dict]:
+    for line in stream:
+        if line.strip():
+            yield json.loads(line)
+
+
+def _order_key(record: dict) -> List[str]:
+    return record['path'].split('/')
+
+
+def merge_partials(streams: List[TextIO]) -> Iterator[dict]:
+    partials = []
+    count = None
+    seen = set()
+    for stream in streams:
+        records = _read_records(stream)
+        header = next(records, None)
+        if not header or header.get('type') != 'shard':
+            raise ValueError(f"Нет заголовка частичного результата: {getattr(stream, 'name', stream)}")
+        if count is not None and header['shards'] != count:
+            raise ValueError(f"Части разных разбиений: {count} и {header['shards']}")
+        if header['shard'] in seen:
+            raise ValueError(f"Часть {header['shard']}/{header['shards']} указана дважды")
+        count = header['shards']
+        seen.add(header['shard'])
+        partials.append(records)
+    if count is not None and len(seen) != count:
+        missing = sorted(set(range(count)) - seen)
+        raise ValueError(f"Не хватает частей: {', '.join(f'{index}/{count}' for index in missing)}")
+    return _merge(partials)
+
+
+def _merge(partials: List[Iterator[dict]]) -> Iterator[dict]:
+    previous = None
+    for record in heapq.merge(*partials, key=_order_key):
+        # Директории есть в каждой части; модуль - только в одной
+        if record['path'] == previous:
+            continue
+        previous = record['path']
+        yield record
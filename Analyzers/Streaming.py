@@ -0,0 +1,96 @@
+# Файл Analyzers/Streaming.py содержит потоковый вывод архитектуры проекта в формате NDJSON
+# (одна JSON-запись на строку) и загрузчик, восстанавливающий из такого потока вложенное дерево.
+#
+# ProjectAnalyzer пишет запись о модуле сразу после его разбора, поэтому потребители могут обрабатывать
+# результат по мере поступления, не дожидаясь окончания анализа всего проекта.
+#
+# Формат записей:
+#     {"type": "dir", "path": "project/pkg"}
+#     {"type": "module", "path": "project/pkg/mod.py", "classes": [{"name": ..., "methods": [...],
+#      "fields": [...]}], "functions": [...], "variables": [...]}
+# Записи директорий идут перед их содержимым, поэтому сохраняются и пустые директории, и порядок элементов.
+# В режиме наблюдения (см. Analyzers/Watcher.py) поток продолжается обновлениями: повторная запись модуля
+# заменяет прежнюю, а запись {"type": "remove", "path": ...} удаляет модуль или директорию.
+# Частичный результат analyze --shard начинается с заголовка {"type": "shard", "shard": i, "shards": N}
+# (см. Analyzers/Shards.py); при восстановлении дерева заголовок пропускается.
+#
+# Классы и функции:
+#
+#     NDJSONWriter:
+#         write_directory(path), write_module(path, details): Записывают по одной строке и сразу сбрасывают буфер.
+#         write_tree(path, tree): Записывает готовое поддерево (например, взятое из снимка прошлого запуска).
+#         write_remove(path): Записывает удаление модуля или директории.
+#         write_shard(index, count): Записывает заголовок частичного результата.
+#
+#     load_records(records): Восстанавливает вложенный словарь архитектуры {проект: дерево} из записей-словарей.
+#     load_ndjson(stream): То же для потока строк NDJSON.
+
+import json
+from typing import Dict, Iterable, TextIO
+
+from Analyzers.Nodes import Module, is_module
+
+
+class NDJSONWriter:
+    def __init__(self, stream: TextIO):
+        self.stream = stream
+        self.records = 0
+
+    def _write(self, record: dict) -> None:
+        self.stream.write(json.dumps(record, ensure_ascii=False))
+        self.stream.write('\n')
+        self.stream.flush()
+        self.records += 1
+
+    def write_directory(self, path: str) -> None:
+        self._write({'type': 'dir', 'path': path})
+
+    def write_module(self, path: str, details: dict) -> None:
+        record = {'type': 'module', 'path': path}
+        record.update(details)
+        self._write(record)
+
+    def write_remove(self, path: str) -> None:
+        self._write({'type': 'remove', 'path': path})
+
+    def write_shard(self, index: int, count: int) -> None:
+        self._write({'type': 'shard', 'shard': index, 'shards': count})
+
+    def write_tree(self, path: str, tree: dict) -> None:
+        self.write_directory(path)
+        # Обход в глубину без рекурсии, в порядке ключей словаря
+        stack = [(path, iter(tree.items()))]
+        while stack:
+            current_path, items = stack[-1]
+            for name, value in items:
+                child_path = f"{current_path}/{name}"
+                if not is_module(name, value):
+                    self.write_directory(child_path)
+                    stack.append((child_path, iter(value.items())))
+                    break
+                # Поддерево снимка в компактном режиме содержит объекты Module
+                self.write_module(child_path, value.to_dict() if isinstance(value, Module) else value)
+            else:
+                stack.pop()
+
+
+def load_records(records: Iterable[dict]) -> Dict[str, dict]:
+    architecture = {}
+    for record in records:
+        if record.get('type') == 'shard':
+            continue
+        *parents, name = record['path'].split('/')
+        node = architecture
+        for parent in parents:
+            node = node.setdefault(parent, {})
+        if record.get('type') == 'dir':
+            node.setdefault(name, {})
+        elif record.get('type') == 'remove':
+            node.pop(name, None)
+        else:
+            node[name] = {key: value for key, value in record.items() if key not in ('type', 'path')}
+    return architecture
+
+
+def load_ndjson(stream: TextIO) -> Dict[str, dict]:
+    return load_records(json.loads(line) for line in stream if line.strip())
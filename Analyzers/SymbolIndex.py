@@ -0,0 +1,124 @@
+# Файл Analyzers/SymbolIndex.py содержит индекс символов проанализированных проектов в базе SQLite.
+# Индекс позволяет находить, где объявлены классы, методы, поля, функции и переменные, не просматривая
+# дерево архитектуры или JSON-дамп целиком.
+#
+# Структура базы:
+#     MODULES (ID, PATH, DIGEST) - модули; DIGEST - хэш сведений о модуле, по нему определяется,
+#     нужно ли обновлять символы модуля при повторном запуске.
+#     SYMBOLS (ID, MODULE_ID, CLASS_ID, KIND, NAME) - символы; KIND: class, method, field, function, variable;
+#     CLASS_ID ссылается на символ класса для методов и полей.
+#     SYMBOLS_FTS - полнотекстовый индекс FTS5 по именам (части имён через `_` - отдельные слова).
+#
+# Классы:
+#
+#     SymbolIndex:
+#         Методы:
+#             update(project_name, tree): Добавляет и обновляет модули проекта; изменяются только строки
+#             модулей, сведения о которых поменялись. Возвращает (обновлено, удалено).
+#             find(name, kind, limit): Точный поиск по имени.
+#             find_prefix(prefix, kind, limit): Поиск по началу имени (диапазон по B-дереву индекса).
+#             search(query, kind, limit): Полнотекстовый поиск FTS5 (например, `archi*`).
+#             close(): Закрывает базу.
+#         Методы поиска возвращают кортежи (kind, name, class_name, path).
+
+import hashlib
+import json
+import sqlite3
+from typing import List, Tuple
+
+from Analyzers.Cache import like_escape
+from Analyzers.Nodes import iter_modules
+
+_SELECT = '''
+    SELECT s.KIND, s.NAME, c.NAME, m.PATH
+    FROM SYMBOLS s
+    JOIN MODULES m ON m.ID = s.MODULE_ID
+    LEFT JOIN SYMBOLS c ON c.ID = s.CLASS_ID
+'''
+
+
+class SymbolIndex:
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self.connection = sqlite3.connect(db_path)
+        self.connection.execute('PRAGMA foreign_keys = ON')
+        self.connection.executescript('''
+            CREATE TABLE IF NOT EXISTS MODULES (
+                ID INTEGER PRIMARY KEY,
+                PATH TEXT UNIQUE NOT NULL,
+                DIGEST TEXT NOT NULL);
+            CREATE TABLE IF NOT EXISTS SYMBOLS (
+                ID INTEGER PRIMARY KEY,
+                MODULE_ID INTEGER NOT NULL REFERENCES MODULES(ID) ON DELETE CASCADE,
+                CLASS_ID INTEGER REFERENCES SYMBOLS(ID) ON DELETE CASCADE,
+                KIND TEXT NOT NULL,
+                NAME TEXT NOT NULL);
+            CREATE INDEX IF NOT EXISTS SYMBOLS_NAME ON SYMBOLS(NAME);
+            CREATE INDEX IF NOT EXISTS SYMBOLS_MODULE ON SYMBOLS(MODULE_ID);
+            CREATE INDEX IF NOT EXISTS SYMBOLS_CLASS ON SYMBOLS(CLASS_ID);
+            CREATE VIRTUAL TABLE IF NOT EXISTS SYMBOLS_FTS USING fts5(
+                NAME, content='SYMBOLS', content_rowid='ID', tokenize="unicode61 separators '_'");
+            CREATE TRIGGER IF NOT EXISTS SYMBOLS_AI AFTER INSERT ON SYMBOLS BEGIN
+                INSERT INTO SYMBOLS_FTS(rowid, NAME) VALUES (new.ID, new.NAME);
+            END;
+            CREATE TRIGGER IF NOT EXISTS SYMBOLS_AD AFTER DELETE ON SYMBOLS BEGIN
+                INSERT INTO SYMBOLS_FTS(SYMBOLS_FTS, rowid, NAME) VALUES ('delete', old.ID, old.NAME);
+            END;
+        ''')
+
+    def update(self, project_name: str, tree: dict) -> Tuple[int, int]:
+        known = dict(self.connection.execute(
+            'SELECT PATH, DIGEST FROM MODULES WHERE PATH LIKE ? ESCAPE ?',
+            (like_escape(project_name) + '/%', '\\')))
+        updated = 0
+        seen = set()
+        with self.connection:
+            for path, details in iter_modules(tree, project_name):
+                seen.add(path)
+                digest = hashlib.sha1(json.dumps(details, sort_keys=True).encode('utf-8')).hexdigest()
+                if known.get(path) == digest:
+                    continue
+                self._replace_module(path, digest, details)
+                updated += 1
+            removed = [(path,) for path in known if path not in seen]
+            self.connection.executemany('DELETE FROM MODULES WHERE PATH = ?', removed)
+        return updated, len(removed)
+
+    def _replace_module(self, path: str, digest: str, details: dict) -> None:
+        cursor = self.connection.cursor()
+        # Символы старой версии модуля удаляются каскадно вместе с записью модуля
+        cursor.execute('DELETE FROM MODULES WHERE PATH = ?', (path,))
+        cursor.execute('INSERT INTO MODULES (PATH, DIGEST) VALUES (?, ?)', (path, digest))
+        module_id = cursor.lastrowid
+        for class_info in details.get('classes', []):
+            cursor.execute("INSERT INTO SYMBOLS (MODULE_ID, KIND, NAME) VALUES (?, 'class', ?)",
+                           (module_id, class_info['name']))
+            class_id = cursor.lastrowid
+            cursor.executemany("INSERT INTO SYMBOLS (MODULE_ID, CLASS_ID, KIND, NAME) VALUES (?, ?, 'method', ?)",
+                               [(module_id, class_id, name) for name in class_info.get('methods', [])])
+            cursor.executemany("INSERT INTO SYMBOLS (MODULE_ID, CLASS_ID, KIND, NAME) VALUES (?, ?, 'field', ?)",
+                               [(module_id, class_id, name) for name in class_info.get('fields', [])])
+        for kind, key in (('function', 'functions'), ('variable', 'variables')):
+            cursor.executemany('INSERT INTO SYMBOLS (MODULE_ID, KIND, NAME) VALUES (?, ?, ?)',
+                               [(module_id, kind, name) for name in details.get(key, [])])
+
+    def _query(self, condition: str, params: tuple, kind: str, limit: int) -> List[tuple]:
+        sql = _SELECT + ' WHERE ' + condition
+        if kind:
+            sql += ' AND s.KIND = ?'
+            params += (kind,)
+        sql += ' ORDER BY s.NAME, m.PATH LIMIT ?'
+        return self.connection.execute(sql, params + (limit,)).fetchall()
+
+    def find(self, name: str, kind: str = None, limit: int = 100) -> List[tuple]:
+        return self._query('s.NAME = ?', (name,), kind, limit)
+
+    def find_prefix(self, prefix: str, kind: str = None, limit: int = 100) -> List[tuple]:
+        # Диапазон [prefix, prefix + U+10FFFF) использует индекс SYMBOLS_NAME, в отличие от LIKE
+        return self._query('s.NAME >= ? AND s.NAME < ?', (prefix, prefix + '\U0010ffff'), kind, limit)
+
+    def search(self, query: str, kind: str = None, limit: int = 100) -> List[tuple]:
+        return self._query('s.ID IN (SELECT rowid FROM SYMBOLS_FTS WHERE SYMBOLS_FTS MATCH ?)', (query,), kind, limit)
+
+    def close(self) -> None:
+        self.connection.close()
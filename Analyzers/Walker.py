@@ -0,0 +1,258 @@
+# Файл Analyzers/Walker.py содержит итеративный обход директорий проекта на основе os.scandir
+# и правила игнорирования в стиле .gitignore для ProjectAnalyzer.
+#
+# Обход не использует рекурсию (нет ограничения на глубину дерева) и берёт тип элемента из DirEntry,
+# не выполняя отдельный stat для каждой проверки. Игнорируемые директории отсекаются до спуска в них.
+#
+# Классы и функции:
+#
+#     IgnoreRules:
+#         Набор правил игнорирования. Элементы ignore_list без спецсимволов сравниваются с именем
+#         (как раньше), шаблоны (`*.pyc`, `**/migrations`, `build/`) - с путём относительно корня.
+#         При use_gitignore=True дополнительно читаются файлы .gitignore во всех директориях
+#         (правила действуют на свою директорию и ниже, поддерживается отрицание `!`).
+#
+#     DirectoryScan:
+#         Результат просмотра директории: путь, упорядоченный список элементов и дайджест.
+#
+#     scan_tree(root, rules, with_digests, previous): Обходит дерево и возвращает DirectoryScan корня. При
+#     with_digests=True вычисляет дайджесты Меркла (см. Analyzers/Merkle.py). С прошлым просмотром previous
+#     директории, у которых не изменились mtime и .gitignore, заново не читаются: их элементы берутся из
+#     previous, и проверяются только stat Python-файлов (правка содержимого файла не меняет mtime директории).
+#     Директориям, изменённым менее чем за 2 секунды до просмотра, не доверяем (как racy-файлам в git).
+#
+#     iter_python_files(scan): Перечисляет пути всех Python-файлов поддерева.
+
+import hashlib
+import os
+import re
+import time
+from typing import List, Tuple, Union
+
+GITIGNORE_NAME = '.gitignore'
+# Директория, изменённая меньше чем за столько наносекунд до просмотра, при следующем просмотре читается заново
+_RACY_NS = 2 * 10 ** 9
+_GLOB_CHARS = set('*?[/')
+
+
+def _translate(pattern: str) -> str:
+    """Переводит glob-шаблон (с поддержкой `**`) в регулярное выражение для пути с разделителем `/`."""
+    regex = []
+    i = 0
+    while i < len(pattern):
+        char = pattern[i]
+        if pattern.startswith('**/', i):
+            regex.append('(?:.*/)?')
+            i += 3
+        elif pattern.startswith('**', i):
+            regex.append('.*')
+            i += 2
+        elif char == '*':
+            regex.append('[^/]*')
+            i += 1
+        elif char == '?':
+            regex.append('[^/]')
+            i += 1
+        elif char == '[':
+            end = pattern.find(']', i + 1)
+            if end == -1:
+                regex.append(re.escape(char))
+                i += 1
+            else:
+                body = pattern[i + 1:end]
+                if body.startswith('!'):
+                    body = '^' + body[1:]
+                regex.append(f"[{body}]")
+                i = end + 1
+        else:
+            regex.append(re.escape(char))
+            i += 1
+    return ''.join(regex)
+
+
+class _Rule:
+    __slots__ = ('regex', 'negate', 'dir_only')
+
+    def __init__(self, pattern: str, base: str):
+        self.negate = pattern.startswith('!')
+        if self.negate:
+            pattern = pattern[1:]
+        self.dir_only = pattern.endswith('/')
+        pattern = pattern.rstrip('/')
+        # Шаблон со слешем привязан к своей директории, без слеша - совпадает на любой глубине
+        anchored = '/' in pattern
+        body = _translate(pattern.lstrip('/'))
+        if not anchored:
+            body = '(?:.*/)?' + body
+        prefix = re.escape(base) + '/' if base else ''
+        self.regex = re.compile(f"^{prefix}{body}$")
+
+
+class IgnoreRules:
+    def __init__(self, ignore_list: List[str] = None, use_gitignore: bool = False):
+        self.names = set()
+        self.patterns = []
+        self.use_gitignore = use_gitignore
+        for item in ignore_list or []:
+            if _GLOB_CHARS.intersection(item) or item.endswith('/'):
+                self.patterns.append(_Rule(item, ''))
+            else:
+                self.names.add(item)
+
+    def load_gitignore(self, file_path: str, base: str) -> Tuple[_Rule, ...]:
+        rules = []
+        try:
+            with open(file_path, 'r', encoding='utf-8', errors='replace') as f:
+                for line in f:
+                    line = line.rstrip('\n').rstrip()
+                    if not line or line.startswith('#'):
+                        continue
+                    if line.startswith('\\'):
+                        line = line[1:]
+                    rules.append(_Rule(line, base))
+        except OSError:
+            pass
+        return tuple(rules)
+
+    def is_ignored(self, name: str, rel_path: str, is_dir: bool, gitignore_rules: Tuple[_Rule, ...] = ()) -> bool:
+        if name in self.names:
+            return True
+        for rule in self.patterns:
+            if (is_dir or not rule.dir_only) and rule.regex.match(rel_path):
+                return True
+        ignored = False
+        # Для .gitignore побеждает последнее совпавшее правило
+        for rule in gitignore_rules:
+            if (is_dir or not rule.dir_only) and rule.regex.match(rel_path):
+                ignored = not rule.negate
+        return ignored
+
+
+class DirectoryScan:
+    __slots__ = ('path', 'entries', 'digest', 'file_stats', 'stamp')
+
+    def __init__(self, path: str):
+        self.path = path
+        # Элементы в порядке os.scandir: (имя, путь, DirectoryScan для директорий или None для .py файлов)
+        self.entries = []
+        self.digest = ''
+        # (mtime_ns, размер) Python-файлов по имени; заполняется только вместе с дайджестами
+        self.file_stats = {}
+        # (mtime_ns директории или None, (mtime_ns, размер) её .gitignore или None); только вместе с дайджестами
+        self.stamp = None
+
+
+def _stat_key(path: str) -> Union[Tuple[int, int], None]:
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def _directory_stamp(path: str, use_gitignore: bool) -> tuple:
+    try:
+        mtime_ns = os.stat(path).st_mtime_ns
+    except OSError:
+        mtime_ns = None
+    # Изменение вскоре после просмотра может не сдвинуть mtime (грубое разрешение времени файловой системы),
+    # поэтому недавно изменённой директории в следующий раз не доверяем
+    if mtime_ns is not None and time.time_ns() - mtime_ns < _RACY_NS:
+        mtime_ns = None
+    return mtime_ns, _stat_key(os.path.join(path, GITIGNORE_NAME)) if use_gitignore else None
+
+
+def _reuse_listing(scan: DirectoryScan, old: DirectoryScan) -> Union[list, None]:
+    """Повторяет элементы прошлого просмотра директории без os.scandir и проверки правил игнорирования
+    (stat выполняется только для Python-файлов). Возвращает [(имя, DirectoryScan, прошлый просмотр)]
+    поддиректорий или None, если файл исчез после прошлого просмотра."""
+    file_stats = {}
+    for name, path, child in old.entries:
+        if child is None:
+            file_stats[name] = _stat_key(path)
+            if file_stats[name] is None:
+                return None
+    children = []
+    for name, path, old_child in old.entries:
+        child = None if old_child is None else DirectoryScan(path)
+        scan.entries.append((name, path, child))
+        if child is not None:
+            children.append((name, child, old_child))
+    scan.file_stats = file_stats
+    return children
+
+
+def scan_tree(root: str, rules: IgnoreRules, with_digests: bool = False,
+              previous: DirectoryScan = None) -> DirectoryScan:
+    root_scan = DirectoryScan(root)
+    # Стек директорий к просмотру: (DirectoryScan, относительный путь, действующие правила .gitignore,
+    # прошлый просмотр той же директории или None)
+    stack = [(root_scan, '', (), previous if with_digests else None)]
+    visited = []
+    while stack:
+        scan, rel_dir, gitignore_rules, old = stack.pop()
+        visited.append(scan)
+        if with_digests:
+            scan.stamp = _directory_stamp(scan.path, rules.use_gitignore)
+            if old is not None and (old.stamp is None or old.stamp[1] != scan.stamp[1]):
+                # Изменился .gitignore: у поддерева другие правила, прошлые просмотры не годятся
+                old = None
+            if old is not None and scan.stamp[0] is not None and old.stamp == scan.stamp:
+                # Элементы добавляются, удаляются и переименовываются только со сменой mtime директории
+                children = _reuse_listing(scan, old)
+                if children is not None:
+                    if scan.stamp[1] is not None:
+                        gitignore_rules = gitignore_rules + rules.load_gitignore(
+                            os.path.join(scan.path, GITIGNORE_NAME), rel_dir)
+                    stack.extend((child, f"{rel_dir}/{name}" if rel_dir else name, gitignore_rules, old_child)
+                                 for name, child, old_child in reversed(children))
+                    continue
+                scan.entries = []
+        old_children = {name: child for name, _, child in old.entries if child is not None} if old else {}
+        with os.scandir(scan.path) as iterator:
+            entries = list(iterator)
+        if rules.use_gitignore and any(entry.name == GITIGNORE_NAME for entry in entries):
+            gitignore_rules = gitignore_rules + rules.load_gitignore(
+                os.path.join(scan.path, GITIGNORE_NAME), rel_dir)
+        children = []
+        for entry in entries:
+            rel_path = f"{rel_dir}/{entry.name}" if rel_dir else entry.name
+            is_dir = entry.is_dir()
+            if rules.is_ignored(entry.name, rel_path, is_dir, gitignore_rules):
+                continue
+            if is_dir:
+                child = DirectoryScan(entry.path)
+                scan.entries.append((entry.name, entry.path, child))
+                children.append((child, rel_path, gitignore_rules, old_children.get(entry.name)))
+            elif entry.name.endswith('.py'):
+                scan.entries.append((entry.name, entry.path, None))
+                if with_digests:
+                    stat = entry.stat()
+                    scan.file_stats[entry.name] = (stat.st_mtime_ns, stat.st_size)
+        # Кладём в стек в обратном порядке, чтобы директории просматривались в порядке scandir
+        stack.extend(reversed(children))
+    if with_digests:
+        # В порядке обхода родитель всегда раньше детей, поэтому дайджесты считаем с конца
+        for scan in reversed(visited):
+            parts = []
+            for name, _, child in scan.entries:
+                if child is not None:
+                    parts.append(f"d:{name}:{child.digest}")
+                else:
+                    mtime_ns, size = scan.file_stats[name]
+                    parts.append(f"f:{name}:{mtime_ns}:{size}")
+            # Порядок выдачи scandir не гарантирован, поэтому для дайджеста части сортируются
+            scan.digest = hashlib.sha1('\n'.join(sorted(parts)).encode('utf-8')).hexdigest()
+    return root_scan
+
+
+def iter_python_files(scan: DirectoryScan):
+    """Перечисляет пути всех Python-файлов поддерева."""
+    stack = [scan]
+    while stack:
+        current = stack.pop()
+        for _, path, child in current.entries:
+            if child is None:
+                yield path
+            else:
+                stack.append(child)
@@ -0,0 +1,121 @@
+# Файл Analyzers/Watcher.py содержит режим наблюдения за проектом: архитектура, построенная ProjectAnalyzer,
+# остаётся в памяти и обновляется на месте при изменении файлов, а изменения сразу передаются потребителю.
+#
+# Наблюдение построено на опросе: каждые interval секунд дерево просматривается (только stat, см.
+# Analyzers/Walker.py; директории с прежним mtime заново не читаются, их элементы берутся из прошлого
+# просмотра), и дайджесты Меркла нового и прошлого просмотра сравниваются сверху вниз. Спуск идёт только
+# в директории с изменившимся дайджестом, а заново разбираются только изменённые файлы
+# (через ProjectAnalyzer.file_analyzer), поэтому обработка изменения занимает миллисекунды.
+#
+# Классы:
+#
+#     ArchitectureWatcher:
+#         Методы:
+#             start(): Строит исходную архитектуру и запоминает состояние дерева.
+#             poll(): Выполняет один опрос, применяет изменения к analyzer.architecture и
+#             возвращает их список [(операция, относительный путь)].
+#             run(max_polls): Цикл опроса до прерывания (Ctrl+C) или заданного числа опросов.
+#         Если задан writer (Analyzers.Streaming.NDJSONWriter), обновлённые поддеревья отправляются в него:
+#         изменённый модуль - записью module, новая директория - записью dir и её содержимым, удаление - remove.
+
+import os
+import time
+from typing import List, Tuple, Union
+
+from Analyzers.Architecture import ProjectAnalyzer
+from Analyzers.Walker import DirectoryScan, scan_tree
+
+
+class ArchitectureWatcher:
+    def __init__(self, analyzer: ProjectAnalyzer, writer=None, interval: float = 0.5):
+        self.analyzer = analyzer
+        self.writer = writer
+        self.interval = interval
+        self.scan = None
+
+    def start(self) -> None:
+        self.analyzer.sink = self.writer
+        self.analyzer.get_architecture()
+        # Дальше файлы разбираются по одному; кэш закрыт после первого прохода, записи отправляет наблюдатель
+        self.analyzer.sink = None
+        self.analyzer.cache = None
+        self.scan = scan_tree(self.analyzer.root_directory, self.analyzer.ignore_rules, with_digests=True)
+
+    def _project_tree(self) -> dict:
+        return self.analyzer.architecture[self.analyzer.project_name]
+
+    def _record_path(self, rel_path: str) -> str:
+        return f"{self.analyzer.project_name}/{rel_path}"
+
+    def _find_changes(self, new_scan: DirectoryScan) -> List[Tuple[str, str, str, Union[DirectoryScan, None]]]:
+        """Сравнивает просмотры по дайджестам; возвращает [(операция, путь, относительный путь, просмотр
+        директории или None для файла)]."""
+        changes = []
+        stack = [(self.scan, new_scan, '')]
+        while stack:
+            old, new, rel_dir = stack.pop()
+            if old.digest == new.digest:
+                continue
+            old_entries = {name: child for name, _, child in old.entries}
+            new_names = set()
+            for name, path, child in new.entries:
+                new_names.add(name)
+                rel_path = f"{rel_dir}/{name}" if rel_dir else name
+                if name not in old_entries:
+                    changes.append(('add', path, rel_path, child))
+                elif (child is None) != (old_entries[name] is None):
+                    # Файл заменён директорией или наоборот
+                    changes.append(('remove', path, rel_path, old_entries[name] is not None))
+                    changes.append(('add', path, rel_path, child))
+                elif child is not None:
+                    stack.append((old_entries[name], child, rel_path))
+                elif old.file_stats.get(name) != new.file_stats.get(name):
+                    changes.append(('update', path, rel_path, None))
+            for name, child in old_entries.items():
+                if name not in new_names:
+                    rel_path = f"{rel_dir}/{name}" if rel_dir else name
+                    changes.append(('remove', os.path.join(old.path, name), rel_path, child))
+        return changes
+
+    def _apply(self, operation: str, path: str, rel_path: str, scan: Union[DirectoryScan, None]) -> None:
+        *parents, name = rel_path.split('/')
+        node = self._project_tree()
+        for parent in parents:
+            node = node.setdefault(parent, {})
+        if operation == 'remove':
+            node.pop(name, None)
+            if self.writer:
+                self.writer.write_remove(self._record_path(rel_path))
+        elif scan is not None:
+            # Поддерево строится из уже готового просмотра: в нём учтены правила игнорирования родителей
+            # (.gitignore, --ignore) и пути от корня проекта, которых нет при обходе с самой директории
+            node[name] = self.analyzer._build_from_scan(scan, rel_path, None, {})
+            if self.writer:
+                self.writer.write_tree(self._record_path(rel_path), node[name])
+        else:
+            node[name] = self.analyzer.file_analyzer(path)
+            if self.writer:
+                self.writer.write_module(self._record_path(rel_path), node[name])
+
+    def poll(self) -> List[Tuple[str, str]]:
+        new_scan = scan_tree(self.analyzer.root_directory, self.analyzer.ignore_rules, with_digests=True,
+                             previous=self.scan)
+        changes = self._find_changes(new_scan)
+        for operation, path, rel_path, scan in changes:
+            self._apply(operation, path, rel_path, scan)
+        self.scan = new_scan
+        return [(operation, rel_path) for operation, _, rel_path, _ in changes]
+
+    def run(self, max_polls: int = None) -> None:
+        polls = 0
+        try:
+            while max_polls is None or polls < max_polls:
+                time.sleep(self.interval)
+                started = time.perf_counter()
+                changes = self.poll()
+                polls += 1
+                if changes:
+                    elapsed = (time.perf_counter() - started) * 1000
+                    print(f"Обновлено элементов: {len(changes)} за {elapsed:.1f} мс")
+        except KeyboardInterrupt:
+            pass
@@ -0,0 +1,85 @@
+# Файл Analyzers/XMLStream.py содержит потоковые запись и чтение XML-файлов архитектуры проекта.
+#
+# ProjectAnalyzer.save_architecture_to_xml раньше строил в памяти полное дерево ElementTree, а
+# ProjectCreator.load_from_xml - разбирал весь документ через ET.parse и рекурсивно превращал его в словарь.
+# Здесь обе операции выполняются без рекурсии и без промежуточного дерева: при записи элементы выводятся по
+# мере обхода словаря, при чтении (ET.iterparse) каждый разобранный элемент сразу переносится в результат и
+# удаляется, поэтому память, кроме самого словаря, не зависит от размера документа.
+#
+# Функции:
+#
+#     write_architecture_xml(architecture, filename): Записывает архитектуру в XML. Результат побайтно
+#     совпадает с прежним ET.ElementTree.write(filename, encoding='utf-8', xml_declaration=True):
+#     корневой элемент Architecture, вложенные словари - вложенные элементы, остальные значения - текст str(value).
+#     Узлы компактного дерева (Directory, Module из Analyzers/Nodes.py) записываются так же, без копии дерева.
+#
+#     load_architecture_xml(filename): Читает XML и возвращает словарь {корневой тег: содержимое} с той же
+#     семантикой, что и ProjectCreator._xml_to_dict: элемент с дочерними элементами - словарь, иначе - текст
+#     без пробелов по краям, а при отсутствии текста - None ({} для элемента с атрибутами).
+
+from typing import Dict
+from xml.etree.ElementTree import iterparse
+from xml.sax.saxutils import escape
+
+from Analyzers.Nodes import Directory, Module, node_to_json
+
+# Сколько фрагментов накапливается перед записью в файл
+_WRITE_BUFFER = 4096
+
+
+def write_architecture_xml(architecture: Dict, filename: str, root_tag: str = 'Architecture') -> None:
+    # Параметры открытия повторяют ElementTree.write: перевод строки '\n', суррогаты - ссылками на символы
+    with open(filename, 'w', encoding='utf-8', errors='xmlcharrefreplace', newline='\n') as f:
+        parts = ["<?xml version='1.0' encoding='utf-8'?>\n"]
+        if not architecture:
+            parts.append(f"<{root_tag} />")
+        else:
+            parts.append(f"<{root_tag}>")
+            stack = [(root_tag, iter(architecture.items()))]
+            while stack:
+                for key, value in stack[-1][1]:
+                    if len(parts) >= _WRITE_BUFFER:
+                        f.write(''.join(parts))
+                        parts.clear()
+                    if isinstance(value, (Directory, Module)):
+                        # Узлы компактного дерева: словарь строится только для записываемого модуля
+                        value = node_to_json(value)
+                    if isinstance(value, dict):
+                        if value:
+                            parts.append(f"<{key}>")
+                            stack.append((key, iter(value.items())))
+                            break
+                        parts.append(f"<{key} />")
+                        continue
+                    text = str(value)
+                    parts.append(f"<{key}>{escape(text)}</{key}>" if text else f"<{key} />")
+                else:
+                    parts.append(f"</{stack.pop()[0]}>")
+        f.write(''.join(parts))
+
+
+def load_architecture_xml(filename: str) -> Dict:
+    # Кадр стека: [элемент, словарь дочерних значений или None, пока дочерних элементов не было]
+    stack = []
+    result = {}
+    for event, element in iterparse(filename, events=('start', 'end')):
+        if event == 'start':
+            if stack and stack[-1][1] is None:
+                stack[-1][1] = {}
+            stack.append([element, None])
+            continue
+        _, children = stack.pop()
+        if children is not None:
+            value = children
+        elif element.text:
+            value = element.text.strip()
+        else:
+            value = {} if element.attrib else None
+        if stack:
+            stack[-1][1][element.tag] = value
+            # Разобранный элемент больше не нужен: убираем его из родителя, чтобы дерево не накапливалось
+            stack[-1][0].remove(element)
+        else:
+            result = {element.tag: value}
+        element.clear()
+    return result
@@ -0,0 +1,167 @@
+# Файл Benchmarks/Analyze.py измеряет производительность конвейера analyze на синтетических проектах.
+#
+# Генерируется проект заданной формы: количество файлов, глубина вложенности директорий, классов в файле и
+# строк в теле каждого метода (размер файла). Этапы get_architecture, print_architecture,
+# save_architecture_to_json и save_architecture_to_xml измеряются по отдельности: время (лучшее из --repeat
+# повторов), файлов в секунду и пиковая память по tracemalloc (отдельным проходом, чтобы трассировка не
+# искажала время). Результаты записываются в JSON-файл.
+#
+# В режиме сравнения (--compare BASELINE) результаты сопоставляются с сохранёнными ранее: этап считается
+# регрессией, если время или пиковая память выросли больше чем на --threshold (по умолчанию 10%); изменения
+# времени меньше --min-delta секунд (шум на коротких этапах) не учитываются.
+#
+# Запуск:
+#     python -m Benchmarks.Analyze --files 2000 --depth 3 --output results.json
+#     python -m Benchmarks.Analyze --files 2000 --depth 3 --compare results.json
+# Код возврата 1, если при сравнении найдены регрессии.
+
+import argparse
+import contextlib
+import json
+import os
+import platform
+import random
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from Analyzers.Architecture import ProjectAnalyzer
+
+STAGES = ('get_architecture', 'print_architecture', 'save_architecture_to_json', 'save_architecture_to_xml')
+
+
+def generate_project(root: str, files: int, depth: int, classes: int, lines: int, seed: int = 0) -> None:
+    """Создаёт в root синтетический проект: files модулей, разложенных по директориям глубиной до depth."""
+    rng = random.Random(seed)
+    for i in range(files):
+        parts = [f"package_{rng.randrange(4)}" for _ in range(rng.randint(0, depth))]
+        directory = os.path.join(root, *parts)
+        os.makedirs(directory, exist_ok=True)
+        source = [f"import os\n\nMODULE_ID = {i}\nNAME = 'module_{i}'\n\n"]
+        for j in range(classes):
+            source.append(f"\nclass Class{j}:\n    counter = 0\n    label = 'class {j}'\n\n")
+            for name in ('__init__', 'run', 'update'):
+                source.append(f"    def {name}(self, value=None):\n")
+                source.extend(f"        value = (value or 0) + {k}\n" for k in range(lines))
+                source.append("        return value\n\n")
+        source.append(f"\ndef main():\n    return Class0().run({i})\n")
+        with open(os.path.join(directory, f"module_{i}.py"), 'w', encoding='utf-8') as f:
+            f.write(''.join(source))
+
+
+def _run_stages(root: str, output_dir: str, analyzer_options: dict, trace: bool) -> dict:
+    analyzer = ProjectAnalyzer(root_directory=root, **analyzer_options)
+    stages = {
+        'get_architecture': analyzer.get_architecture,
+        'print_architecture': analyzer.print_architecture,
+        'save_architecture_to_json': lambda: analyzer.save_architecture_to_json(os.path.join(output_dir, 'a.json')),
+        'save_architecture_to_xml': lambda: analyzer.save_architecture_to_xml(os.path.join(output_dir, 'a.xml')),
+    }
+    results = {}
+    with open(os.devnull, 'w', encoding='utf-8') as devnull, contextlib.redirect_stdout(devnull):
+        for name in STAGES:
+            if trace:
+                tracemalloc.start()
+            started = time.perf_counter()
+            stages[name]()
+            elapsed = time.perf_counter() - started
+            if trace:
+                _, peak = tracemalloc.get_traced_memory()
+                tracemalloc.stop()
+                results[name] = peak
+            else:
+                results[name] = elapsed
+    return results
+
+
+def run_benchmark(config: dict, repeat: int = 3) -> dict:
+    analyzer_options = {'jobs': config['jobs'], 'fast': config['fast'], 'compact': config['compact']}
+    workspace = tempfile.mkdtemp(prefix='podmasterye_bench_')
+    try:
+        project = os.path.join(workspace, 'project')
+        generate_project(project, config['files'], config['depth'], config['classes'], config['lines'],
+                         config['seed'])
+        timings = [_run_stages(project, workspace, analyzer_options, trace=False) for _ in range(repeat)]
+        peaks = _run_stages(project, workspace, analyzer_options, trace=True)
+    finally:
+        shutil.rmtree(workspace, ignore_errors=True)
+    stages = {}
+    for name in STAGES:
+        seconds = min(timing[name] for timing in timings)
+        stages[name] = {'seconds': round(seconds, 6),
+                        'files_per_second': round(config['files'] / seconds, 1) if seconds else None,
+                        'peak_bytes': peaks[name]}
+    return {'config': config, 'python': platform.python_version(), 'platform': platform.platform(),
+            'stages': stages}
+
+
+def compare_results(results: dict, baseline: dict, threshold: float, min_delta: float = 0.0) -> list:
+    """Возвращает список регрессий [(этап, метрика, было, стало)]."""
+    regressions = []
+    for name, current in results['stages'].items():
+        previous = baseline.get('stages', {}).get(name)
+        if not previous:
+            continue
+        for metric in ('seconds', 'peak_bytes'):
+            if metric == 'seconds' and current[metric] - previous[metric] < min_delta:
+                continue
+            if previous[metric] and current[metric] > previous[metric] * (1 + threshold):
+                regressions.append((name, metric, previous[metric], current[metric]))
+    return regressions
+
+
+def print_comparison(results: dict, baseline: dict, regressions: list) -> None:
+    if baseline.get('config') != results['config']:
+        print("Внимание: параметры базового запуска отличаются от текущих", file=sys.stderr)
+    flagged = {(name, metric) for name, metric, _, _ in regressions}
+    for name, current in results['stages'].items():
+        previous = baseline.get('stages', {}).get(name, {})
+        for metric in ('seconds', 'peak_bytes'):
+            old, new = previous.get(metric), current[metric]
+            change = f"{(new / old - 1) * 100:+.1f}%" if old else "—"
+            mark = "  РЕГРЕССИЯ" if (name, metric) in flagged else ""
+            print(f"{name:28} {metric:11} {old!s:>14} -> {new!s:>14} {change:>8}{mark}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Бенчмарк конвейера analyze на синтетическом проекте")
+    parser.add_argument("--files", type=int, default=1000, help="Количество Python-файлов")
+    parser.add_argument("--depth", type=int, default=3, help="Максимальная глубина вложенности директорий")
+    parser.add_argument("--classes", type=int, default=3, help="Классов в файле")
+    parser.add_argument("--lines", type=int, default=5, help="Строк в теле каждого метода (размер файла)")
+    parser.add_argument("--seed", type=int, default=0, help="Начальное значение генератора структуры проекта")
+    parser.add_argument("--jobs", type=int, default=1, help="Количество процессов разбора")
+    parser.add_argument("--fast", action="store_true", help="Использовать быстрый сканер (analyze --fast)")
+    parser.add_argument("--compact", action="store_true", help="Компактное представление (analyze --compact)")
+    parser.add_argument("--repeat", type=int, default=3, help="Количество повторов (берётся лучшее время)")
+    parser.add_argument("--output", help="Записать результаты в JSON-файл")
+    parser.add_argument("--compare", metavar="BASELINE", help="Сравнить с результатами из JSON-файла")
+    parser.add_argument("--threshold", type=float, default=0.1,
+                        help="Допустимый рост времени и памяти при сравнении (доля, по умолчанию 0.1)")
+    parser.add_argument("--min-delta", type=float, default=0.01,
+                        help="Минимальный рост времени этапа в секундах, считающийся регрессией")
+    args = parser.parse_args()
+
+    config = {'files': args.files, 'depth': args.depth, 'classes': args.classes, 'lines': args.lines,
+              'seed': args.seed, 'jobs': args.jobs, 'fast': args.fast, 'compact': args.compact}
+    results = run_benchmark(config, args.repeat)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, ensure_ascii=False, indent=4)
+    if not args.compare:
+        print(json.dumps(results, ensure_ascii=False, indent=4))
+        return
+    with open(args.compare, 'r', encoding='utf-8') as f:
+        baseline = json.load(f)
+    regressions = compare_results(results, baseline, args.threshold, args.min_delta)
+    print_comparison(results, baseline, regressions)
+    if regressions:
+        print(f"Регрессий: {len(regressions)} (порог {args.threshold:.0%})")
+        sys.exit(1)
+    print("Регрессий нет")
+
+
+if __name__ == '__main__':
+    main()
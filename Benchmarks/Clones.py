@@ -0,0 +1,141 @@
+# Файл Benchmarks/Clones.py проверяет поиск клонов (Analyzers/Clones.py) на синтетическом проекте с известными
+# клонами: время построения индекса, повторного запуска без изменений и поиска кластеров, а также полноту
+# (доля семейств клонов, собранных в один кластер целиком) и число кластеров, смешивающих разные семейства.
+#
+# Проект состоит из --functions функций: --families семейств по --copies копий (копии отличаются именами,
+# литералами и, с --mutate, одной заменённой инструкцией), остальные функции - случайные сочетания инструкций.
+# Время поиска кластеров должно расти примерно линейно с --functions.
+#
+# Запуск: python -m Benchmarks.Clones [--functions N] [--families N] [--copies N] [--mutate]
+
+import argparse
+import json
+import os
+import random
+import shutil
+import tempfile
+import time
+
+from Analyzers.Clones import CloneIndex
+
+_OPERATORS = ['+', '-', '*', '//', '%', '<<', '&', '|']
+_CALLS = ['len', 'abs', 'min', 'max', 'sorted', 'sum', 'str', 'int']
+
+
+def _expression(rng: random.Random, names: list, depth: int = 0) -> str:
+    choice = rng.randrange(6 if depth < 3 else 2)
+    if choice == 0:
+        return rng.choice(names)
+    if choice == 1:
+        return str(rng.randrange(100))
+    if choice == 2:
+        return f"({_expression(rng, names, depth + 1)} {rng.choice(_OPERATORS)} {_expression(rng, names, depth + 1)})"
+    if choice == 3:
+        args = ', '.join(_expression(rng, names, depth + 1) for _ in range(rng.randint(1, 3)))
+        return f"{rng.choice(_CALLS)}({args})"
+    if choice == 4:
+        return f"{rng.choice(names)}[{_expression(rng, names, depth + 1)}]"
+    return f"{rng.choice(names)}.{rng.choice(['real', 'imag', 'numerator'])}"
+
+
+def _statements(rng: random.Random, count: int) -> list:
+    """Случайные инструкции-шаблоны; {0}, {1}, ... - места для имён переменных."""
+    names = [f"{{{i}}}" for i in range(4)]
+    statements = []
+    for _ in range(count):
+        kind = rng.randrange(5)
+        target = rng.choice(names)
+        value = _expression(rng, names)
+        if kind == 0:
+            statements.append(f"{target} = {value}")
+        elif kind == 1:
+            statements.append(f"{target} {rng.choice(_OPERATORS)}= {value}")
+        elif kind == 2:
+            statements.append(f"if {value} > {_expression(rng, names)}:\n        {target} = {_expression(rng, names)}")
+        elif kind == 3:
+            statements.append(f"for {target} in range({value}):\n        {rng.choice(names)} += {target}")
+        else:
+            statements.append(f"{target} = [{value} for {{0}} in {rng.choice(names)}]")
+    return statements
+
+
+def _function(name: str, statements: list, rng: random.Random) -> str:
+    names = [f"{rng.choice('xyzuvw')}{rng.randrange(1000)}_{i}" for i in range(4)]
+    lines = [f"def {name}({names[0]}, {names[1]}):", f"    {names[2]} = {names[3]} = 0"]
+    lines.extend('    ' + statement.format(*names) for statement in statements)
+    lines.append(f"    return {names[2]}")
+    return '\n'.join(lines) + '\n'
+
+
+def generate_project(root: str, functions: int, families: int, copies: int, mutate: bool, seed: int = 0) -> dict:
+    """Создаёт проект и возвращает {номер семейства: [имена функций-клонов]}."""
+    rng = random.Random(seed)
+    sources = []
+    planted = {}
+    for family in range(families):
+        statements = _statements(rng, 12)
+        for copy in range(copies):
+            variant = list(statements)
+            if mutate and copy:
+                variant[rng.randrange(len(variant))] = _statements(rng, 1)[0]
+            name = f"clone_{family}_{copy}"
+            planted.setdefault(family, []).append(name)
+            sources.append(_function(name, variant, rng))
+    for i in range(functions - len(sources)):
+        sources.append(_function(f"unique_{i}", _statements(rng, 12), rng))
+    rng.shuffle(sources)
+    for start in range(0, len(sources), 50):
+        directory = os.path.join(root, f"package_{start // 5000}")
+        os.makedirs(directory, exist_ok=True)
+        with open(os.path.join(directory, f"module_{start}.py"), 'w', encoding='utf-8') as f:
+            f.write('\n\n'.join(sources[start:start + 50]))
+    return planted
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Бенчмарк поиска клонов функций")
+    parser.add_argument("--functions", type=int, default=20000, help="Всего функций")
+    parser.add_argument("--families", type=int, default=200, help="Семейств клонов")
+    parser.add_argument("--copies", type=int, default=3, help="Копий в семействе")
+    parser.add_argument("--mutate", action="store_true", help="Заменять в копиях одну инструкцию")
+    parser.add_argument("--threshold", type=float, default=0.8, help="Порог сходства")
+    parser.add_argument("--seed", type=int, default=0, help="Начальное значение генератора")
+    args = parser.parse_args()
+
+    workspace = tempfile.mkdtemp(prefix='podmasterye_clones_')
+    try:
+        project = os.path.join(workspace, 'project')
+        planted = generate_project(project, args.functions, args.families, args.copies, args.mutate, args.seed)
+        index = CloneIndex(os.path.join(workspace, 'clones.sqlite'))
+        try:
+            results = {}
+            started = time.perf_counter()
+            index.update('project', project)
+            results['index_seconds'] = round(time.perf_counter() - started, 3)
+            started = time.perf_counter()
+            index.update('project', project)
+            results['unchanged_rerun_seconds'] = round(time.perf_counter() - started, 3)
+            started = time.perf_counter()
+            clusters = index.clusters(args.threshold)
+            results['cluster_seconds'] = round(time.perf_counter() - started, 3)
+        finally:
+            index.close()
+    finally:
+        shutil.rmtree(workspace, ignore_errors=True)
+
+    cluster_of = {}
+    for number, cluster in enumerate(clusters):
+        for function in cluster['functions']:
+            cluster_of[function['name']] = number
+    found = sum(1 for names in planted.values()
+                if names[0] in cluster_of and len({cluster_of.get(name) for name in names}) == 1)
+    family_of = {name: family for family, names in planted.items() for name in names}
+    mixed = sum(1 for cluster in clusters
+                if len({family_of.get(function['name'], function['name']) for function in cluster['functions']}) > 1)
+    results.update({'functions': args.functions, 'clusters': len(clusters),
+                    'recall': round(found / len(planted), 3) if planted else None, 'mixed_clusters': mixed})
+    print(json.dumps(results, indent=4))
+
+
+if __name__ == '__main__':
+    main()
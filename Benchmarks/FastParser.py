@@ -0,0 +1,101 @@
+# Файл Benchmarks/FastParser.py сравнивает быстрый сканер (Analyzers/FastParser.py, режим analyze --fast)
+# с разбором через ast: на каждом файле корпуса результаты должны совпадать, а сканер - работать быстрее.
+#
+# Корпус - указанные директории (по умолчанию стандартная библиотека Python) и, при --generated N,
+# синтетический модуль в стиле pyuic5 с N виджетами. Для каждого файла сравниваются результаты
+# parse_python_file_details с fast=False и fast=True. Расхождения на файлах, которые ast не смог разобрать
+# (синтаксические ошибки), выводятся отдельно: сканер синтаксис полностью не проверяет.
+# Время сканера включает разбор через ast в случаях, когда сканер от файла отказался.
+#
+# Запуск: python -m Benchmarks.FastParser [директории...] [--generated N]
+# Код возврата 1, если есть расхождения на корректных файлах.
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import sys
+import sysconfig
+import time
+
+from Analyzers.Architecture import ProjectAnalyzer
+from Analyzers.FastParser import read_python_details
+
+
+def generate_pyuic_module(widgets: int) -> bytes:
+    """Модуль, похожий на вывод pyuic5: один класс с длинными методами setupUi и retranslateUi."""
+    lines = ['# -*- coding: utf-8 -*-', '', 'from PyQt5 import QtCore, QtGui, QtWidgets', '', '',
+             'class Ui_MainWindow(object):', '    def setupUi(self, MainWindow):',
+             '        MainWindow.setObjectName("MainWindow")',
+             '        self.centralwidget = QtWidgets.QWidget(MainWindow)']
+    for i in range(widgets):
+        lines += [f'        self.pushButton_{i} = QtWidgets.QPushButton(self.centralwidget)',
+                  f'        self.pushButton_{i}.setGeometry(QtCore.QRect({i % 800}, {i % 600}, 93, 28))',
+                  f'        self.pushButton_{i}.setObjectName("pushButton_{i}")']
+    lines += ['        self.retranslateUi(MainWindow)', '        QtCore.QMetaObject.connectSlotsByName(MainWindow)', '',
+              '    def retranslateUi(self, MainWindow):', '        _translate = QtCore.QCoreApplication.translate']
+    lines += [f'        self.pushButton_{i}.setText(_translate("MainWindow", "Button {i}"))' for i in range(widgets)]
+    return ('\n'.join(lines) + '\n').encode('utf-8')
+
+
+def iter_corpus(directories: list):
+    for directory in directories:
+        for root, dirs, files in os.walk(directory):
+            dirs.sort()
+            for name in sorted(files):
+                if name.endswith('.py'):
+                    path = os.path.join(root, name)
+                    try:
+                        with open(path, 'rb') as f:
+                            yield path, f.read()
+                    except OSError:
+                        continue
+
+
+def _timed(analyzer: ProjectAnalyzer, path: str, source: bytes) -> tuple:
+    with contextlib.redirect_stdout(io.StringIO()) as output:
+        started = time.perf_counter()
+        details = analyzer.parse_python_file_details(path, source)
+        elapsed = time.perf_counter() - started
+    return tuple(details), elapsed, bool(output.getvalue())
+
+
+def compare(corpus) -> dict:
+    reference = ProjectAnalyzer(root_directory=os.curdir)
+    fast = ProjectAnalyzer(root_directory=os.curdir, fast=True)
+    report = {'files': 0, 'fallbacks': 0, 'ast_seconds': 0.0, 'fast_seconds': 0.0,
+              'mismatches': [], 'syntax_error_mismatches': []}
+    for path, source in corpus:
+        expected, ast_seconds, failed = _timed(reference, path, source)
+        actual, fast_seconds, _ = _timed(fast, path, source)
+        report['files'] += 1
+        report['ast_seconds'] += ast_seconds
+        report['fast_seconds'] += fast_seconds
+        if read_python_details(path, source) is None:
+            report['fallbacks'] += 1
+        if actual != expected:
+            report['syntax_error_mismatches' if failed else 'mismatches'].append(path)
+    report['speedup'] = round(report['ast_seconds'] / report['fast_seconds'], 2) if report['fast_seconds'] else None
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Сравнение быстрого сканера с разбором через ast")
+    parser.add_argument("directories", nargs="*", help="Директории корпуса (по умолчанию стандартная библиотека)")
+    parser.add_argument("--generated", type=int, default=0, metavar="N",
+                        help="Добавить синтетический модуль в стиле pyuic5 с N виджетами")
+    args = parser.parse_args()
+
+    results = {}
+    if args.directories or not args.generated:
+        results['corpus'] = compare(iter_corpus(args.directories or [sysconfig.get_paths()['stdlib']]))
+    if args.generated:
+        results['generated'] = compare([('ui_main_window.py', generate_pyuic_module(args.generated))])
+    print(json.dumps(results, indent=4, ensure_ascii=False))
+    if any(report['mismatches'] for report in results.values()):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,96 @@
+# Файл Benchmarks/Memory.py сравнивает потребление памяти конвейером analyze с деревом на словарях и с
+# компактным представлением (Analyzers/Nodes.py, режим analyze --compact).
+#
+# Создаётся синтетический проект (Benchmarks/Analyze.py, generate_project) из --modules модулей по --classes
+# классов, и для каждого режима в отдельном процессе выполняется весь конвейер, как в analyze: get_architecture
+# (с кэшем - два запуска, второй берёт неизменённые поддеревья из снимка), print_architecture, а также
+# save_architecture_to_json и save_architecture_to_xml. Измеряются максимальный RSS процесса (resource, недоступен
+# в Windows - тогда null) и, отдельным запуском, память дерева после get_architecture и пиковая память всего
+# конвейера по tracemalloc.
+#
+# Запуск: python -m Benchmarks.Memory [--modules N] [--classes N] [--no-cache]
+
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+
+from Benchmarks.Analyze import generate_project
+
+_RUN = ('import contextlib, json, os, sys, tracemalloc\n'
+        'from Analyzers.Architecture import ProjectAnalyzer\n'
+        'root, output, compact, cache_dir, trace = sys.argv[1], sys.argv[2], sys.argv[3] == "1", sys.argv[4], '
+        'sys.argv[5] == "1"\n'
+        'result = {}\n'
+        'with open(os.devnull, "w", encoding="utf-8") as devnull, contextlib.redirect_stdout(devnull):\n'
+        '    if cache_dir:\n'
+        '        ProjectAnalyzer(root, cache_dir=cache_dir, compact=compact).get_architecture()\n'
+        '    if trace:\n'
+        '        tracemalloc.start()\n'
+        '    analyzer = ProjectAnalyzer(root, cache_dir=cache_dir or None, compact=compact)\n'
+        '    analyzer.get_architecture()\n'
+        '    if trace:\n'
+        '        result["tree_bytes"] = tracemalloc.get_traced_memory()[0]\n'
+        '    analyzer.print_architecture()\n'
+        '    analyzer.save_architecture_to_json(os.path.join(output, "architecture.json"))\n'
+        '    analyzer.save_architecture_to_xml(os.path.join(output, "architecture.xml"))\n'
+        'if trace:\n'
+        '    result["peak_bytes"] = tracemalloc.get_traced_memory()[1]\n'
+        'else:\n'
+        '    try:\n'
+        '        import resource\n'
+        '        result["max_rss_bytes"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024\n'
+        '    except ImportError:\n'
+        '        result["max_rss_bytes"] = None\n'
+        'print(json.dumps(result))\n')
+
+
+def measure(root: str, output: str, compact: bool, cache_dir: str, trace: bool) -> dict:
+    """Выполняет конвейер analyze в отдельном процессе и возвращает его измерения."""
+    shutil.rmtree(cache_dir, ignore_errors=True) if cache_dir else None
+    arguments = [root, output, '1' if compact else '0', cache_dir or '', '1' if trace else '0']
+    output_text = subprocess.run([sys.executable, '-c', _RUN, *arguments], capture_output=True, text=True,
+                                 check=True).stdout
+    return json.loads(output_text)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Память конвейера analyze: дерево на словарях и компактное дерево")
+    parser.add_argument("--modules", type=int, default=20000, help="Количество модулей")
+    parser.add_argument("--classes", type=int, default=3, help="Количество классов в модуле")
+    parser.add_argument("--no-cache", action="store_true", help="Анализировать без кэша и снимка дерева")
+    args = parser.parse_args()
+
+    workspace = tempfile.mkdtemp(prefix='podmasterye_memory_')
+    try:
+        root = os.path.join(workspace, 'project')
+        generate_project(root, args.modules, 3, args.classes, 2)
+        cache_dir = None if args.no_cache else os.path.join(workspace, 'cache')
+        results = {'modules': args.modules, 'classes': args.classes, 'cache': not args.no_cache}
+        outputs = {}
+        for compact in (False, True):
+            mode = 'compact' if compact else 'dict'
+            outputs[mode] = os.path.join(workspace, mode)
+            os.makedirs(outputs[mode])
+            results[mode] = measure(root, outputs[mode], compact, cache_dir, trace=False)
+            results[mode].update(measure(root, outputs[mode], compact, cache_dir, trace=True))
+        results['tree_saving'] = round(1 - results['compact']['tree_bytes'] / results['dict']['tree_bytes'], 3)
+        if results['dict']['max_rss_bytes']:
+            results['rss_saving'] = round(1 - results['compact']['max_rss_bytes'] / results['dict']['max_rss_bytes'], 3)
+        # Компактный режим не должен менять сохранённые файлы
+        results['identical'] = all(
+            open(os.path.join(outputs['dict'], name), 'rb').read() == open(os.path.join(outputs['compact'], name),
+                                                                          'rb').read()
+            for name in ('architecture.json', 'architecture.xml'))
+    finally:
+        shutil.rmtree(workspace, ignore_errors=True)
+    print(json.dumps(results, indent=4))
+    if not results['identical']:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,178 @@
+# Файл Benchmarks/UX.py проверяет конвертацию .bmpr (Converters/UX/Converter.py, UXConverter.bmpr_to_json)
+# на синтетическом файле Balsamiq с тысячами комментариев и пользователей.
+#
+# Для нескольких масштабов (--scales, множители к --comments, --users, --resources и --thumbnails) создаётся
+# база .bmpr, выполняется bmpr_to_json и проверяется, что в ux_format столько же записей каждой таблицы, сколько
+# строк в базе (без повторов), а время растёт линейно: отношение времени к числу строк на самом большом масштабе
+# не должно превышать отношение на самом малом больше чем в --tolerance раз.
+#
+# На каждом масштабе та же база конвертируется ещё с use_chardet=False и прежним способом декодирования
+# (LegacyDecoding: chardet на каждой строке без кэша и второй проход по всем таблицам для полей 'text' и 'name');
+# результат всех трёх конвертаций должен совпадать. Отдельно через tracemalloc измеряется пиковая память чтения
+# всех строк базы (fetch_data_from_database без конвертации): она не должна расти с размером файла больше чем в
+# --tolerance раз. Выборочная конвертация одного макета (mockup='Экран 0', skip_thumbnails=True, отбор в SQL)
+# должна вернуть ровно этот ресурс и его комментарии; её время выводится рядом со временем полной конвертации.
+# Генерация .ui (json_to_ui) выполняется последовательно и в --jobs процессах; результаты должны совпадать побайтно.
+#
+# Запуск: python -m Benchmarks.UX [--comments N] [--users N] [--scales 1 2 4]
+# Код возврата 1, если число записей или результат декодирования не совпали или рост времени нелинейный.
+
+import argparse
+import contextlib
+import json
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import chardet
+
+from Converters.UX.Converter import UXConverter
+
+
+class LegacyDecoding(UXConverter):
+    """Декодирование до ускорения: chardet на каждой строке и отдельный второй проход по таблицам."""
+
+    def decode_unicode_escape(self, text):
+        if isinstance(text, str):
+            result = chardet.detect(text.encode('utf-8'))
+            if result['encoding'] == 'unicode_escape' and result['confidence'] > 0.6:
+                return text.encode('utf-8').decode('unicode_escape')
+        return text
+
+    def decode_unicode_string(self, s):
+        try:
+            return s.encode('latin1').decode('unicode_escape')
+        except Exception:
+            return s
+
+    def decode_record(self, record):
+        return record
+
+    def bmpr_to_json(self):
+        with self.fetch_data_from_database() as data:
+            self.convert_to_ux_format(data)
+        for table_data in self.ux_format.values():
+            self.process_table(table_data)
+
+
+def build_bmpr(path: str, comments: int, users: int, resources: int, thumbnails: int, controls: int = 20) -> dict:
+    """Создаёт файл .bmpr и возвращает число строк в каждой таблице."""
+    with open(os.devnull, 'w', encoding='utf-8') as devnull, contextlib.redirect_stdout(devnull):
+        UXConverter(path).create_database_if_not_exists(path)
+    button_text = "\\u041a\\u043d\\u043e\\u043f\\u043a\\u0430"  # "Кнопка" в виде unicode_escape, как в Balsamiq
+    mockup_controls = [{"ID": str(i), "typeID": "Button", "x": str(i * 10), "y": "20", "w": "80", "h": "25",
+                        "measuredW": "80", "measuredH": "25", "properties": {"text": f"{button_text} {i}\\n\u00e9"}}
+                       for i in range(controls)]
+    mockup = json.dumps({"mockup": {"mockupW": "800", "mockupH": "600", "attributes": {"name": "Form"},
+                                    "controls": {"control": mockup_controls}}})
+    connection = sqlite3.connect(path)
+    with connection:
+        connection.execute("INSERT INTO BRANCHES VALUES ('Master', ?)", (json.dumps({"name": "Master"}),))
+        connection.executemany("INSERT INTO USERS VALUES (?, ?)",
+                               [(f"user-{i}", json.dumps({"name": f"\\u041f\\u043e\\u043b\\u044c\\u0437 {i}"}))
+                                for i in range(users)])
+        connection.executemany("INSERT INTO RESOURCES VALUES (?, 'Master', ?, ?)",
+                               [(f"resource-{i}", json.dumps({"name": f"Экран {i}", "kind": "mockup"}), mockup)
+                                for i in range(resources)])
+        connection.executemany("INSERT INTO COMMENTS VALUES (?, 'Master', ?, ?, ?, ?)",
+                               [(f"comment-{i}", f"resource-{i % resources}", f"Comment text {i}",
+                                 f"user-{i % users}", json.dumps({"name": f"Comment\\t{i}", "timestamp": i}))
+                                for i in range(comments)])
+        connection.executemany("INSERT INTO THUMBNAILS VALUES (?, ?)",
+                               [(f"thumbnail-{i}", json.dumps({"name": f"thumb {i}", "image": "iVBORw0KGgo="}))
+                                for i in range(thumbnails)])
+        connection.executemany("INSERT INTO INFO VALUES (?, ?)",
+                               [("SchemaVersion", "1.2"), ("ArchiveRevision", "42"), ("ArchiveFormat", "bmpr")])
+    connection.close()
+    return {'branches': 1, 'resources': resources, 'comments': comments, 'users': users,
+            'thumbnails': thumbnails, 'info': 3}
+
+
+def convert(path: str, converter_class=UXConverter, **options) -> tuple:
+    converter = converter_class(path, **options)
+    with open(os.devnull, 'w', encoding='utf-8') as devnull, contextlib.redirect_stdout(devnull):
+        started = time.perf_counter()
+        converter.bmpr_to_json()
+        elapsed = time.perf_counter() - started
+    return converter.ux_format, elapsed
+
+
+def generate_ui(path: str, resources: list, jobs: int) -> tuple:
+    started = time.perf_counter()
+    ui_format = UXConverter(path).json_to_ui(resources, jobs=jobs)
+    return ui_format, time.perf_counter() - started
+
+
+def fetch_peak(path: str) -> int:
+    """Пиковая память (байт) чтения всех строк .bmpr без конвертации."""
+    tracemalloc.start()
+    with UXConverter(path).fetch_data_from_database() as data:
+        for rows in data.values():
+            for _ in rows:
+                pass
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Бенчмарк конвертации .bmpr в UX JSON")
+    parser.add_argument("--comments", type=int, default=2000, help="Комментариев на масштабе 1")
+    parser.add_argument("--users", type=int, default=1000, help="Пользователей на масштабе 1")
+    parser.add_argument("--resources", type=int, default=50, help="Ресурсов (макетов) на масштабе 1")
+    parser.add_argument("--thumbnails", type=int, default=50, help="Миниатюр на масштабе 1")
+    parser.add_argument("--scales", type=int, nargs="+", default=[1, 2, 4], help="Множители размеров")
+    parser.add_argument("--jobs", type=int, default=2, help="Процессов для параллельной генерации .ui")
+    parser.add_argument("--tolerance", type=float, default=1.5,
+                        help="Допустимый рост времени на строку между наименьшим и наибольшим масштабом")
+    args = parser.parse_args()
+
+    results = []
+    failed = False
+    with tempfile.TemporaryDirectory() as directory:
+        for scale in args.scales:
+            path = os.path.join(directory, f"scale_{scale}.bmpr")
+            expected = build_bmpr(path, args.comments * scale, args.users * scale, args.resources * scale,
+                                  args.thumbnails * scale)
+            ux_format, elapsed = convert(path)
+            no_chardet, no_chardet_elapsed = convert(path, use_chardet=False)
+            legacy, legacy_elapsed = convert(path, LegacyDecoding)
+            single, single_elapsed = convert(path, mockup='Экран 0', skip_thumbnails=True)
+            ui_serial, ui_serial_elapsed = generate_ui(path, ux_format['resources'], 1)
+            ui_parallel, ui_parallel_elapsed = generate_ui(path, ux_format['resources'], args.jobs)
+            ui_identical = list(ui_serial.items()) == list(ui_parallel.items())
+            single_counts = {table: len(single[table]) for table in ('resources', 'comments', 'thumbnails')}
+            single_expected = {'resources': 1, 'comments': len(range(0, expected['comments'], expected['resources'])),
+                               'thumbnails': 0}
+            counts = {table: len(ux_format[table]) for table in expected}
+            rows = sum(expected.values())
+            same_output = ux_format == no_chardet == legacy
+            result = {'scale': scale, 'rows': rows, 'seconds': round(elapsed, 3),
+                      'microseconds_per_row': round(elapsed / rows * 1e6, 1),
+                      'no_chardet_seconds': round(no_chardet_elapsed, 3), 'legacy_seconds': round(legacy_elapsed, 3),
+                      'speedup': round(legacy_elapsed / elapsed, 1), 'fetch_peak_bytes': fetch_peak(path),
+                      'one_mockup_seconds': round(single_elapsed, 3), 'ui_seconds': round(ui_serial_elapsed, 3),
+                      'ui_parallel_seconds': round(ui_parallel_elapsed, 3), 'ui_identical': ui_identical, 'counts_match': counts == expected,
+                      'one_mockup_counts_match': single_counts == single_expected,
+                      'same_output': same_output}
+            failed = failed or not same_output or single_counts != single_expected or not ui_identical
+            if counts != expected:
+                result['counts'] = counts
+                result['expected'] = expected
+                failed = True
+            results.append(result)
+    ratio = results[-1]['microseconds_per_row'] / results[0]['microseconds_per_row']
+    linear = ratio <= args.tolerance
+    peak_ratio = results[-1]['fetch_peak_bytes'] / results[0]['fetch_peak_bytes']
+    bounded = peak_ratio <= args.tolerance
+    print(json.dumps({'scales': results, 'per_row_ratio': round(ratio, 2), 'linear': linear,
+                      'fetch_peak_ratio': round(peak_ratio, 2), 'fetch_memory_bounded': bounded}, indent=4))
+    if failed or not linear or not bounded:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,143 @@
+# Файл Benchmarks/UXImport.py сравнивает запись UX JSON в .bmpr (UXConverter.json_to_bmpr) с прежним способом:
+# json.load всего файла и отдельный cursor.execute на каждую строку (legacy_json_to_bmpr).
+#
+# Создаётся JSON в формате UXConverter.save_json с --rows строками (комментарии, пользователи, миниатюры и
+# макеты), затем он записывается в две новые базы обоими способами. Выводятся время, строк в секунду и пиковая
+# память (tracemalloc, отдельным запуском), проверяется, что содержимое всех таблиц совпадает, а настройки
+# journal_mode, synchronous и cache_size после записи те же, что были до неё.
+#
+# Запуск: python -m Benchmarks.UXImport [--rows 100000]
+# Код возврата 1, если содержимое баз или настройки не совпали.
+
+import argparse
+import contextlib
+import json
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from Converters.UX.Converter import BULK_PRAGMAS, UXConverter
+
+_TABLES = ('BRANCHES', 'RESOURCES', 'COMMENTS', 'USERS', 'THUMBNAILS', 'INFO')
+
+
+def build_json(path: str, rows: int) -> None:
+    resources = max(rows // 50, 1)
+    users = rows * 3 // 10
+    thumbnails = rows * 8 // 100
+    comments = rows - resources - users - thumbnails
+    controls = [{"ID": str(i), "typeID": "Button", "x": str(i * 10), "y": "20", "w": "80", "h": "25",
+                 "properties": {"text": f"Кнопка {i}"}} for i in range(20)]
+    ux_format = {
+        "branches": [{"id": "Master", "attributes": {"name": "Master"}}],
+        "resources": [{"id": f"resource-{i}", "branchId": "Master", "attributes": {"name": f"Экран {i}"},
+                       "data": {"mockup": {"mockupW": "800", "mockupH": "600", "controls": {"control": controls}}}}
+                      for i in range(resources)],
+        "comments": [{"id": f"comment-{i}", "branchId": "Master", "resourceId": f"resource-{i % resources}",
+                      "data": f"Комментарий {i}", "userId": f"user-{i % max(users, 1)}",
+                      "attributes": {"name": f"Comment {i}", "timestamp": i}} for i in range(comments)],
+        "users": [{"id": f"user-{i}", "attributes": {"name": f"Пользователь {i}"}} for i in range(users)],
+        "thumbnails": [{"id": f"thumbnail-{i}", "attributes": {"name": f"thumb {i}", "image": "iVBORw0KGgo=" * 8}}
+                       for i in range(thumbnails)],
+        "info": {"SchemaVersion": "1.2", "ArchiveRevision": "42", "ArchiveFormat": "bmpr"}
+    }
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(ux_format, f, ensure_ascii=False, indent=2)
+
+
+def legacy_json_to_bmpr(db_path: str, json_file: str) -> None:
+    """Запись до ускорения: json.load и по одному execute на строку."""
+    with open(json_file, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    conn = sqlite3.connect(db_path)
+    cursor = conn.cursor()
+    for branch in data.get("branches", []):
+        cursor.execute("INSERT INTO BRANCHES (ID, ATTRIBUTES) VALUES (?, ?) "
+                       "ON CONFLICT(ID) DO UPDATE SET ATTRIBUTES=excluded.ATTRIBUTES",
+                       (branch["id"], json.dumps(branch["attributes"], ensure_ascii=False)))
+    for resource in data.get("resources", []):
+        cursor.execute("INSERT INTO RESOURCES (ID, BRANCHID, ATTRIBUTES, DATA) VALUES (?, ?, ?, ?) "
+                       "ON CONFLICT(ID, BRANCHID) DO UPDATE SET ATTRIBUTES=excluded.ATTRIBUTES, DATA=excluded.DATA",
+                       (resource["id"], resource["branchId"], json.dumps(resource["attributes"], ensure_ascii=False),
+                        json.dumps(resource["data"], ensure_ascii=False)))
+    for comment in data.get("comments", []):
+        cursor.execute("INSERT INTO COMMENTS (ID, BRANCHID, RESOURCEID, DATA, USERID, ATTRIBUTES) "
+                       "VALUES (?, ?, ?, ?, ?, ?) "
+                       "ON CONFLICT(ID) DO UPDATE SET DATA=excluded.DATA, ATTRIBUTES=excluded.ATTRIBUTES",
+                       (comment["id"], comment["branchId"], comment["resourceId"], comment.get("data", ""),
+                        comment["userId"], json.dumps(comment["attributes"], ensure_ascii=False)))
+    for user in data.get("users", []):
+        cursor.execute("INSERT INTO USERS (ID, ATTRIBUTES) VALUES (?, ?) "
+                       "ON CONFLICT(ID) DO UPDATE SET ATTRIBUTES=excluded.ATTRIBUTES",
+                       (user["id"], json.dumps(user["attributes"], ensure_ascii=False)))
+    for thumbnail in data.get("thumbnails", []):
+        cursor.execute("INSERT INTO THUMBNAILS (ID, ATTRIBUTES) VALUES (?, ?) "
+                       "ON CONFLICT(ID) DO UPDATE SET ATTRIBUTES=excluded.ATTRIBUTES",
+                       (thumbnail["id"], json.dumps(thumbnail["attributes"], ensure_ascii=False)))
+    for key, value in data.get("info", {}).items():
+        cursor.execute("INSERT INTO INFO (NAME, VALUE) VALUES (?, ?) "
+                       "ON CONFLICT(NAME) DO UPDATE SET VALUE=excluded.VALUE", (key, value))
+    conn.commit()
+    conn.close()
+
+
+def bulk_json_to_bmpr(db_path: str, json_file: str) -> None:
+    UXConverter(db_path).json_to_bmpr(json_file)
+
+
+def run(write, directory: str, name: str, json_file: str, trace: bool = False) -> tuple:
+    """Записывает JSON в новую базу; возвращает (путь, время, пиковую память или None)."""
+    db_path = os.path.join(directory, f"{name}{'_traced' if trace else ''}.bmpr")
+    with open(os.devnull, 'w', encoding='utf-8') as devnull, contextlib.redirect_stdout(devnull):
+        UXConverter(db_path).create_database_if_not_exists(db_path)
+        if trace:
+            tracemalloc.start()
+        started = time.perf_counter()
+        write(db_path, json_file)
+        elapsed = time.perf_counter() - started
+        peak = None
+        if trace:
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+    return db_path, elapsed, peak
+
+
+def dump(db_path: str) -> dict:
+    with contextlib.closing(sqlite3.connect(db_path)) as connection:
+        return {table: connection.execute(f"SELECT * FROM {table} ORDER BY 1, 2").fetchall() for table in _TABLES}
+
+
+def pragmas(db_path: str) -> dict:
+    with contextlib.closing(sqlite3.connect(db_path)) as connection:
+        return {name: connection.execute(f"PRAGMA {name}").fetchone()[0] for name in BULK_PRAGMAS}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Бенчмарк записи UX JSON в .bmpr")
+    parser.add_argument("--rows", type=int, default=100000, help="Строк во всех таблицах")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        json_file = os.path.join(directory, 'ux.json')
+        build_json(json_file, args.rows)
+        results = {'rows': args.rows, 'json_megabytes': round(os.path.getsize(json_file) / 2 ** 20, 1)}
+        databases = {}
+        for name, write in (('legacy', legacy_json_to_bmpr), ('bulk', bulk_json_to_bmpr)):
+            db_path, elapsed, _ = run(write, directory, name, json_file)
+            _, _, peak = run(write, directory, name, json_file, trace=True)
+            databases[name] = db_path
+            results[name] = {'seconds': round(elapsed, 3), 'rows_per_second': round(args.rows / elapsed),
+                             'peak_megabytes': round(peak / 2 ** 20, 1)}
+        results['speedup'] = round(results['legacy']['seconds'] / results['bulk']['seconds'], 1)
+        results['same_content'] = dump(databases['legacy']) == dump(databases['bulk'])
+        results['pragmas_restored'] = pragmas(databases['legacy']) == pragmas(databases['bulk'])
+    print(json.dumps(results, indent=4))
+    if not results['same_content'] or not results['pragmas_restored']:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
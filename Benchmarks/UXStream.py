@@ -0,0 +1,68 @@
+# Файл Benchmarks/UXStream.py сравнивает память генерации .ui (UXConverter.update_ui) в обычном режиме, где
+# все макеты декодируются и все формы строятся в памяти до записи, и в потоковом (stream=True,
+# write_mockup_ui через etree.xmlfile).
+#
+# Создаётся .bmpr с --mockups макетами по --controls элементов (см. Benchmarks/UX.py, build_bmpr), затем каждый
+# режим запускается в отдельном процессе: деревья lxml размещаются libxml2 мимо tracemalloc, поэтому сравнивается
+# максимальный RSS процесса (resource.getrusage, недоступен в Windows - тогда null). Проверяется, что файлы .ui
+# обоих режимов совпадают побайтно.
+#
+# Запуск: python -m Benchmarks.UXStream [--mockups 100] [--controls 1000]
+# Код возврата 1, если файлы не совпали.
+
+import argparse
+import filecmp
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+_RUN = ('import contextlib, json, os, sys, time\n'
+        'from Converters.UX.Converter import UXConverter\n'
+        'started = time.perf_counter()\n'
+        'with contextlib.redirect_stdout(sys.stderr):\n'
+        '    counts = UXConverter(sys.argv[1]).update_ui(sys.argv[2], stream=sys.argv[3] == "stream")\n'
+        'result = {"seconds": round(time.perf_counter() - started, 3), "files": counts["mockups"]}\n'
+        'try:\n'
+        '    import resource\n'
+        '    result["max_rss_megabytes"] = round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)\n'
+        'except ImportError:\n'
+        '    result["max_rss_megabytes"] = None\n'
+        'print(json.dumps(result))\n')
+
+
+def _python(code: str, *args: str) -> str:
+    return subprocess.run([sys.executable, '-c', code, *args], capture_output=True, text=True, check=True).stdout
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Память генерации .ui: обычный и потоковый режимы")
+    parser.add_argument("--mockups", type=int, default=100, help="Количество макетов")
+    parser.add_argument("--controls", type=int, default=1000, help="Элементов в каждом макете")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        bmpr_path = os.path.join(directory, 'project.bmpr')
+        # Файл создаётся в отдельном процессе, чтобы не увеличивать RSS этого
+        _python('import sys; from Benchmarks.UX import build_bmpr; '
+                f'build_bmpr(sys.argv[1], 0, 1, {args.mockups}, 0, controls={args.controls})', bmpr_path)
+        results = {'mockups': args.mockups, 'controls': args.controls,
+                   'bmpr_megabytes': round(os.path.getsize(bmpr_path) / 2 ** 20, 1)}
+        outputs = {}
+        for mode in ('buffered', 'stream'):
+            outputs[mode] = os.path.join(directory, mode)
+            results[mode] = json.loads(_python(_RUN, bmpr_path, outputs[mode], mode))
+        names = {mode: sorted(name for name in os.listdir(path) if name.endswith('.ui'))
+                 for mode, path in outputs.items()}
+        _, mismatch, errors = filecmp.cmpfiles(outputs['buffered'], outputs['stream'], names['buffered'],
+                                               shallow=False)
+        identical = names['buffered'] == names['stream'] and not mismatch and not errors
+        results['identical'] = identical
+    print(json.dumps(results, indent=4))
+    if not identical:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,117 @@
+# Файл Benchmarks/XML.py сравнивает потоковые запись и чтение XML архитектуры (Analyzers/XMLStream.py)
+# с прежним способом через полное дерево ElementTree: время, пиковая память (tracemalloc) и совпадение
+# результатов (файлы побайтно, загруженные словари - на равенство).
+#
+# Архитектура синтетическая: --modules модулей в директориях по 100 и, при --depth, цепочка вложенных
+# директорий заданной глубины (прежний рекурсивный разбор на ней упирается в предел рекурсии).
+#
+# Запуск: python -m Benchmarks.XML [--modules N] [--depth N]
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+import xml.etree.ElementTree as ET
+
+from Analyzers.Architecture import ProjectCreator
+from Analyzers.XMLStream import load_architecture_xml, write_architecture_xml
+
+
+def build_architecture(modules: int, depth: int) -> dict:
+    tree = {}
+    for i in range(modules):
+        tree.setdefault(f"package_{i // 100}", {})[f"module_{i}.py"] = {
+            'classes': [{'name': f"Class{i}", 'methods': ['__init__', 'run'], 'fields': ['value']}],
+            'functions': ['main'],
+            'variables': ['NAME']
+        }
+    node = tree
+    for level in range(depth):
+        node = node.setdefault(f"level_{level}", {})
+    return {'project': tree}
+
+
+def write_with_element_tree(architecture: dict, filename: str) -> None:
+    """Прежняя запись: полное дерево ElementTree в памяти (рекурсия заменена стеком только из-за глубины)."""
+    root = ET.Element('Architecture')
+    stack = [(architecture, root)]
+    while stack:
+        data, parent = stack.pop()
+        for key, value in data.items():
+            element = ET.SubElement(parent, key)
+            if isinstance(value, dict):
+                stack.append((value, element))
+            else:
+                element.text = str(value)
+    ET.ElementTree(root).write(filename, encoding='utf-8', xml_declaration=True)
+
+
+def load_with_element_tree(filename: str) -> dict:
+    return ProjectCreator()._xml_to_dict(ET.parse(filename).getroot())
+
+
+def same_tree(first: dict, second: dict) -> bool:
+    """Сравнение вложенных словарей без рекурсии (== на глубоких деревьях упирается в предел рекурсии)."""
+    stack = [(first, second)]
+    while stack:
+        left, right = stack.pop()
+        if not isinstance(left, dict) or not isinstance(right, dict):
+            if left != right:
+                return False
+            continue
+        if list(left) != list(right):
+            return False
+        stack.extend((left[key], right[key]) for key in left)
+    return True
+
+
+def measure(function, *args) -> tuple:
+    tracemalloc.start()
+    started = time.perf_counter()
+    result = function(*args)
+    elapsed = time.perf_counter() - started
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    # retained_bytes - память результата (загруженного словаря); пиковая память сверх неё - накладные расходы
+    return result, {'seconds': round(elapsed, 3), 'peak_bytes': peak, 'retained_bytes': retained}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Сравнение потокового XML с ElementTree")
+    parser.add_argument("--modules", type=int, default=50000, help="Количество модулей")
+    parser.add_argument("--depth", type=int, default=0, help="Глубина дополнительной цепочки директорий")
+    args = parser.parse_args()
+
+    architecture = build_architecture(args.modules, args.depth)
+    results = {}
+    with tempfile.TemporaryDirectory() as directory:
+        old_path = os.path.join(directory, 'element_tree.xml')
+        new_path = os.path.join(directory, 'stream.xml')
+        _, results['write_stream'] = measure(write_architecture_xml, architecture, new_path)
+        try:
+            _, results['write_element_tree'] = measure(write_with_element_tree, architecture, old_path)
+            with open(old_path, 'rb') as old, open(new_path, 'rb') as new:
+                results['identical_files'] = old.read() == new.read()
+        except RecursionError:
+            # ElementTree.write сериализует рекурсивно
+            tracemalloc.stop()
+            results['write_element_tree'] = 'RecursionError'
+        results['file_bytes'] = os.path.getsize(new_path)
+        try:
+            loaded_old, results['load_element_tree'] = measure(load_with_element_tree, new_path)
+        except RecursionError:
+            tracemalloc.stop()
+            loaded_old, results['load_element_tree'] = None, 'RecursionError'
+        loaded_new, results['load_iterparse'] = measure(load_architecture_xml, new_path)
+        if loaded_old is not None:
+            results['identical_dicts'] = same_tree(loaded_old, loaded_new)
+    print(json.dumps(results, indent=4))
+    if results.get('identical_files') is False or results.get('identical_dicts') is False:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -9,10 +9,39 @@
 #         Методы:
 #             bmpr_to_json(): Извлекает данные из *.bmpr файла и сохраняет их в формате JSON.
 #             json_to_bmpr(): Загружает JSON-данные и преобразует их в структуру *.bmpr.
-#             fetch_data_from_database(): Извлекает данные из базы SQLite внутри *.bmpr.
-#             convert_to_ux_format(): Конвертирует данные в удобный формат JSON.
-#             __adaptation(), decode_unicode_escape(), detect_encoding(): Вспомогательные функции для обработки
-#             кодировок и структуры данных.
+#             json_to_ui(jobs=1): Генерирует .ui для каждого макета (mockup_to_ui()); при jobs > 1 макеты
+#             распределяются по процессам ProcessPoolExecutor пачками по UI_CHUNK_SIZE, результат побайтно совпадает
+#             с последовательным.
+#             update_ui(output_path, jobs=1, force=False): Инкрементальная генерация .ui (force - без сравнения хэшей): манифест UI_MANIFEST
+#             рядом с файлами хранит версию генератора и хэш ATTRIBUTES/DATA каждой строки RESOURCES; неизменённые
+#             макеты не декодируются и не генерируются, файлы перезаписываются (через временный файл и os.replace)
+#             только при изменении байтов, файлы исчезнувших макетов удаляются. С stream=True каждый макет
+#             пишется сразу после чтения потоковым write_mockup_ui() (etree.xmlfile, по одному виджету за раз;
+#             предварительный проход по элементам учитывает TitleWindow, меняющий класс, имя и размеры формы),
+#             так что в памяти не накапливаются ни макеты, ни байты .ui.
+#             json_to_bmpr(), populate_database_from_json(): Запись JSON в *.bmpr: файл читается потоково
+#             (Converters/UX/JSONStream.py), каждая таблица вставляется одним executemany по генератору строк, всё
+#             - в одной транзакции bulk_import() с настройками BULK_PRAGMAS, которые затем восстанавливаются.
+#             fetch_data_from_database(): Контекстный менеджер: открывает базу SQLite внутри *.bmpr только для
+#             чтения (URI file:...?mode=ro) и отдаёт ленивые итераторы строк каждой таблицы (iter_table(),
+#             cursor.fetchmany по FETCH_SIZE строк; RESOURCES и THUMBNAILS с JSON макетов и base64 изображениями -
+#             по одной строке), так что в памяти одновременно находится не больше одной крупной исходной строки,
+#             а не весь файл. Отбор UXConverter(path, branch=..., mockup=..., skip_thumbnails=True) выполняется
+#             в SQL (resource_conditions()): ветка - по BRANCHID, макет - шаблон GLOB по имени из
+#             json_extract(ATTRIBUTES, '$.name'), комментарии - только к отобранным ресурсам, миниатюры не
+#             читаются вовсе; невыбранные строки не передаются в Python и не разбираются как JSON.
+#             convert_to_ux_format(): Конвертирует данные в удобный формат JSON: каждая таблица - один проход
+#             по её строкам, JSON столбца ATTRIBUTES каждой строки разбирается один раз (decode_attributes()), а
+#             escape-последовательности в полях 'text' и 'name' раскрываются в том же проходе (decode_record()).
+#             decode_unicode_escape(), detect_encoding(), decode_unicode_string(): Вспомогательные функции для
+#             обработки кодировок. Строки без escape-последовательностей (проверка предкомпилированным регулярным
+#             выражением) возвращаются сразу, остальные декодируются через LRU-кэш на DECODE_CACHE_SIZE строк.
+#             chardet импортируется только при первом обращении; UXConverter(path, use_chardet=False) не
+#             использует его вовсе.
+#
+#     convert_directory(directory, output_path, jobs=1, ui_options=None, **options): Пакетная конвертация всех .bmpr директории
+#     (ux_to_ui --batch) в поддиректории output_path, до jobs файлов одновременно; ошибка одного файла не
+#     прерывает остальные и попадает в сводку вместе со временем и числом макетов.
 #
 #     UXElement:
 #         Представляет UI-элемент с основными свойствами, извлеченными из Balsamiq Wireframes.
@@ -25,10 +54,334 @@
 import sqlite3
 import json
 import codecs
-import chardet
+import filecmp
+import hashlib
 import os
+import re
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import closing, contextmanager, suppress
+from functools import lru_cache
+from pathlib import Path
 from lxml import etree
 
+from Converters.UX.JSONStream import iter_tables
+
+DECODE_CACHE_SIZE = 4096
+FETCH_SIZE = 64
+UI_CHUNK_SIZE = 8
+# Версия генератора .ui: при изменении mockup_to_ui() или формата манифеста её нужно увеличить, чтобы update_ui()
+# перегенерировал всё
+UI_GENERATOR_VERSION = 2
+UI_MANIFEST = '.ux_manifest.json'
+# Настройки SQLite на время массовой записи (bulk_import): журнал в памяти, без fsync, кэш 64 МБ
+BULK_PRAGMAS = {'journal_mode': 'MEMORY', 'synchronous': 'OFF', 'cache_size': -65536}
+# То же, что json.dumps(value, ensure_ascii=False), без создания кодировщика на каждую строку
+_ENCODE_JSON = json.JSONEncoder(ensure_ascii=False).encode
+
+# Escape-последовательности, которые раскрывает кодек unicode_escape; строка без них при декодировании не меняется
+_ESCAPE_SEQUENCE = re.compile(r'\\(?:u[0-9a-fA-F]{4}|U[0-9a-fA-F]{8}|x[0-9a-fA-F]{2}|N\{|[0-7\\\'"abfnrtv\n])')
+
+
+@lru_cache(maxsize=DECODE_CACHE_SIZE)
+def _detect_encoding(byte_data):
+    import chardet  # Необязательная зависимость: нужна только при use_chardet=True
+    result = chardet.detect(byte_data)
+    return result['encoding'], result['confidence']
+
+
+@lru_cache(maxsize=DECODE_CACHE_SIZE)
+def _decode_escapes(s):
+    try:
+        return s.encode('latin1').decode('unicode_escape')
+    except Exception:
+        return s
+
+
+# Соответствие типов элементов Balsamiq виджетам Qt Designer
+WIDGET_MAPPING = {
+    "Button": "QPushButton",
+    "RadioButton": "QRadioButton",
+    "CheckBox": "QCheckBox",
+    "ComboBox": "QComboBox",
+    "Label": "QLabel",
+    "TextInput": "QLineEdit",
+    "TextArea": "QPlainTextEdit",
+    "HSlider": "QSlider",
+    "VSlider": "QSlider",
+    "VSplitter": "Line",
+    "HSplitter": "Line",
+    "VerticalScrollBar": "QScrollBar",
+    "HorizontalScrollBar": "QScrollBar",
+    "MenuBar": "QMenuBar",
+    "TabBar": "QTabWidget",
+    "List": "QListView",
+    "Tooltip": "QToolTip",
+    "Calendar": "QCalendarWidget",
+    "ProgressBar": "QProgressBar",
+    "Image": "QGraphicsView",
+    "NumericStepper": "QSpinBox",
+    "FieldSet": "QGroupBox",
+    "Canvas": "QWidget",
+    "SubTitle": "QLabel",
+    "Webcam": "QLabel",
+    "Icon": "QLabel",
+    "Title": "QLabel",  # Для отображения текста заголовка
+}
+
+
+def build_ui(records, jobs=1):
+    """Результаты mockup_to_ui() для записей ресурсов в их порядке; при jobs > 1 - в пуле процессов."""
+    if jobs > 1:
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            # map сохраняет порядок макетов, поэтому результат совпадает с последовательным
+            return list(executor.map(mockup_to_ui, records, chunksize=UI_CHUNK_SIZE))
+    return list(map(mockup_to_ui, records))
+
+
+def find_bmpr_files(directory):
+    """Все файлы .bmpr в директории и её поддиректориях, упорядоченные по пути."""
+    found = []
+    for root, dirs, files in os.walk(directory):
+        dirs.sort()
+        found.extend(os.path.join(root, name) for name in sorted(files) if name.lower().endswith('.bmpr'))
+    return found
+
+
+def convert_project(bmpr_path, output_path, options, ui_options):
+    """Конвертирует один .bmpr (update_ui) и возвращает строку сводки; ошибка не выходит за пределы файла."""
+    started = time.perf_counter()
+    result = {'path': bmpr_path, 'output': output_path, 'error': None}
+    try:
+        result.update(UXConverter(bmpr_path, **options).update_ui(output_path, **ui_options))
+    except Exception as e:
+        result['error'] = f"{type(e).__name__}: {e}"
+    result['seconds'] = round(time.perf_counter() - started, 3)
+    return result
+
+
+def convert_directory(directory, output_path, jobs=1, ui_options=None, **options):
+    """Пакетная конвертация всех .bmpr директории: каждый проект - в свою поддиректорию output_path (путь
+    .bmpr относительно directory без расширения), до jobs файлов одновременно в пуле процессов; у каждого файла
+    своё соединение SQLite; ui_options передаются в update_ui (force, stream). Возвращает строки сводки
+    convert_project() в порядке путей."""
+    tasks = []
+    for bmpr_path in find_bmpr_files(directory):
+        relative = os.path.splitext(os.path.relpath(bmpr_path, directory))[0]
+        tasks.append((bmpr_path, os.path.join(output_path, relative), options, ui_options or {}))
+    if jobs > 1 and len(tasks) > 1:
+        with ProcessPoolExecutor(max_workers=min(jobs, len(tasks))) as executor:
+            futures = [executor.submit(convert_project, *task) for task in tasks]
+            results = []
+            for (bmpr_path, project_output, _, _), future in zip(tasks, futures):
+                try:
+                    results.append(future.result())
+                except Exception as e:
+                    # Например, процесс пула аварийно завершился
+                    results.append({'path': bmpr_path, 'output': project_output,
+                                    'error': f"{type(e).__name__}: {e}", 'seconds': None})
+            return results
+    return [convert_project(*task) for task in tasks]
+
+
+def resource_digest(resource):
+    """Хэш столбцов ATTRIBUTES и DATA строки RESOURCES - по нему update_ui() узнаёт неизменённые макеты."""
+    digest = hashlib.blake2b(digest_size=16)
+    for value in (resource[2], resource[3]):
+        digest.update(str(value).encode('utf-8', 'surrogatepass'))
+        digest.update(b'\0')
+    return digest.hexdigest()
+
+
+def replace_if_changed(temp_path, path):
+    """Заменяет path готовым временным файлом (os.replace), только если их байты различаются; иначе временный
+    файл удаляется."""
+    if os.path.exists(path) and filecmp.cmp(temp_path, path, shallow=False):
+        os.remove(temp_path)
+        return False
+    os.replace(temp_path, path)
+    return True
+
+
+def write_if_changed(path, content):
+    """Записывает байты через временный файл и os.replace, только если они отличаются от текущих."""
+    try:
+        with open(path, 'rb') as f:
+            if f.read() == content:
+                return False
+    except OSError:
+        pass
+    temp_path = path + '.tmp'
+    with open(temp_path, 'wb') as f:
+        f.write(content)
+    os.replace(temp_path, path)
+    return True
+
+
+def _form_properties(mockup):
+    """Свойства формы geometry и windowTitle."""
+    # Задание размеров формы
+    geometry = etree.Element("property", name="geometry")
+    rect = etree.SubElement(geometry, "rect")
+    etree.SubElement(rect, "x").text = "0"
+    etree.SubElement(rect, "y").text = "0"
+    etree.SubElement(rect, "width").text = mockup.get("mockupW")
+    etree.SubElement(rect, "height").text = mockup.get("mockupH")
+
+    # Название окна
+    window_title = etree.Element("property", name="windowTitle")
+    if "attributes" in mockup:
+        etree.SubElement(window_title, "string").text = mockup["attributes"].get("name")
+    return geometry, window_title
+
+
+def _is_title_window(control):
+    # TitleWindow задаёт класс и имя формы, а не отдельный виджет
+    return "TitleWindow" in control["typeID"] and "properties" in control
+
+
+def _add_title_window_size(rect, control):
+    # Размеры TitleWindow дописываются в последний построенный rect (формы или предыдущего виджета)
+    etree.SubElement(rect, "width").text = control["w"]
+    etree.SubElement(rect, "height").text = control["measuredH"]
+
+
+def _control_widget(control):
+    """Виджет Qt Designer для элемента макета."""
+    control_type = control["typeID"]
+    widget_class_name = WIDGET_MAPPING.get(control_type, "QWidget")
+    widget = etree.Element("widget", attrib={"class": widget_class_name, "name": f"{control_type}_{control['ID']}"})
+
+    # Задание свойств виджета
+    geometry = etree.SubElement(widget, "property", name="geometry")
+    rect = etree.SubElement(geometry, "rect")
+    etree.SubElement(rect, "x").text = control.get("x")
+    etree.SubElement(rect, "y").text = control.get("y")
+    if control.get("w") and control.get("h"):
+        etree.SubElement(rect, "width").text = control.get("w")
+        etree.SubElement(rect, "height").text = control.get("h")
+    else:
+        etree.SubElement(rect, "width").text = control.get("measuredW")
+        etree.SubElement(rect, "height").text = control.get("measuredH")
+
+    if "H" in control_type[0]:
+        etree.SubElement(rect, "width").text = control.get("w")
+        etree.SubElement(rect, "height").text = control.get("measuredH")
+        property_orientation = etree.SubElement(widget, "property", name="orientation")
+        enum = etree.SubElement(property_orientation, "enum")
+        enum.text = "Qt::Horizontal"
+    elif "V" in control_type[0]:
+        etree.SubElement(rect, "height").text = control.get("h")
+        etree.SubElement(rect, "width").text = control.get("measuredW")
+        property_orientation = etree.SubElement(widget, "property", name="orientation")
+        enum = etree.SubElement(property_orientation, "enum")
+        enum.text = "Qt::Vertical"
+    # Установка текста, если есть
+    if "properties" in control and "text" in control["properties"]:
+        text = etree.SubElement(widget, "property", name="text")
+        etree.SubElement(text, "string").text = control["properties"]["text"]
+    return widget
+
+
+def mockup_to_ui(data):
+    """Строит .ui для ресурса-макета и возвращает (имя макета, байты XML) или None, если макет не генерируется.
+    Функция модульного уровня, чтобы её можно было выполнять в процессах пула (json_to_ui(jobs=N))."""
+    json_data = data['data']
+    key = data['attributes']['name']
+    # Пустые макеты по умолчанию не генерируются - проверяем до построения XML
+    if "mockup" not in json_data or "New Wireframe" in key:
+        return None
+    root = etree.Element("ui", version="4.0")
+
+    # Основной класс формы
+    widget_class = etree.SubElement(root, "class")
+    widget_class.text = "Form"
+    form_widget = etree.SubElement(root, "widget", attrib={"class": "QWidget", "name": "Form"})
+    geometry, window_title = _form_properties(json_data["mockup"])
+    form_widget.append(geometry)
+    form_widget.append(window_title)
+    rect = geometry[0]
+
+    # Создание виджетов на основе JSON данных
+    if not json_data["mockup"]["controls"]:
+        return None
+    for control in json_data["mockup"]["controls"]["control"]:
+        if _is_title_window(control):
+            widget_class.text = control["properties"]["text"]
+            _add_title_window_size(rect, control)
+            form_widget.attrib["name"] = control["properties"]["text"]
+            continue
+        widget = _control_widget(control)
+        form_widget.append(widget)
+        rect = widget[0][0]
+    return key, etree.tostring(root, pretty_print=True, encoding="utf-8", xml_declaration=True)
+
+
+def _indented(element, level):
+    # Отступы как у pretty_print для элемента на глубине level; хвост пишет сам write_mockup_ui
+    etree.indent(element, space="  ", level=level)
+    element.tail = None
+    return element
+
+
+def write_mockup_ui(data, path):
+    """Потоковый вариант mockup_to_ui(): пишет .ui в файл path через etree.xmlfile - заголовок формы, затем
+    виджеты по одному, так что в памяти одновременно находится XML не больше одного элемента макета. Байты файла
+    совпадают с mockup_to_ui(). Возвращает имя макета или None (файл не создаётся), если макет не генерируется."""
+    json_data = data['data']
+    key = data['attributes']['name']
+    if "mockup" not in json_data or "New Wireframe" in key:
+        return None
+    mockup = json_data["mockup"]
+    geometry, window_title = _form_properties(mockup)
+    if not mockup["controls"]:
+        return None
+    controls = mockup["controls"]["control"]
+
+    # Предварительный проход: TitleWindow меняет уже записанные бы класс, имя и размеры формы
+    class_text = form_name = "Form"
+    before_widgets = True
+    for control in controls:
+        if _is_title_window(control):
+            class_text = form_name = control["properties"]["text"]
+            if before_widgets:
+                _add_title_window_size(geometry[0], control)
+        else:
+            before_widgets = False
+
+    with open(path, 'wb') as f:
+        with etree.xmlfile(f, encoding="utf-8") as xf:
+            xf.write_declaration()
+            with xf.element("ui", version="4.0"):
+                widget_class = etree.Element("class")
+                widget_class.text = class_text
+                xf.write("\n  ")
+                xf.write(widget_class)
+                xf.write("\n  ")
+                with xf.element("widget", attrib={"class": "QWidget", "name": form_name}):
+                    for element in (geometry, window_title):
+                        xf.write("\n    ")
+                        xf.write(_indented(element, 2))
+                    # Виджет пишется, когда следующий элемент уже не может дописать размеры в его rect
+                    pending = None
+                    for control in controls:
+                        if _is_title_window(control):
+                            if pending is not None:
+                                _add_title_window_size(pending[0][0], control)
+                            continue
+                        if pending is not None:
+                            xf.write("\n    ")
+                            xf.write(_indented(pending, 2))
+                        pending = _control_widget(control)
+                    if pending is not None:
+                        xf.write("\n    ")
+                        xf.write(_indented(pending, 2))
+                    xf.write("\n  ")
+                xf.write("\n")
+        f.write(b"\n")
+    return key
+
 
 class UXConverter:
     '''
@@ -39,8 +392,12 @@ class UXConverter:
      contact: Orodunaar@mail.ru
     '''
 
-    def __init__(self, path):
+    def __init__(self, path, use_chardet=True, branch=None, mockup=None, skip_thumbnails=False):
         self.db_path = path
+        self.use_chardet = use_chardet
+        self.branch = branch
+        self.mockup = mockup
+        self.skip_thumbnails = skip_thumbnails
         self.ux_format = {
             "branches": [],
             "resources": [],
@@ -53,6 +410,9 @@ class UXConverter:
 
     def decode_unicode_escape(self, text):
         """Преобразует кодировку 'unicode_escape' в формат 'utf-8'."""
+        # ASCII-строку без escape-последовательностей chardet определяет как ascii - проверять её не нужно
+        if not self.use_chardet or isinstance(text, str) and text.isascii() and not _ESCAPE_SEQUENCE.search(text):
+            return text
         try:
             # Сначала проверяем, является ли текст строкой
             if isinstance(text, str):
@@ -76,137 +436,161 @@ class UXConverter:
     def detect_encoding(self, byte_data):
         """Определяет кодировку данных."""
         if isinstance(byte_data, bytes) or isinstance(byte_data, bytearray):
-            result = chardet.detect(byte_data)
-            return result['encoding'], result['confidence']
+            return _detect_encoding(bytes(byte_data))
         else:
             print(f"Ошибка определения кодировки: ожидаются байты или bytearray, но получен тип {type(byte_data)}")
             return None, 0
 
+    def decode_attributes(self, attributes_json):
+        """Разбирает JSON столбца ATTRIBUTES (один раз на строку таблицы) и декодирует имя."""
+        attributes = json.loads(attributes_json)
+        attributes["name"] = self.decode_unicode_escape(attributes.get("name", ""))
+        return attributes
+
+    def decode_record(self, record):
+        """Раскрывает escape-последовательности в полях 'text' и 'name' записи (и вложенных) и возвращает её."""
+        self.process_table(record)
+        return record
+
+    def convert_resource(self, resource):
+        """Конвертирует строку таблицы RESOURCES (ID, BRANCHID, ATTRIBUTES, DATA) в запись ux_format."""
+        resource_attributes = self.decode_attributes(resource[2])
+
+        # Декодируем поле 'data', если оно есть
+        resource_data = resource[3]
+        if isinstance(resource_data, str):
+            try:
+                resource_data = json.loads(resource_data)  # Пробуем разобрать JSON
+            except json.JSONDecodeError as e:
+                print(f"Ошибка декодирования JSON: {e}")
+                resource_data = {}
+
+            # Декодируем, если это строка
+            resource_data = self.decode_unicode_escape(resource_data)
+
+        return self.decode_record({
+            "id": resource[0],
+            "branchId": resource[1],
+            "attributes": resource_attributes,
+            "data": resource_data
+        })
+
     def convert_to_ux_format(self, data):
+        # Каждая таблица конвертируется одним проходом по своим строкам, включая декодирование полей
         # Конвертируем ветки
-        for branch in data["branches"]:
-            branch_attributes = json.loads(branch[1])  # предполагаем, что ATTRIBUTES в формате JSON
-            branch_attributes["name"] = self.decode_unicode_escape(branch_attributes.get("name", ""))
-            self.ux_format["branches"].append({
-                "id": branch[0],
-                "attributes": branch_attributes
-            })
+        self.ux_format["branches"].extend(self.decode_record({
+            "id": branch[0],
+            "attributes": self.decode_attributes(branch[1])
+        }) for branch in data["branches"])
 
         # Конвертируем ресурсы
-        for resource in data["resources"]:
-            resource_attributes = json.loads(resource[2])
-            resource_attributes["name"] = self.decode_unicode_escape(resource_attributes.get("name", ""))
-
-            # Декодируем поле 'data', если оно есть
-            resource_data = resource[3]
-            if isinstance(resource_data, str):
-                try:
-                    resource_data = json.loads(resource_data)  # Пробуем разобрать JSON
-                except json.JSONDecodeError as e:
-                    print(f"Ошибка декодирования JSON: {e}")
-                    resource_data = {}
-
-                # Декодируем, если это строка
-                resource_data = self.decode_unicode_escape(resource_data)
-
-            self.ux_format["resources"].append({
-                "id": resource[0],
-                "branchId": resource[1],
-                "attributes": resource_attributes,
-                "data": resource_data
-            })
+        self.ux_format["resources"].extend(self.convert_resource(resource) for resource in data["resources"])
 
         # Конвертируем комментарии
-        for comment in data["comments"]:
-            comment_attributes = json.loads(comment[5])
-            comment_attributes["name"] = self.decode_unicode_escape(comment_attributes.get("name", ""))
-
-            self.ux_format["comments"].append({
-
-                "id": comment[0],
-                "branchId": comment[1],
-                "resourceId": comment[2],
-                "data": self.decode_unicode_escape(comment[3]),  # Декодируем, если это строка
-                "userId": comment[4],
-                "attributes": comment_attributes
-            })
-
-            # Конвертируем пользователей
-            for user in data["users"]:
-                user_attributes = json.loads(user[1])
-                user_attributes["name"] = self.decode_unicode_escape(user_attributes.get("name", ""))
-
-                self.ux_format["users"].append({
-                    "id": user[0],
-                    "attributes": user_attributes
-                })
-
-            # Конвертируем миниатюры
-            for thumbnail in data["thumbnails"]:
-                thumbnail_attributes = json.loads(thumbnail[1])
-                thumbnail_attributes["name"] = self.decode_unicode_escape(thumbnail_attributes.get("name", ""))
-
-                self.ux_format["thumbnails"].append({
-                    "id": thumbnail[0],
-                    "attributes": thumbnail_attributes
-                })
-
-            # Конвертируем информацию
-            for info in data["info"]:
-                self.ux_format["info"][info[0]] = self.decode_unicode_escape(info[1])  # Декодируем, если это строка
-
-            return self.ux_format
-
-    def __adaptation(self):
-        # Обработка данных
-        for table_name, table_data in self.ux_format.items():
-            print(f"Обработка таблицы: {table_name}")
-            self.process_table(table_data)
+        self.ux_format["comments"].extend(self.decode_record({
+            "id": comment[0],
+            "branchId": comment[1],
+            "resourceId": comment[2],
+            "data": self.decode_unicode_escape(comment[3]),  # Декодируем, если это строка
+            "userId": comment[4],
+            "attributes": self.decode_attributes(comment[5])
+        }) for comment in data["comments"])
+
+        # Конвертируем пользователей
+        self.ux_format["users"].extend(self.decode_record({
+            "id": user[0],
+            "attributes": self.decode_attributes(user[1])
+        }) for user in data["users"])
+
+        # Конвертируем миниатюры
+        self.ux_format["thumbnails"].extend(self.decode_record({
+            "id": thumbnail[0],
+            "attributes": self.decode_attributes(thumbnail[1])
+        }) for thumbnail in data["thumbnails"])
+
+        # Конвертируем информацию
+        for info in data["info"]:
+            self.ux_format["info"][info[0]] = self.decode_unicode_escape(info[1])  # Декодируем, если это строка
+        self.decode_record(self.ux_format["info"])
+
+        return self.ux_format
 
     # def json_to_bmpr(self, input_file_path):
     #    self.__open(input_file_path)
 
     def bmpr_to_json(self):
-        # Получаем данные
-        data = self.fetch_data_from_database()
-
-        # Конвертируем данные
-        self.convert_to_ux_format(data)
-
-        self.__adaptation()
-
+        # Получаем данные и конвертируем их по мере чтения (поля 'text' и 'name' декодируются в том же проходе)
+        with self.fetch_data_from_database() as data:
+            self.convert_to_ux_format(data)
+
+    def open_database(self):
+        # Только чтение: несуществующий файл - ошибка, а не новая пустая база
+        return sqlite3.connect(f"{Path(self.db_path).resolve().as_uri()}?mode=ro", uri=True)
+
+    def iter_table(self, connection, table, size=FETCH_SIZE, conditions=(), parameters=()):
+        """Строки таблицы, удовлетворяющие условиям, пачками по size; запрос выполняется при первом обращении к
+        итератору."""
+        where = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+        with closing(connection.execute(f"SELECT * FROM {table}{where}", parameters)) as cursor:
+            rows = cursor.fetchmany(size)
+            while rows:
+                yield from rows
+                rows = cursor.fetchmany(size)
+
+    def resource_conditions(self):
+        """Условия SQL и их параметры для отбора ресурсов по ветке и шаблону имени макета."""
+        conditions, parameters = [], []
+        if self.branch is not None:
+            conditions.append("BRANCHID = ?")
+            parameters.append(self.branch)
+        if self.mockup is not None:
+            # Имя сравнивается в том виде, который получится после конвертации
+            conditions.append("ux_decode(json_extract(ATTRIBUTES, '$.name')) GLOB ?")
+            parameters.append(self.mockup)
+        return conditions, parameters
+
+    @contextmanager
     def fetch_data_from_database(self):
-        connection = sqlite3.connect(self.db_path)
-        cursor = connection.cursor()
-
-        # Считываем данные из всех таблиц
-        branches = cursor.execute("SELECT * FROM BRANCHES").fetchall()
-        resources = cursor.execute("SELECT * FROM RESOURCES").fetchall()
-        comments = cursor.execute("SELECT * FROM COMMENTS").fetchall()
-        users = cursor.execute("SELECT * FROM USERS").fetchall()
-        thumbnails = cursor.execute("SELECT * FROM THUMBNAILS").fetchall()
-        info = cursor.execute("SELECT * FROM INFO").fetchall()
-
-        connection.close()
-
-        return {
-            "branches": branches,
-            "resources": resources,
-            "comments": comments,
-            "users": users,
-            "thumbnails": thumbnails,
-            "info": info
-        }
+        # Таблицы читаются по очереди, по мере того как convert_to_ux_format проходит по ним
+        with closing(self.open_database()) as connection:
+            connection.create_function("ux_decode", 1, self.decode_unicode_string, deterministic=True)
+            resource_conditions, resource_parameters = self.resource_conditions()
+            branch_conditions, branch_parameters = [], []
+            comment_conditions, comment_parameters = [], []
+            if self.branch is not None:
+                branch_conditions.append("ID = ?")
+                branch_parameters.append(self.branch)
+                comment_conditions.append("BRANCHID = ?")
+                comment_parameters.append(self.branch)
+            if self.mockup is not None:
+                comment_conditions.append(
+                    f"RESOURCEID IN (SELECT ID FROM RESOURCES WHERE {' AND '.join(resource_conditions)})")
+                comment_parameters.extend(resource_parameters)
+            yield {
+                "branches": self.iter_table(connection, "BRANCHES", conditions=branch_conditions,
+                                            parameters=branch_parameters),
+                "resources": self.iter_table(connection, "RESOURCES", size=1, conditions=resource_conditions,
+                                             parameters=resource_parameters),
+                "comments": self.iter_table(connection, "COMMENTS", conditions=comment_conditions,
+                                            parameters=comment_parameters),
+                "users": self.iter_table(connection, "USERS"),
+                "thumbnails": iter(()) if self.skip_thumbnails else self.iter_table(connection, "THUMBNAILS", size=1),
+                "info": self.iter_table(connection, "INFO")
+            }
 
     def decode_unicode_string(self, s):
-        try:
-            return s.encode('latin1').decode('unicode_escape')
-        except Exception as e:
-            # print(f"Ошибка при декодировании строки: {s} - {e}")
+        # Строка без escape-последовательностей (и не строка) не меняется
+        if not isinstance(s, str) or not _ESCAPE_SEQUENCE.search(s):
             return s
+        return _decode_escapes(s)
 
     def process_table(self, table_data):
+        # Таблица info - словарь, остальные - списки записей; в списках могут быть и не словари
+        if isinstance(table_data, dict):
+            table_data = [table_data]
         for item in table_data:
+            if not isinstance(item, dict):
+                continue
             for key, value in item.items():
                 if key in ['text', 'name']:
                     item[key] = self.decode_unicode_string(value)
@@ -293,26 +677,35 @@ class UXConverter:
         # Проверка на существование базы данных и создание её, если не существует
         self.create_database_if_not_exists(db_file)
 
-        # Открываем JSON файл и читаем его содержимое
-        with open(json_file, 'r', encoding='utf-8') as file:
-            data = json.load(file)
-
-        # Подключаемся к базе данных SQLite
-        conn = sqlite3.connect(db_file)
-        cursor = conn.cursor()
-
-        # Наполняем таблицу BRANCHES
-        for branch in data.get('branches', []):
-            self.insert_branch(cursor, branch)
-
-        # Наполняем таблицу RESOURCES
-        for resource in data.get('resources', []):
-            self.insert_resource(cursor, resource)
-
-        # Если есть другие данные (comments, users и т.д.), добавляем их
-        # Сохранение изменений и закрытие соединения
-        conn.commit()
-        conn.close()
+        # Читаем JSON потоково и наполняем таблицы BRANCHES и RESOURCES одной транзакцией
+        with open(json_file, 'r', encoding='utf-8') as file, closing(sqlite3.connect(db_file)) as conn:
+            with self.bulk_import(conn) as cursor:
+                for table, rows in iter_tables(file):
+                    if table == 'branches':
+                        cursor.executemany('''
+                            INSERT INTO BRANCHES (ID, ATTRIBUTES)
+                            VALUES (?, ?)
+                        ''', ((branch.get('id'), json.dumps(branch.get('attributes', {}))) for branch in rows))
+                    elif table == 'resources':
+                        cursor.executemany('''
+                            INSERT INTO RESOURCES (ID, BRANCHID, ATTRIBUTES, DATA)
+                            VALUES (?, ?, ?, ?)
+                        ''', ((resource.get('id'), resource.get('branchId'), json.dumps(resource.get('attributes', {})),
+                               json.dumps(resource.get('data', {}))) for resource in rows))
+
+    @contextmanager
+    def bulk_import(self, connection):
+        """Одна явная транзакция с BULK_PRAGMAS; прежние значения pragma восстанавливаются после неё."""
+        saved = {name: connection.execute(f"PRAGMA {name}").fetchone()[0] for name in BULK_PRAGMAS}
+        for name, value in BULK_PRAGMAS.items():
+            connection.execute(f"PRAGMA {name} = {value}")
+        try:
+            with connection:
+                connection.execute("BEGIN")
+                yield connection.cursor()
+        finally:
+            for name, value in saved.items():
+                connection.execute(f"PRAGMA {name} = {value}")
 
     def create_database_if_not_exists(self, db_file):
         if not os.path.exists(db_file):
@@ -377,204 +770,187 @@ class UXConverter:
         ''', (resource.get('id'), resource.get('branchId'), attributes_json, data_json))
 
     def json_to_bmpr(self, json_file):
-        # Чтение данных из JSON файла
-        with open(json_file, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-
         # Создание базы данных, если она не существует
         self.create_database_if_not_exists(self.db_path)
 
-        # Подключаемся к базе данных
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-
-        # Наполнение базовых таблиц данными
-        self.insert_branches(cursor, data.get("branches", []))
-        self.insert_resources(cursor, data.get("resources", []))
-        self.insert_comments(cursor, data.get("comments", []))
-        self.insert_users(cursor, data.get("users", []))
-        self.insert_thumbnails(cursor, data.get("thumbnails", []))
-        self.insert_info(cursor, data.get("info", {}))
-
-        # Сохраняем изменения
-        conn.commit()
-        conn.close()
+        inserters = {
+            "branches": self.insert_branches,
+            "resources": self.insert_resources,
+            "comments": self.insert_comments,
+            "users": self.insert_users,
+            "thumbnails": self.insert_thumbnails,
+            "info": self.insert_info
+        }
+        # Таблицы читаются из JSON потоково и записываются по мере чтения одной транзакцией
+        with open(json_file, 'r', encoding='utf-8') as f, closing(sqlite3.connect(self.db_path)) as conn:
+            with self.bulk_import(conn) as cursor:
+                for table, rows in iter_tables(f):
+                    if table in inserters:
+                        inserters[table](cursor, rows)
 
     def insert_branches(self, cursor, branches):
-        for branch in branches:
-            attributes = json.dumps(branch["attributes"], ensure_ascii=False)  # Конвертация атрибутов в JSON
-            cursor.execute('''
-                INSERT INTO BRANCHES (ID, ATTRIBUTES)
-                VALUES (?, ?)
-                ON CONFLICT(ID) DO UPDATE SET ATTRIBUTES=excluded.ATTRIBUTES
-            ''', (branch["id"], attributes))
+        cursor.executemany('''
+            INSERT INTO BRANCHES (ID, ATTRIBUTES)
+            VALUES (?, ?)
+            ON CONFLICT(ID) DO UPDATE SET ATTRIBUTES=excluded.ATTRIBUTES
+        ''', ((branch["id"], _ENCODE_JSON(branch["attributes"])) for branch in branches))
 
     def insert_resources(self, cursor, resources):
-        for resource in resources:
-            attributes = json.dumps(resource["attributes"], ensure_ascii=False)  # Конвертация атрибутов в JSON
-            data = json.dumps(resource["data"], ensure_ascii=False)  # Конвертация данных в JSON
-            cursor.execute('''
-                INSERT INTO RESOURCES (ID, BRANCHID, ATTRIBUTES, DATA)
-                VALUES (?, ?, ?, ?)
-                ON CONFLICT(ID, BRANCHID) DO UPDATE SET ATTRIBUTES=excluded.ATTRIBUTES, DATA=excluded.DATA
-            ''', (resource["id"], resource["branchId"], attributes, data))
+        cursor.executemany('''
+            INSERT INTO RESOURCES (ID, BRANCHID, ATTRIBUTES, DATA)
+            VALUES (?, ?, ?, ?)
+            ON CONFLICT(ID, BRANCHID) DO UPDATE SET ATTRIBUTES=excluded.ATTRIBUTES, DATA=excluded.DATA
+        ''', ((resource["id"], resource["branchId"], _ENCODE_JSON(resource["attributes"]),
+               _ENCODE_JSON(resource["data"])) for resource in resources))
 
     def insert_comments(self, cursor, comments):
-        for comment in comments:
-            attributes = json.dumps(comment["attributes"], ensure_ascii=False)  # Конвертация атрибутов в JSON
-            data = comment.get("data", "")
-            cursor.execute('''
-                INSERT INTO COMMENTS (ID, BRANCHID, RESOURCEID, DATA, USERID, ATTRIBUTES)
-                VALUES (?, ?, ?, ?, ?, ?)
-                ON CONFLICT(ID) DO UPDATE SET DATA=excluded.DATA, ATTRIBUTES=excluded.ATTRIBUTES
-            ''', (comment["id"], comment["branchId"], comment["resourceId"], data, comment["userId"], attributes))
+        cursor.executemany('''
+            INSERT INTO COMMENTS (ID, BRANCHID, RESOURCEID, DATA, USERID, ATTRIBUTES)
+            VALUES (?, ?, ?, ?, ?, ?)
+            ON CONFLICT(ID) DO UPDATE SET DATA=excluded.DATA, ATTRIBUTES=excluded.ATTRIBUTES
+        ''', ((comment["id"], comment["branchId"], comment["resourceId"], comment.get("data", ""), comment["userId"],
+               _ENCODE_JSON(comment["attributes"])) for comment in comments))
 
     def insert_users(self, cursor, users):
-        for user in users:
-            attributes = json.dumps(user["attributes"], ensure_ascii=False)  # Конвертация атрибутов в JSON
-            cursor.execute('''
-                INSERT INTO USERS (ID, ATTRIBUTES)
-                VALUES (?, ?)
-                ON CONFLICT(ID) DO UPDATE SET ATTRIBUTES=excluded.ATTRIBUTES
-            ''', (user["id"], attributes))
+        cursor.executemany('''
+            INSERT INTO USERS (ID, ATTRIBUTES)
+            VALUES (?, ?)
+            ON CONFLICT(ID) DO UPDATE SET ATTRIBUTES=excluded.ATTRIBUTES
+        ''', ((user["id"], _ENCODE_JSON(user["attributes"])) for user in users))
 
     def insert_thumbnails(self, cursor, thumbnails):
-        for thumbnail in thumbnails:
-            attributes = json.dumps(thumbnail["attributes"], ensure_ascii=False)  # Конвертация атрибутов в JSON
-            cursor.execute('''
-                INSERT INTO THUMBNAILS (ID, ATTRIBUTES)
-                VALUES (?, ?)
-                ON CONFLICT(ID) DO UPDATE SET ATTRIBUTES=excluded.ATTRIBUTES
-            ''', (thumbnail["id"], attributes))
+        cursor.executemany('''
+            INSERT INTO THUMBNAILS (ID, ATTRIBUTES)
+            VALUES (?, ?)
+            ON CONFLICT(ID) DO UPDATE SET ATTRIBUTES=excluded.ATTRIBUTES
+        ''', ((thumbnail["id"], _ENCODE_JSON(thumbnail["attributes"])) for thumbnail in thumbnails))
 
     def insert_info(self, cursor, info):
-        for key, value in info.items():
-            cursor.execute('''
-                INSERT INTO INFO (NAME, VALUE)
-                VALUES (?, ?)
-                ON CONFLICT(NAME) DO UPDATE SET VALUE=excluded.VALUE
-            ''', (key, value))
+        cursor.executemany('''
+            INSERT INTO INFO (NAME, VALUE)
+            VALUES (?, ?)
+            ON CONFLICT(NAME) DO UPDATE SET VALUE=excluded.VALUE
+        ''', info.items())
 
     # Функция для конвертации JSON в XML .ui формат
-    def json_to_ui(self, json_datas=''):
+    def json_to_ui(self, json_datas='', jobs=1):
         if not json_datas:
             json_datas = self.ux_format['resources']
 
         json_list = {}
-        for data in json_datas:
-            json_data = data['data']
-            if "mockup" not in json_data:
-                continue
-            root = etree.Element("ui", version="4.0")
-
-            # Основной класс формы
-            widget_class = etree.SubElement(root, "class")
-            widget_class.text = "Form"
-            form_widget = etree.SubElement(root, "widget", attrib={"class": "QWidget", "name": "Form"})
-
-            # Задание размеров формы
-            geometry = etree.SubElement(form_widget, "property", name="geometry")
-            rect = etree.SubElement(geometry, "rect")
-            width = json_data["mockup"].get("mockupW")
-            height = json_data["mockup"].get("mockupH")
-            etree.SubElement(rect, "x").text = "0"
-            etree.SubElement(rect, "y").text = "0"
-            etree.SubElement(rect, "width").text = width
-            etree.SubElement(rect, "height").text = height
-
-            # Название окна
-            window_title = etree.SubElement(form_widget, "property", name="windowTitle")
-            if "mockup" in json_data and "attributes" in json_data["mockup"]:
-                title_text = json_data["mockup"]["attributes"].get("name")
-                etree.SubElement(window_title, "string").text = title_text
-
-            # Создание виджетов на основе JSON данных
-            widget_mapping = {
-                "Button": "QPushButton",
-                "RadioButton": "QRadioButton",
-                "CheckBox": "QCheckBox",
-                "ComboBox": "QComboBox",
-                "Label": "QLabel",
-                "TextInput": "QLineEdit",
-                "TextArea": "QPlainTextEdit",
-                "HSlider": "QSlider",
-                "VSlider": "QSlider",
-                "VSplitter": "Line",
-                "HSplitter": "Line",
-                "VerticalScrollBar": "QScrollBar",
-                "HorizontalScrollBar": "QScrollBar",
-                "MenuBar": "QMenuBar",
-                "TabBar": "QTabWidget",
-                "List": "QListView",
-                "Tooltip": "QToolTip",
-                "Calendar": "QCalendarWidget",
-                "ProgressBar": "QProgressBar",
-                "Image": "QGraphicsView",
-                "NumericStepper": "QSpinBox",
-                "FieldSet": "QGroupBox",
-                "Canvas": "QWidget",
-                "SubTitle": "QLabel",
-                "Webcam": "QLabel",
-                "Icon": "QLabel",
-                "Title": "QLabel",  # Для отображения текста заголовка
-            }
-            if not json_data["mockup"]["controls"]:
-                continue
-            json_data_controls = json_data["mockup"]["controls"]["control"]
-
-            for control in json_data_controls:
-                control_type = control["typeID"]
-                if "TitleWindow" in control_type and "properties" in control:
-                    widget_class.text = control["properties"]["text"]
-                    etree.SubElement(rect, "width").text = control["w"]
-                    etree.SubElement(rect, "height").text = control["measuredH"]
-                    form_widget.attrib["name"] = control["properties"]["text"]
-                    continue
-                widget_class_name = widget_mapping.get(control_type, "QWidget")
-                widget = etree.SubElement(form_widget, "widget",
-                                          attrib={"class": widget_class_name,
-                                                  "name": f"{control_type}_{control['ID']}"})
-
-                # Задание свойств виджета
-                geometry = etree.SubElement(widget, "property", name="geometry")
-                rect = etree.SubElement(geometry, "rect")
-                etree.SubElement(rect, "x").text = control.get("x")
-                etree.SubElement(rect, "y").text = control.get("y")
-                if control.get("w") and control.get("h"):
-                    etree.SubElement(rect, "width").text = control.get("w")
-                    etree.SubElement(rect, "height").text = control.get("h")
-                else:
-                    etree.SubElement(rect, "width").text = control.get("measuredW")
-                    etree.SubElement(rect, "height").text = control.get("measuredH")
-
-                if "H" in control_type[0]:
-                    etree.SubElement(rect, "width").text = control.get("w")
-                    etree.SubElement(rect, "height").text = control.get("measuredH")
-                    property_orientation = etree.SubElement(widget, "property", name="orientation")
-                    enum = etree.SubElement(property_orientation, "enum")
-                    enum.text = "Qt::Horizontal"
-                elif "V" in control_type[0]:
-                    etree.SubElement(rect, "height").text = control.get("h")
-                    etree.SubElement(rect, "width").text = control.get("measuredW")
-                    property_orientation = etree.SubElement(widget, "property", name="orientation")
-                    enum = etree.SubElement(property_orientation, "enum")
-                    enum.text = "Qt::Vertical"
-                # Установка текста, если есть
-                if "properties" in control and "text" in control["properties"]:
-                    text = etree.SubElement(widget, "property", name="text")
-                    etree.SubElement(text, "string").text = control["properties"]["text"]
-            key = data['attributes']['name']
-            if "New Wireframe" in key:
-                continue
-            json_list[key] = (
-                etree.tostring(root, pretty_print=True, encoding="utf-8", xml_declaration=True))
+        for result in build_ui(json_datas, jobs):
+            if result is not None:
+                json_list[result[0]] = result[1]
+        if json_list:
             self.ui_format = json_list
-        # Возвращаем строку XML с форматированием
+        # Возвращаем строки XML с форматированием
         return json_list
 
-    def bmpr_to_ui(self):
+    def bmpr_to_ui(self, jobs=1):
         self.bmpr_to_json()
-        self.json_to_ui()
+        self.json_to_ui(jobs=jobs)
+
+    def load_manifest(self, manifest_path):
+        """Записи манифеста {ключ ресурса: {'hash', 'file'}}; пустой словарь для другой версии генератора."""
+        try:
+            with open(manifest_path, 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if manifest.get('version') != UI_GENERATOR_VERSION:
+            return {}
+        return manifest.get('mockups', {})
+
+    def save_manifest(self, manifest_path, mockups):
+        temp_path = manifest_path + '.tmp'
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump({'version': UI_GENERATOR_VERSION, 'mockups': mockups}, f, ensure_ascii=False, indent=1)
+        os.replace(temp_path, manifest_path)
+
+    def update_ui(self, output_path, jobs=1, force=False, stream=False):
+        """Инкрементальная генерация .ui в директорию output_path по манифесту UI_MANIFEST.
+
+        Строки RESOURCES, хэш которых (resource_digest()) совпадает с манифестом, не декодируются и не
+        генерируются; файлы записываются, только если их байты изменились; файлы исчезнувших макетов удаляются
+        (кроме запуска с отбором branch/mockup - тогда невыбранные записи манифеста сохраняются).
+        Возвращает счётчики {'generated', 'written', 'skipped', 'deleted', 'mockups'} (mockups - число .ui файлов
+        проекта после запуска). С force сравнение хэшей не выполняется и выбранные макеты генерируются заново.
+
+        С stream=True каждый макет сразу после чтения его строки пишется write_mockup_ui() во временный файл
+        рядом с целевым, и ни декодированные макеты, ни байты .ui не накапливаются в памяти; jobs не используется.
+        """
+        manifest_path = os.path.join(output_path, UI_MANIFEST)
+        # Манифест читается и с force: force отключает только сравнение хэшей, а записи невыбранных отбором
+        # макетов должны сохраниться
+        previous = self.load_manifest(manifest_path)
+        filtered = self.branch is not None or self.mockup is not None
+        mockups = dict(previous) if filtered else {}
+        changed = []
+        records = []
+        # Ключ ресурса -> байты .ui или, с stream=True, путь временного файла
+        outputs = {}
+        counts = {'generated': 0, 'written': 0, 'skipped': 0, 'deleted': 0, 'mockups': 0}
+        try:
+            with self.fetch_data_from_database() as data:
+                for resource in data["resources"]:
+                    key = f"{resource[1]}/{resource[0]}"
+                    digest = resource_digest(resource)
+                    entry = previous.get(key)
+                    if (not force and entry and entry['hash'] == digest
+                            and (entry['file'] is None or os.path.exists(os.path.join(output_path, entry['file'])))):
+                        mockups[key] = entry
+                        counts['skipped'] += 1
+                        continue
+                    mockups[key] = {'hash': digest, 'file': None}
+                    changed.append(key)
+                    if not stream:
+                        records.append(self.convert_resource(resource))
+                        continue
+                    # Директория создаётся только после успешного чтения файла
+                    os.makedirs(output_path, exist_ok=True)
+                    fd, outputs[key] = tempfile.mkstemp(prefix='.', suffix='.ui.tmp', dir=output_path)
+                    os.close(fd)
+                    name = write_mockup_ui(self.convert_resource(resource), outputs[key])
+                    if name is not None:
+                        mockups[key]['file'] = name + '.ui'
+
+            os.makedirs(output_path, exist_ok=True)
+            if not stream:
+                for key, result in zip(changed, build_ui(records, jobs)):
+                    if result is not None:
+                        mockups[key]['file'] = result[0] + '.ui'
+                        outputs[key] = result[1]
+                records = None
+            # Как и в json_to_ui(), при совпадении имён файл принадлежит последнему макету
+            owners = {entry['file']: key for key, entry in mockups.items() if entry['file'] is not None}
+            counts['mockups'] = len(owners)
+            for key in changed:
+                file_name = mockups[key]['file']
+                if file_name is not None and owners[file_name] == key:
+                    counts['generated'] += 1
+                    path = os.path.join(output_path, file_name)
+                    output = outputs.pop(key)
+                    if replace_if_changed(output, path) if stream else write_if_changed(path, output):
+                        counts['written'] += 1
+            # Файл на диске - только от владельца. Макет, уступивший имя, запоминается без хэша и файла, чтобы
+            # его сгенерировать заново, когда владелец исчезнет или переименуется
+            for key, entry in mockups.items():
+                if entry['file'] is not None and owners[entry['file']] != key:
+                    mockups[key] = {'hash': None, 'file': None}
+        finally:
+            # Временные файлы пропущенных, не принадлежащих им и недописанных из-за ошибки макетов
+            if stream:
+                for temp_path in outputs.values():
+                    with suppress(OSError):
+                        os.remove(temp_path)
+        for entry in previous.values():
+            if entry['file'] is not None and entry['file'] not in owners:
+                file_path = os.path.join(output_path, entry['file'])
+                if os.path.exists(file_path):
+                    os.remove(file_path)
+                    counts['deleted'] += 1
+        self.save_manifest(manifest_path, mockups)
+        return counts
 
 
 class UXElement:
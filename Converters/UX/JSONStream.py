@@ -0,0 +1,110 @@
+# Файл Converters/UX/JSONStream.py содержит потоковое чтение JSON-файлов формата UX (результат
+# UXConverter.save_json): объекта верхнего уровня, значения которого - таблицы (списки записей) и словарь info.
+#
+# UXConverter.json_to_bmpr и populate_database_from_json раньше загружали весь файл через json.load. Здесь файл
+# читается блоками по CHUNK_SIZE символов, а каждая запись таблицы разбирается отдельно через
+# json.JSONDecoder.raw_decode и сразу передаётся дальше, поэтому память, кроме одной записи и одного блока
+# текста, не зависит от размера файла.
+#
+# Функции:
+#
+#     iter_tables(stream): Генератор пар (имя, значение) объекта верхнего уровня в порядке файла. Для списка
+#     значение - итератор его элементов, который нужно пройти до перехода к следующей паре (непройденный
+#     остаток пропускается автоматически); остальные значения (info) возвращаются целиком.
+#     ValueError при неверной структуре файла.
+
+import json
+import re
+from typing import Any, Iterator, TextIO, Tuple
+
+CHUNK_SIZE = 1 << 16
+
+_WHITESPACE = re.compile(r'[ \t\n\r]*')
+_DECODER = json.JSONDecoder()
+
+
+class _Reader:
+    def __init__(self, stream: TextIO):
+        self.stream = stream
+        self.buffer = ''
+        self.position = 0
+        self.eof = False
+
+    def _fill(self, size: int = CHUNK_SIZE) -> bool:
+        """Дочитывает блок, отбрасывая уже разобранную часть буфера. False - конец файла."""
+        chunk = self.stream.read(size)
+        self.buffer = self.buffer[self.position:] + chunk
+        self.position = 0
+        self.eof = not chunk
+        return bool(chunk)
+
+    def peek(self) -> str:
+        """Первый непробельный символ (без продвижения) или '' в конце файла."""
+        while True:
+            self.position = _WHITESPACE.match(self.buffer, self.position).end()
+            if self.position < len(self.buffer):
+                return self.buffer[self.position]
+            if not self._fill():
+                return ''
+
+    def expect(self, char: str) -> None:
+        found = self.peek()
+        if found != char:
+            raise ValueError(f"Ожидается '{char}', найдено '{found}' в потоке JSON")
+        self.position += 1
+
+    def value(self) -> Any:
+        """Разбирает одно значение JSON, дочитывая файл, пока значение не поместится в буфер целиком."""
+        self.peek()
+        while True:
+            try:
+                value, end = _DECODER.raw_decode(self.buffer, self.position)
+            except json.JSONDecodeError:
+                if self.eof or not self._fill(max(CHUNK_SIZE, len(self.buffer))):
+                    raise
+                continue
+            # Число в конце буфера может продолжаться в следующем блоке
+            if end == len(self.buffer) and not self.eof:
+                self._fill()
+                continue
+            self.position = end
+            return value
+
+    def items(self) -> Iterator[Any]:
+        """Элементы списка; открывающая скобка уже прочитана."""
+        if self.peek() == ']':
+            self.position += 1
+            return
+        while True:
+            yield self.value()
+            separator = self.peek()
+            self.position += 1
+            if separator == ']':
+                return
+            if separator != ',':
+                raise ValueError(f"Ожидается ',' или ']', найдено '{separator}' в потоке JSON")
+
+
+def iter_tables(stream: TextIO) -> Iterator[Tuple[str, Any]]:
+    reader = _Reader(stream)
+    reader.expect('{')
+    if reader.peek() == '}':
+        return
+    while True:
+        name = reader.value()
+        reader.expect(':')
+        if reader.peek() == '[':
+            reader.position += 1
+            items = reader.items()
+            yield name, items
+            # Пропускаем то, что не прочитал потребитель
+            for _ in items:
+                pass
+        else:
+            yield name, reader.value()
+        separator = reader.peek()
+        reader.position += 1
+        if separator == '}':
+            return
+        if separator != ',':
+            raise ValueError(f"Ожидается ',' или '}}', найдено '{separator}' в потоке JSON")
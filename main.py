@@ -1,12 +1,231 @@
 # main.py
 import argparse
+import contextlib
+import json
 import os
+import sqlite3
+import sys
 from pathlib import Path
 
-from Analyzers.Architecture import ProjectAnalyzer
+from Analyzers.Architecture import ProjectAnalyzer, ProjectCreator
+from Analyzers.Cache import default_cache_dir
+from Analyzers.Clones import CloneIndex
+from Analyzers.Dependencies import DependencyGraph
+from Analyzers.Merkle import diff_architectures, load_snapshot_file, print_diff
+from Analyzers.PerfLint import build_report, git_churn
+from Analyzers.Shards import merge_partials, parse_shard
+from Analyzers.Streaming import NDJSONWriter, load_records
+from Analyzers.SymbolIndex import SymbolIndex
+from Analyzers.Watcher import ArchitectureWatcher
 from Converters.Code.get_data import TransitionManager
 from Converters.MentalMap.JSONToMindMapConverter import JSONToMindMapConverter
-from Converters.UX.Converter import UXConverter
+from Converters.UX.Converter import UXConverter, convert_directory
+
+
+def print_dependency_queries(args, graph):
+    queries = [("Зависимости", args.deps, lambda module: graph.transitive(module)),
+               ("Обратные зависимости", args.rdeps, lambda module: graph.transitive(module, reverse=True)),
+               ("Требуют повторного анализа", args.affected, graph.affected)]
+    for title, module, query in queries:
+        if not module:
+            continue
+        if module not in graph.index:
+            print(f"Модуль {module} не найден в проекте")
+            continue
+        modules = query(module)
+        print(f"{title} {module}: {len(modules)}")
+        for name in modules:
+            print(f"  {name}")
+    if args.cycles:
+        cycles = graph.cycles()
+        print(f"Циклы импортов: {len(cycles)}")
+        for cycle in cycles:
+            print(f"  {' -> '.join(cycle)}")
+
+
+def perf_lint_report(args, analyzer) -> dict:
+    churn = git_churn(args.project_path) if args.churn else {}
+    report = {'project': analyzer.project_name}
+    report.update(build_report(analyzer.architecture[analyzer.project_name], churn))
+    return report
+
+
+def clone_report(args, analyzer) -> dict:
+    index = CloneIndex(args.clones)
+    try:
+        updated, removed = index.update(analyzer.project_name, analyzer.root_directory, analyzer.ignore_rules)
+        clusters = index.clusters(args.clone_threshold, args.clone_min_tokens)
+    finally:
+        index.close()
+    return {'project': analyzer.project_name, 'updated_files': updated, 'removed_files': removed,
+            'clusters': clusters}
+
+
+def analyze(args):
+    cache_dir = None if args.no_cache else default_cache_dir(args.project_path)
+    graph_queries = bool(args.deps or args.rdeps or args.affected or args.cycles)
+    analyzer = ProjectAnalyzer(root_directory=args.project_path, ignore_list=args.ignore,
+                               jobs=args.jobs, cache_dir=cache_dir, use_gitignore=args.gitignore,
+                               collect_imports=args.imports or graph_queries,
+                               compact=args.compact and not args.watch, fast=args.fast,
+                               perf_lint=args.perf_lint, shard=args.shard)
+    if args.diff:
+        old_tree, old_digests = load_snapshot_file(args.diff)
+        if not old_digests:
+            print(f"Внимание: в {args.diff} нет дайджестов Меркла, сравнение обходит всё дерево "
+                  f"(для быстрого сравнения укажите снимок tree.json из директории кэша)", file=sys.stderr)
+    elif args.diff is not None and cache_dir:
+        old_tree, old_digests = analyzer.tree_snapshot().load(analyzer.snapshot_options())
+    else:
+        old_tree, old_digests = None, {}
+
+    # Режим наблюдения изменяет дерево на словарях на месте, поэтому компактное представление в нём не используется.
+    # В режиме наблюдения состояние и обновления всегда передаются записями NDJSON
+    # Частичный результат (--shard) всегда записывается в NDJSON
+    record_format = "ndjson" if args.watch or args.shard else args.format
+    output = open(args.output, 'w', encoding='utf-8') if args.output else sys.stdout
+    # Если поток записей идёт в stdout, служебные сообщения (ошибки разбора, статистика) уходят в stderr
+    messages = sys.stderr if record_format == "ndjson" and not args.output else sys.stdout
+    try:
+        with contextlib.redirect_stdout(messages):
+            if args.watch:
+                watcher = ArchitectureWatcher(analyzer, NDJSONWriter(output), interval=args.interval)
+                watcher.start()
+                watcher.run()
+                return
+            if record_format == "ndjson":
+                analyzer.sink = NDJSONWriter(output)
+                if args.shard:
+                    analyzer.sink.write_shard(*args.shard)
+            analyzer.get_architecture()
+            if graph_queries:
+                # Модули (в том числе узлы компактного дерева) обходятся iter_modules без копии дерева
+                project_tree = analyzer.architecture[analyzer.project_name]
+                print_dependency_queries(args, DependencyGraph.from_architecture(project_tree))
+            elif args.diff is not None:
+                project_tree = analyzer.project_tree()
+                print_diff(diff_architectures(old_tree, project_tree, old_digests, analyzer.digests))
+            elif args.perf_lint and not args.perf_report:
+                print(json.dumps(perf_lint_report(args, analyzer), ensure_ascii=False, indent=4))
+            elif args.clones and not args.clone_report:
+                print(json.dumps(clone_report(args, analyzer), ensure_ascii=False, indent=4))
+            elif record_format == "tree":
+                analyzer.print_architecture()
+            if args.perf_lint and args.perf_report:
+                report = perf_lint_report(args, analyzer)
+                with open(args.perf_report, 'w', encoding='utf-8') as f:
+                    json.dump(report, f, ensure_ascii=False, indent=4)
+                print(f"Отчёт perf-lint {args.perf_report}: модулей с находками {len(report['modules'])}")
+            if args.clones and args.clone_report:
+                report = clone_report(args, analyzer)
+                with open(args.clone_report, 'w', encoding='utf-8') as f:
+                    json.dump(report, f, ensure_ascii=False, indent=4)
+                print(f"Отчёт о клонах {args.clone_report}: кластеров {len(report['clusters'])}, "
+                      f"переразобрано файлов {report['updated_files']}")
+            if args.index:
+                index = SymbolIndex(args.index)
+                try:
+                    updated, removed = index.update(analyzer.project_name, analyzer.architecture[analyzer.project_name])
+                finally:
+                    index.close()
+                print(f"Индекс {args.index}: обновлено модулей {updated}, удалено {removed}")
+            if analyzer.cache:
+                total = analyzer.cache.hits + analyzer.cache.misses
+                print(f"Кэш: {analyzer.cache.hits} попаданий из {total} файлов, "
+                      f"неизменённых директорий: {analyzer.reused_directories}")
+    finally:
+        if output is not sys.stdout:
+            output.close()
+
+
+def analyze_merge(args):
+    streams = [open(path, 'r', encoding='utf-8') for path in args.partials]
+    try:
+        try:
+            records = merge_partials(streams)
+        except ValueError as e:
+            print(f"Ошибка слияния: {e}")
+            sys.exit(1)
+        if args.output and args.output.lower().endswith('.ndjson'):
+            # Потоковая запись без построения дерева в памяти
+            with open(args.output, 'w', encoding='utf-8') as output:
+                writer = NDJSONWriter(output)
+                for record in records:
+                    if record['type'] == 'dir':
+                        writer.write_directory(record['path'])
+                    else:
+                        writer.write_module(record['path'], {key: value for key, value in record.items()
+                                                             if key not in ('type', 'path')})
+            print(f"Записей: {writer.records}")
+            return
+        analyzer = ProjectAnalyzer(root_directory=os.curdir)
+        analyzer.architecture = load_records(records)
+        if not args.output:
+            analyzer.print_architecture()
+        elif args.output.lower().endswith('.xml'):
+            analyzer.save_architecture_to_xml(args.output)
+        else:
+            analyzer.save_architecture_to_json(args.output)
+    finally:
+        for stream in streams:
+            stream.close()
+
+
+def shard_spec(value: str) -> tuple:
+    try:
+        return parse_shard(value)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e))
+
+
+def query(args):
+    index = SymbolIndex(args.index_path)
+    try:
+        if args.prefix:
+            rows = index.find_prefix(args.name, args.kind, args.limit)
+        elif args.fts:
+            rows = index.search(args.name, args.kind, args.limit)
+        else:
+            rows = index.find(args.name, args.kind, args.limit)
+    except sqlite3.OperationalError as e:
+        # Например, неверный синтаксис запроса FTS5
+        print(f"Ошибка запроса: {e}")
+        sys.exit(1)
+    finally:
+        index.close()
+    for kind, name, class_name, path in rows:
+        qualified_name = f"{class_name}.{name}" if class_name else name
+        print(f"{kind:<9} {qualified_name}  {path}")
+    if not rows:
+        print("Ничего не найдено")
+
+
+def print_batch_summary(results) -> None:
+    headers = ("Файл", "Макетов", "Сгенерировано", "Пропущено", "Удалено", "Время, с", "Ошибка")
+    rows = [(result['path'], str(result.get('mockups', '-')), str(result.get('generated', '-')),
+             str(result.get('skipped', '-')), str(result.get('deleted', '-')),
+             '-' if result['seconds'] is None else f"{result['seconds']:.3f}", result['error'] or '')
+            for result in results]
+    widths = [max(len(row[i]) for row in [headers] + rows) for i in range(len(headers))]
+    for row in [headers] + rows:
+        print('  '.join(value.ljust(width) for value, width in zip(row, widths)).rstrip())
+    failed = sum(1 for result in results if result['error'])
+    print(f"Файлов: {len(results)}, с ошибками: {failed}")
+
+
+def ux_to_ui(args):
+    options = {'branch': args.branch, 'mockup': args.mockup, 'skip_thumbnails': args.skip_thumbnails}
+    if args.batch:
+        results = convert_directory(args.ux_path, args.output_path, jobs=args.jobs,
+                                    ui_options={'force': args.force, 'stream': args.stream}, **options)
+        print_batch_summary(results)
+        if any(result['error'] for result in results):
+            sys.exit(1)
+        return
+    converter = UXConverter(args.ux_path, **options)
+    counts = converter.update_ui(args.output_path, jobs=args.jobs, force=args.force, stream=args.stream)
+    print(f"Сгенерировано: {counts['generated']} (записано изменённых: {counts['written']}), "
+          f"пропущено без изменений: {counts['skipped']}, удалено: {counts['deleted']}")
 
 
 def main():
@@ -17,12 +236,99 @@ def main():
     analyze_parser = subparsers.add_parser("analyze", help="Анализ архитектуры проекта")
     analyze_parser.add_argument("project_path", type=str, help="Путь к корневой директории проекта")
     analyze_parser.add_argument("--ignore", nargs="*", default=['.venv', '.gitignore', '.idea'],
-                                help="Игнорируемые элементы")
+                                help="Игнорируемые элементы: имена или glob-шаблоны (*.pyc, **/migrations)")
+    analyze_parser.add_argument("--gitignore", action="store_true",
+                                help="Учитывать правила из файлов .gitignore анализируемого проекта")
+    analyze_parser.add_argument("--jobs", type=int, default=1,
+                                help="Количество процессов для параллельного разбора файлов")
+    analyze_parser.add_argument("--no-cache", action="store_true",
+                                help="Не использовать кэш результатов разбора (.podmasterye/cache)")
+    analyze_parser.add_argument("--format", choices=["tree", "ndjson"], default="tree",
+                                help="Формат вывода: дерево или NDJSON (одна запись на модуль по мере разбора)")
+    analyze_parser.add_argument("--output", type=str, default=None,
+                                help="Файл для вывода записей NDJSON (по умолчанию stdout)")
+    analyze_parser.add_argument("--watch", action="store_true",
+                                help="Следить за проектом и выводить обновления в формате NDJSON по мере изменения файлов")
+    analyze_parser.add_argument("--interval", type=float, default=0.5,
+                                help="Период опроса файловой системы в режиме --watch, секунды")
+    analyze_parser.add_argument("--imports", action="store_true",
+                                help="Извлекать импорты модулей (ключ imports в результате)")
+    analyze_parser.add_argument("--deps", metavar="MODULE", help="Вывести модули, которые импортирует MODULE")
+    analyze_parser.add_argument("--rdeps", metavar="MODULE", help="Вывести модули, которые импортируют MODULE")
+    analyze_parser.add_argument("--affected", metavar="MODULE",
+                                help="Вывести модули, которые нужно проанализировать заново при изменении MODULE")
+    analyze_parser.add_argument("--cycles", action="store_true", help="Вывести циклы импортов")
+    analyze_parser.add_argument("--index", metavar="DB",
+                                help="Добавить символы проекта в индекс SQLite (обновляются только изменённые модули)")
+    analyze_parser.add_argument("--compact", action="store_true",
+                                help="Хранить архитектуру в компактном виде (меньше памяти на больших проектах)")
+    analyze_parser.add_argument("--fast", action="store_true",
+                                help="Извлекать классы, функции и переменные быстрым сканером без построения AST")
+    analyze_parser.add_argument("--perf-lint", action="store_true",
+                                help="Искать типичные проблемы производительности и вывести отчёт JSON вместо дерева")
+    analyze_parser.add_argument("--perf-report", metavar="JSON",
+                                help="Записать отчёт --perf-lint в файл (дерево при этом выводится как обычно)")
+    analyze_parser.add_argument("--churn", action="store_true",
+                                help="Учитывать в весе отчёта --perf-lint число коммитов модуля по git log")
+    analyze_parser.add_argument("--clones", metavar="DB",
+                                help="Искать клоны функций (индекс MinHash/LSH в SQLite, повторно разбираются только "
+                                     "изменённые файлы) и вывести кластеры в JSON вместо дерева")
+    analyze_parser.add_argument("--clone-report", metavar="JSON",
+                                help="Записать отчёт --clones в файл (дерево при этом выводится как обычно)")
+    analyze_parser.add_argument("--clone-threshold", type=float, default=0.8,
+                                help="Минимальное оценочное сходство функций в кластере (по умолчанию 0.8)")
+    analyze_parser.add_argument("--clone-min-tokens", type=int, default=40,
+                                help="Не учитывать функции короче этого числа токенов AST (по умолчанию 40)")
+    analyze_parser.add_argument("--diff", nargs="?", const="", default=None, metavar="OLD_JSON",
+                                help="Вывести добавленные, удалённые и изменённые модули относительно "
+                                     "OLD_JSON (по умолчанию - относительно прошлого запуска)")
+
+    analyze_parser.add_argument("--shard", type=shard_spec, metavar="I/N",
+                                help="Разобрать только часть I из N файлов проекта и записать частичный результат "
+                                     "NDJSON (--output) для analyze-merge")
+
+    # Подкоманда для слияния частичных результатов analyze --shard
+    merge_parser = subparsers.add_parser("analyze-merge", help="Слияние частичных результатов analyze --shard")
+    merge_parser.add_argument("partials", nargs="+", help="Файлы частичных результатов (все N частей)")
+    merge_parser.add_argument("--output", type=str, default=None,
+                              help="Файл архитектуры: .json, .xml или .ndjson (по умолчанию вывод дерева)")
+
+    # Подкоманда для поиска символов в индексе
+    query_parser = subparsers.add_parser("query", help="Поиск символов в индексе, созданном analyze --index")
+    query_parser.add_argument("index_path", type=str, help="Путь к базе индекса")
+    query_parser.add_argument("name", type=str, help="Имя символа, начало имени или запрос FTS5")
+    query_mode = query_parser.add_mutually_exclusive_group()
+    query_mode.add_argument("--prefix", action="store_true", help="Искать по началу имени")
+    query_mode.add_argument("--fts", action="store_true", help="Полнотекстовый запрос FTS5 (например, archi*)")
+    query_parser.add_argument("--kind", choices=["class", "method", "field", "function", "variable"],
+                              help="Тип символа")
+    query_parser.add_argument("--limit", type=int, default=100, help="Максимальное число результатов")
+
+    # Подкоманда для создания структуры проекта по архитектуре
+    create_parser = subparsers.add_parser("create", help="Создание недостающих файлов проекта по архитектуре")
+    create_parser.add_argument("architecture_path", type=str, help="Путь к JSON или XML файлу архитектуры")
+    create_parser.add_argument("output_path", type=str, nargs="?", default="",
+                               help="Корневая директория проекта (по умолчанию - найденный корень проекта)")
+    create_parser.add_argument("--dry-run", action="store_true", help="Только вывести план, не изменяя файлы")
 
     # Подкоманда для конвертации UX в UI
     ux_convert_parser = subparsers.add_parser("ux_to_ui", help="Конвертация UX файла в UI")
-    ux_convert_parser.add_argument("ux_path", type=str, help="Путь к UX файлу .bmpr")
+    ux_convert_parser.add_argument("ux_path", type=str, help="Путь к UX файлу .bmpr (с --batch - к директории)")
     ux_convert_parser.add_argument("output_path", type=str, help="Директория для сохранения UI файлов")
+    ux_convert_parser.add_argument("--branch", type=str, default=None, help="Конвертировать только эту ветку")
+    ux_convert_parser.add_argument("--mockup", type=str, default=None,
+                                   help="Шаблон имени макета (glob, например 'Главная*')")
+    ux_convert_parser.add_argument("--skip-thumbnails", action="store_true", help="Не читать миниатюры")
+    ux_convert_parser.add_argument("--jobs", type=int, default=1,
+                                   help="Количество процессов: для генерации .ui файлов, а с --batch - для "
+                                        "одновременно конвертируемых файлов .bmpr")
+    ux_convert_parser.add_argument("--stream", action="store_true",
+                                   help="Писать каждый .ui потоково сразу после чтения макета (меньше памяти, без --jobs)")
+    ux_convert_parser.add_argument("--batch", action="store_true",
+                                   help="Конвертировать все файлы .bmpr директории ux_path в поддиректории "
+                                        "output_path и вывести сводку")
+    ux_convert_parser.add_argument("--force", action="store_true",
+                                   help="Перегенерировать выбранные макеты без сравнения с манифестом")
 
     # Подкоманда для генерации переходов
     transition_parser = subparsers.add_parser("generate_transitions", help="Генерация переходов из state_map")
@@ -39,14 +345,26 @@ def main():
     args = parser.parse_args()
 
     if args.command == "analyze":
-        analyzer = ProjectAnalyzer(root_directory=args.project_path, ignore_list=args.ignore)
-        analyzer.get_architecture()
-        analyzer.print_architecture()
+        if args.shard and args.watch:
+            analyze_parser.error("--shard нельзя использовать вместе с --watch")
+        analyze(args)
+
+    elif args.command == "analyze-merge":
+        analyze_merge(args)
+
+    elif args.command == "query":
+        query(args)
+
+    elif args.command == "create":
+        creator = ProjectCreator()
+        if args.architecture_path.lower().endswith('.xml'):
+            creator.load_from_xml(args.architecture_path)
+        else:
+            creator.load_from_json(args.architecture_path)
+        creator.create_project_structure(args.output_path, dry_run=args.dry_run)
 
     elif args.command == "ux_to_ui":
-        converter = UXConverter(db_path=args.ux_path)
-        converter.bmpr_to_ui()
-        converter.save_ui(args.output_path)
+        ux_to_ui(args)
 
     elif args.command == "generate_transitions":
         module_path = Path(args.module_path)
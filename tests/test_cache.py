@@ -0,0 +1,22 @@
+import os
+
+from Analyzers.Architecture import ProjectAnalyzer
+from Analyzers.Cache import CACHE_DIR_NAME, default_cache_dir
+
+
+def test_unavailable_cache_dir_falls_back_to_no_cache(tmp_path, capsys):
+    root = tmp_path / 'project'
+    root.mkdir()
+    (root / 'main.py').write_text("def f():\n    pass\n", encoding='utf-8')
+    # .podmasterye - файл, поэтому директорию кэша создать нельзя
+    (root / CACHE_DIR_NAME).write_text('', encoding='utf-8')
+
+    analyzer = ProjectAnalyzer(str(root), cache_dir=default_cache_dir(str(root)))
+    analyzer.get_architecture()
+
+    assert analyzer.cache is None
+    assert 'Warning: cache disabled' in capsys.readouterr().err
+    expected = ProjectAnalyzer(str(root))
+    expected.get_architecture()
+    assert analyzer.architecture == expected.architecture
+    assert os.path.isfile(root / CACHE_DIR_NAME)
@@ -0,0 +1,17 @@
+from Analyzers.Clones import CloneIndex
+from Benchmarks.Clones import generate_project
+
+
+def test_cluster_members_meet_threshold(tmp_path):
+    project = str(tmp_path / 'project')
+    generate_project(project, 400, 40, 4, mutate=True)
+    index = CloneIndex(str(tmp_path / 'clones.sqlite'))
+    try:
+        index.update('project', project)
+        clusters = index.clusters(0.6, 20)
+    finally:
+        index.close()
+
+    assert clusters
+    for cluster in clusters:
+        assert cluster['similarity'] >= 0.6
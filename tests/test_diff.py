@@ -0,0 +1,48 @@
+import contextlib
+import os
+import subprocess
+import sys
+
+from Analyzers.Architecture import ProjectAnalyzer
+from Analyzers.Merkle import diff_architectures
+
+_REPOSITORY = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _write(path: str, text: str) -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(text)
+
+
+def _analyze(root: str) -> ProjectAnalyzer:
+    analyzer = ProjectAnalyzer(root)
+    with open(os.devnull, 'w', encoding='utf-8') as devnull, contextlib.redirect_stdout(devnull):
+        analyzer.get_architecture()
+    return analyzer
+
+
+def test_diff_without_digests(tmp_path):
+    root = str(tmp_path / 'project')
+    for package in ('a', 'b'):
+        for module in range(3):
+            _write(os.path.join(root, package, 'sub', f"module_{module}.py"), f"class Model{module}:\n    pass\n")
+    old = _analyze(root)
+    old_json = str(tmp_path / 'old.json')
+    old.save_architecture_to_json(old_json)
+
+    _write(os.path.join(root, 'a', 'sub', 'module_1.py'), "class Changed:\n    pass\n")
+    _write(os.path.join(root, 'b', 'new', 'module.py'), "def added():\n    pass\n")
+    os.remove(os.path.join(root, 'b', 'sub', 'module_2.py'))
+    new = _analyze(root)
+
+    expected = {'added': ['b/new/module.py'], 'removed': ['b/sub/module_2.py'], 'changed': ['a/sub/module_1.py']}
+    assert diff_architectures(old.project_tree(), new.project_tree()) == expected
+    assert diff_architectures(old.project_tree(), new.project_tree(), old.digests, new.digests) == expected
+
+    # Для обычного JSON архитектуры без дайджестов выводится предупреждение
+    result = subprocess.run([sys.executable, 'main.py', 'analyze', root, '--no-cache', '--diff', old_json],
+                            cwd=_REPOSITORY, capture_output=True, text=True, timeout=120)
+    assert result.returncode == 0, result.stderr
+    assert 'нет дайджестов' in result.stderr
+    assert result.stdout.splitlines()[:3] == ['+ b/new/module.py', '- b/sub/module_2.py', '~ a/sub/module_1.py']
@@ -0,0 +1,146 @@
+import os
+
+import pytest
+
+from Analyzers.Architecture import ProjectAnalyzer
+from Analyzers.FastParser import scan_python_details
+
+CASES = {
+    'decorators': (
+        'import functools\n'
+        '\n'
+        '@functools.lru_cache(maxsize=None)\n'
+        'def cached(x):\n'
+        '    return x\n'
+        '\n'
+        '@dataclass(\n'
+        '    frozen=True,\n'
+        ')\n'
+        'class Point:\n'
+        '    x: int = 0\n'
+        '    y = 0\n'
+        '\n'
+        '    @property\n'
+        '    def norm(self):\n'
+        '        return self.x\n'
+        '\n'
+        '    @staticmethod\n'
+        '    def origin():\n'
+        '        return Point()\n'
+    ),
+    'nested': (
+        'class Outer:\n'
+        '    class Inner:\n'
+        '        def hidden(self):\n'
+        '            pass\n'
+        '\n'
+        '    def method(self):\n'
+        '        def helper():\n'
+        '            local = 1\n'
+        '            return local\n'
+        '        class Local:\n'
+        '            pass\n'
+        '        self.value = helper()\n'
+        '\n'
+        'def outer():\n'
+        '    def inner():\n'
+        '        pass\n'
+        '    nested_value = 2\n'
+        '    return inner\n'
+        '\n'
+        'if True:\n'
+        '    conditional = 1\n'
+        '    def conditional_function():\n'
+        '        pass\n'
+    ),
+    'strings_and_comments': (
+        '# def commented(): pass\n'
+        '# class Commented: pass\n'
+        'DOC = """\n'
+        'def in_docstring():\n'
+        '    pass\n'
+        'class InDocstring:\n'
+        '    x = 1\n'
+        '"""\n'
+        "text = 'def in_string(): pass'  # class Trailing:\n"
+        'raw = r"class \\"Raw\\": pass"\n'
+        "multi = '''\n"
+        "name = 1\n"
+        "'''\n"
+        'class Real:\n'
+        '    """def in_class_docstring(): pass"""\n'
+        "    label = '# not a comment'\n"
+        '    # def commented_method(self): pass\n'
+        '    def method(self):\n'
+        '        return "class NotAClass: pass"\n'
+    ),
+    'continuations': (
+        'total = 1 + \\\n'
+        '    2 + \\\n'
+        '    3\n'
+        'values = [\n'
+        '    1,\n'
+        '    2,  # def not_a_function(): pass\n'
+        ']\n'
+        'mapping = {\n'
+        "    'a': (1,\n"
+        '          2),\n'
+        '}\n'
+        'first, (second, third) = 1, (2, 3)\n'
+        'chained = other = 0\n'
+        'flag == 1\n'
+        'counter += 1\n'
+        'def spread(a,\n'
+        '           b=\\\n'
+        '           1):\n'
+        '    pass\n'
+        'class Wide(Base,\n'
+        '           metaclass=Meta):\n'
+        '    field = \\\n'
+        '        1\n'
+        '    def method(self,\n'
+        '               arg): pass\n'
+    ),
+    'async': (
+        'import asyncio\n'
+        '\n'
+        'async def fetch():\n'
+        '    await asyncio.sleep(0)\n'
+        '\n'
+        'def sync():\n'
+        '    pass\n'
+        '\n'
+        'class Client:\n'
+        '    async def request(self):\n'
+        '        async with self.session as session:\n'
+        '            pass\n'
+        '\n'
+        '    def close(self):\n'
+        '        pass\n'
+        '\n'
+        '    async_flag = True\n'
+    ),
+}
+
+
+@pytest.mark.parametrize('name', sorted(CASES))
+def test_scanner_matches_ast(name):
+    source = CASES[name]
+    expected = ProjectAnalyzer(root_directory=os.curdir).parse_python_file_details(
+        f'{name}.py', source.encode('utf-8'))
+
+    actual = scan_python_details(source)
+
+    assert actual is not None
+    assert tuple(actual) == tuple(expected)
+    # Регрессия на сам набор случаев: результат ast не пустой
+    assert any(expected)
+
+
+@pytest.mark.parametrize('source', ['x = """unterminated\n', '\ufeffx = 1\n', 'values = (1,\n'])
+def test_ambiguous_source_falls_back_to_ast(source):
+    assert scan_python_details(source) is None
+    expected = ProjectAnalyzer(root_directory=os.curdir).parse_python_file_details('module.py', source.encode('utf-8'))
+    actual = ProjectAnalyzer(root_directory=os.curdir, fast=True).parse_python_file_details('module.py',
+                                                                                          source.encode('utf-8'))
+    assert tuple(actual) == tuple(expected)
@@ -0,0 +1,21 @@
+import subprocess
+
+from Analyzers.PerfLint import git_churn
+
+
+def _git(root, *args: str) -> None:
+    subprocess.run(['git', '-c', 'user.name=test', '-c', 'user.email=test@example.com', *args], cwd=root,
+                   check=True, capture_output=True)
+
+
+def test_git_churn_keeps_non_ascii_paths(tmp_path):
+    _git(tmp_path, 'init', '-q')
+    (tmp_path / 'пакет').mkdir()
+    module = tmp_path / 'пакет' / 'модуль.py'
+    for text in ("A = 1\n", "A = 2\n"):
+        module.write_text(text, encoding='utf-8')
+        (tmp_path / 'main.py').write_text(text, encoding='utf-8')
+        _git(tmp_path, 'add', '.')
+        _git(tmp_path, 'commit', '-q', '-m', 'change')
+
+    assert git_churn(str(tmp_path)) == {'пакет/модуль.py': 2, 'main.py': 2}
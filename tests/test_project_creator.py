@@ -0,0 +1,34 @@
+import contextlib
+import io
+import os
+
+from Analyzers.Architecture import ProjectAnalyzer, ProjectCreator
+
+
+def _write(path: str, text: str) -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(text)
+
+
+def test_xml_and_json_give_the_same_plan(tmp_path):
+    source = str(tmp_path / 'source')
+    _write(os.path.join(source, 'main.py'), "VALUE = 1\n\n\ndef run():\n    pass\n")
+    _write(os.path.join(source, 'pkg', 'models.py'), "class Model:\n    def save(self):\n        pass\n")
+    os.makedirs(os.path.join(source, 'pkg', 'empty'))
+    analyzer = ProjectAnalyzer(source)
+    with contextlib.redirect_stdout(io.StringIO()):
+        analyzer.get_architecture()
+        analyzer.save_architecture_to_json(str(tmp_path / 'architecture.json'))
+        analyzer.save_architecture_to_xml(str(tmp_path / 'architecture.xml'))
+
+    target = str(tmp_path / 'target')
+    plans = {}
+    for extension in ('json', 'xml'):
+        creator = ProjectCreator()
+        with contextlib.redirect_stdout(io.StringIO()):
+            getattr(creator, f'load_from_{extension}')(str(tmp_path / f'architecture.{extension}'))
+        plans[extension] = creator.plan(target)
+
+    assert plans['xml'] == plans['json']
+    assert ('mkdir', os.path.join(target, 'pkg'), None, []) in plans['xml']
@@ -0,0 +1,23 @@
+import argparse
+
+import pytest
+
+import main
+from Analyzers.SymbolIndex import SymbolIndex
+
+
+def test_invalid_fts_query_reports_error(tmp_path, capsys):
+    index_path = str(tmp_path / 'index.db')
+    index = SymbolIndex(index_path)
+    try:
+        index.update('project', {'main.py': {'classes': [{'name': 'Model', 'methods': ['save'], 'fields': []}],
+                                             'functions': ['run'], 'variables': []}})
+    finally:
+        index.close()
+    args = argparse.Namespace(index_path=index_path, name='bad"', kind=None, limit=100, prefix=False, fts=True)
+
+    with pytest.raises(SystemExit) as exit_info:
+        main.query(args)
+
+    assert exit_info.value.code == 1
+    assert 'Ошибка запроса' in capsys.readouterr().out
@@ -0,0 +1,35 @@
+import os
+import subprocess
+import sys
+
+from Analyzers.Cache import default_cache_dir
+
+_REPOSITORY = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _shard(root: str, shard: str, output: str) -> subprocess.Popen:
+    return subprocess.Popen([sys.executable, 'main.py', 'analyze', root, '--shard', shard, '--output', output],
+                            cwd=_REPOSITORY, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+
+
+def test_concurrent_shards_keep_separate_caches(tmp_path):
+    root = tmp_path / 'project'
+    for package in range(4):
+        directory = root / f"package_{package}"
+        directory.mkdir(parents=True)
+        for module in range(25):
+            (directory / f"module_{module}.py").write_text(
+                f"class Model{module}:\n    def save(self):\n        pass\n", encoding='utf-8')
+
+    for run in range(2):
+        # Обе части запускаются одновременно и пишут в одну директорию кэша
+        processes = [_shard(str(root), f"{i}/2", str(tmp_path / f"part{i}.ndjson")) for i in range(2)]
+        for process in processes:
+            _, errors = process.communicate(timeout=120)
+            assert process.returncode == 0, errors
+            assert 'cache disabled' not in errors
+
+    cache_dir = default_cache_dir(str(root))
+    assert {'analyze-0of2.sqlite', 'analyze-1of2.sqlite', 'tree-0of2.json', 'tree-1of2.json'} <= set(
+        os.listdir(cache_dir))
+    assert 'analyze.sqlite' not in os.listdir(cache_dir)
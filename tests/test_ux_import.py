@@ -0,0 +1,83 @@
+import contextlib
+import json
+import os
+import sqlite3
+
+import pytest
+
+from Benchmarks.UXImport import build_json, dump, legacy_json_to_bmpr
+from Converters.UX.Converter import BULK_PRAGMAS, UXConverter
+
+_COUNTS = {'BRANCHES': 1, 'RESOURCES': 2, 'COMMENTS': 60, 'USERS': 30, 'THUMBNAILS': 8, 'INFO': 3}
+_KEYS = {'BRANCHES': 'ID', 'RESOURCES': 'ID, BRANCHID', 'COMMENTS': 'ID', 'USERS': 'ID', 'THUMBNAILS': 'ID',
+         'INFO': 'NAME'}
+
+
+def _import(db_path: str, json_file: str) -> None:
+    with open(os.devnull, 'w', encoding='utf-8') as devnull, contextlib.redirect_stdout(devnull):
+        UXConverter(db_path).json_to_bmpr(json_file)
+
+
+def _counts(db_path: str) -> dict:
+    with contextlib.closing(sqlite3.connect(db_path)) as connection:
+        return {table: connection.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0] for table in _COUNTS}
+
+
+def _duplicates(db_path: str) -> dict:
+    with contextlib.closing(sqlite3.connect(db_path)) as connection:
+        return {table: connection.execute(f"SELECT {key} FROM {table} GROUP BY {key} HAVING COUNT(*) > 1").fetchall()
+                for table, key in _KEYS.items()}
+
+
+def test_json_round_trip(tmp_path):
+    json_file = str(tmp_path / 'ux.json')
+    build_json(json_file, 100)
+    db_path = str(tmp_path / 'project.bmpr')
+    _import(db_path, json_file)
+    assert _counts(db_path) == _COUNTS
+
+    # Повторная запись того же JSON обновляет строки, а не добавляет их
+    _import(db_path, json_file)
+    assert _counts(db_path) == _COUNTS
+    assert not any(_duplicates(db_path).values())
+
+    # Содержимое совпадает с записью по одной строке
+    legacy_path = str(tmp_path / 'legacy.bmpr')
+    with open(os.devnull, 'w', encoding='utf-8') as devnull, contextlib.redirect_stdout(devnull):
+        UXConverter(legacy_path).create_database_if_not_exists(legacy_path)
+    legacy_json_to_bmpr(legacy_path, json_file)
+    assert dump(db_path) == dump(legacy_path)
+
+    # Обратное чтение .bmpr возвращает исходный JSON
+    converter = UXConverter(db_path)
+    converter.bmpr_to_json()
+    with open(json_file, 'r', encoding='utf-8') as f:
+        expected = json.load(f)
+    for table in ('branches', 'resources', 'users', 'thumbnails', 'info'):
+        assert converter.ux_format[table] == expected[table], table
+    assert sorted(converter.ux_format['comments'], key=lambda comment: comment['id']) == sorted(
+        expected['comments'], key=lambda comment: comment['id'])
+
+
+@pytest.mark.parametrize('fail', [False, True])
+def test_bulk_import_restores_pragmas(tmp_path, fail):
+    db_path = str(tmp_path / 'project.bmpr')
+    with contextlib.closing(sqlite3.connect(db_path)) as connection:
+        connection.execute("CREATE TABLE INFO (NAME VARCHAR(255) PRIMARY KEY, VALUE TEXT)")
+        connection.execute("PRAGMA cache_size = -1024")
+        before = {name: connection.execute(f"PRAGMA {name}").fetchone()[0] for name in BULK_PRAGMAS}
+
+        with contextlib.suppress(RuntimeError):
+            with UXConverter(db_path).bulk_import(connection) as cursor:
+                cursor.execute("INSERT INTO INFO (NAME, VALUE) VALUES ('SchemaVersion', '1.2')")
+                during = {name: connection.execute(f"PRAGMA {name}").fetchone()[0] for name in BULK_PRAGMAS}
+                if fail:
+                    raise RuntimeError
+
+        after = {name: connection.execute(f"PRAGMA {name}").fetchone()[0] for name in BULK_PRAGMAS}
+        rows = connection.execute("SELECT COUNT(*) FROM INFO").fetchone()[0]
+
+    assert during == {'journal_mode': 'memory', 'synchronous': 0, 'cache_size': BULK_PRAGMAS['cache_size']}
+    assert after == before
+    # Ошибка откатывает всю транзакцию
+    assert rows == (0 if fail else 1)
@@ -0,0 +1,64 @@
+import contextlib
+import json
+import os
+import sqlite3
+
+import pytest
+
+from Benchmarks.UX import build_bmpr
+from Converters.UX.Converter import UXConverter
+
+
+def _update(bmpr_path: str, output_path: str, mockup: str = None, **options) -> dict:
+    with open(os.devnull, 'w', encoding='utf-8') as devnull, contextlib.redirect_stdout(devnull):
+        return UXConverter(bmpr_path, mockup=mockup).update_ui(output_path, **options)
+
+
+def _files(output_path: str) -> dict:
+    result = {}
+    for name in sorted(os.listdir(output_path)):
+        if name.endswith('.ui'):
+            with open(os.path.join(output_path, name), 'rb') as f:
+                result[name] = f.read()
+    return result
+
+
+@pytest.mark.parametrize('stream', [False, True])
+def test_deleted_owner_of_shared_name_regenerates_survivor(tmp_path, stream):
+    bmpr_path = str(tmp_path / 'project.bmpr')
+    build_bmpr(bmpr_path, 0, 1, 2, 0)
+    with contextlib.closing(sqlite3.connect(bmpr_path)) as connection, connection:
+        # Второй макет получает имя первого, но другое содержимое
+        data = json.loads(connection.execute("SELECT DATA FROM RESOURCES WHERE ID = 'resource-1'").fetchone()[0])
+        del data['mockup']['controls']['control'][1:]
+        connection.execute("UPDATE RESOURCES SET ATTRIBUTES = ?, DATA = ? WHERE ID = 'resource-1'",
+                           (json.dumps({"name": "Экран 0", "kind": "mockup"}), json.dumps(data)))
+    output_path = str(tmp_path / 'ui')
+    _update(bmpr_path, output_path, stream=stream)
+    assert list(_files(output_path)) == ['Экран 0.ui']
+
+    with contextlib.closing(sqlite3.connect(bmpr_path)) as connection, connection:
+        connection.execute("DELETE FROM RESOURCES WHERE ID = 'resource-1'")
+    counts = _update(bmpr_path, output_path, stream=stream)
+    forced_path = str(tmp_path / 'forced')
+    _update(bmpr_path, forced_path, force=True, stream=stream)
+
+    assert counts['written'] == 1
+    assert _files(output_path) == _files(forced_path)
+
+
+@pytest.mark.parametrize('stream', [False, True])
+def test_forced_filtered_run_keeps_other_manifest_entries(tmp_path, stream):
+    bmpr_path = str(tmp_path / 'project.bmpr')
+    build_bmpr(bmpr_path, 0, 1, 10, 0)
+    output_path = str(tmp_path / 'ui')
+    assert _update(bmpr_path, output_path, stream=stream)['generated'] == 10
+
+    counts = _update(bmpr_path, output_path, mockup='Экран 3', force=True, stream=stream)
+    assert counts['generated'] == 1
+    assert counts['mockups'] == 10
+
+    # Невыбранные макеты не изменились и не должны генерироваться заново
+    counts = _update(bmpr_path, output_path, stream=stream)
+    assert counts['generated'] == 0
+    assert counts['skipped'] == 10
@@ -0,0 +1,85 @@
+import os
+import time
+
+from Analyzers import Walker
+from Analyzers.Architecture import ProjectAnalyzer
+from Analyzers.Watcher import ArchitectureWatcher
+
+
+def _write(path: str, text: str = "def f():\n    pass\n") -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(text)
+
+
+def test_new_directory_keeps_root_ignore_rules(tmp_path):
+    root = str(tmp_path / 'project')
+    _write(os.path.join(root, 'main.py'))
+    _write(os.path.join(root, '.gitignore'), "gen/\n")
+    analyzer = ProjectAnalyzer(root, ignore_list=['**/build'], use_gitignore=True)
+    watcher = ArchitectureWatcher(analyzer, interval=0)
+    watcher.start()
+
+    # Новые директории появляются во время наблюдения; gen и build внутри них игнорируются правилами корня
+    _write(os.path.join(root, 'pkg', 'sub', 'module.py'))
+    _write(os.path.join(root, 'pkg', 'sub', 'gen', 'generated.py'))
+    _write(os.path.join(root, 'pkg', 'sub', 'build', 'built.py'))
+    changes = watcher.poll()
+
+    assert changes == [('add', 'pkg')]
+    assert set(analyzer.architecture['project']['pkg']['sub']) == {'module.py'}
+
+    full = ProjectAnalyzer(root, ignore_list=['**/build'], use_gitignore=True)
+    full.get_architecture()
+    assert analyzer.architecture == full.architecture
+
+
+def _age(root: str) -> None:
+    # Время изменения в прошлом: иначе директории считаются недавно изменёнными и читаются заново
+    past = time.time() - 60
+    for directory, _, files in os.walk(root, topdown=False):
+        for name in files:
+            os.utime(os.path.join(directory, name), (past, past))
+        os.utime(directory, (past, past))
+
+
+def test_poll_lists_only_changed_directories(tmp_path, monkeypatch):
+    root = str(tmp_path / 'project')
+    for package in ('a', 'b', 'c'):
+        _write(os.path.join(root, package, 'sub', 'module.py'))
+    _write(os.path.join(root, '.gitignore'), "gen/\n")
+    _age(root)
+    analyzer = ProjectAnalyzer(root, use_gitignore=True)
+    watcher = ArchitectureWatcher(analyzer, interval=0)
+    watcher.start()
+
+    listed = []
+    scandir = os.scandir
+    monkeypatch.setattr(Walker.os, 'scandir', lambda path: listed.append(path) or scandir(path))
+
+    # Правка содержимого не меняет mtime директории: её элементы берутся из прошлого просмотра
+    module = os.path.join(root, 'b', 'sub', 'module.py')
+    _write(module, "class Changed:\n    pass\n")
+    assert watcher.poll() == [('update', 'b/sub/module.py')]
+    assert listed == []
+    assert [item['name'] for item in analyzer.architecture['project']['b']['sub']['module.py']['classes']] == \
+        ['Changed']
+
+    # Новый файл меняет mtime только своей директории
+    _write(os.path.join(root, 'c', 'sub', 'extra.py'))
+    assert watcher.poll() == [('add', 'c/sub/extra.py')]
+    assert listed == [os.path.join(root, 'c', 'sub')]
+
+    # Правка .gitignore без смены mtime корня перечитывает дерево с новыми правилами
+    _age(root)
+    watcher.poll()
+    _write(os.path.join(root, 'a', 'gen', 'generated.py'))
+    _write(os.path.join(root, '.gitignore'), "sub/\n")
+    os.utime(root, (time.time() - 60, time.time() - 60))
+    watcher.poll()
+    assert set(analyzer.architecture['project']['a']) == {'gen'}
+    assert 'sub' not in analyzer.architecture['project']['b']
+
+    full = ProjectAnalyzer(root, use_gitignore=True)
+    full.get_architecture()
+    assert analyzer.architecture == full.architecture